@@ -23,15 +23,17 @@ from __future__ import annotations
 import asyncio
 import base64
 import hashlib
+import functools
 import hmac
-import json
+import itertools
+import re
 import secrets
 import time
 import urllib.parse
 from http import HTTPStatus
-from typing import TYPE_CHECKING, Any, Dict, Optional, Callable, Awaitable
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Callable, Awaitable
 
-from . import __version__
+from . import __version__, fastjson
 from .logging_config import get_logger
 
 if TYPE_CHECKING:
@@ -45,6 +47,155 @@ CONTENT_TYPE_JSON = "application/json; charset=utf-8"
 CONTENT_TYPE_CSS = "text/css; charset=utf-8"
 CONTENT_TYPE_JS = "application/javascript; charset=utf-8"
 
+# Maximum size of the request line + headers; larger heads are rejected
+MAX_REQUEST_HEAD_BYTES = 16 * 1024
+
+# CORS is restricted to localhost origins: an exact match, or one of these
+# followed by a port (e.g. http://localhost:8080)
+_ALLOWED_CORS_EXACT = frozenset((
+    "http://127.0.0.1",
+    "http://localhost",
+    "https://127.0.0.1",
+    "https://localhost",
+))
+_ALLOWED_CORS_PREFIXES = tuple(o + ":" for o in _ALLOWED_CORS_EXACT)
+
+# Control characters, which are never valid in the header values we use
+_CTL_RE = re.compile(rb"[\x00-\x1f\x7f]")
+
+# Backpressure: at most this many route handlers run at once, and requests
+# beyond MAX_PENDING_HANDLERS waiting for a slot are rejected with 503
+MAX_CONCURRENT_HANDLERS = 32
+MAX_PENDING_HANDLERS = 128
+
+# Keep-alive: idle connections are closed after this many seconds, and each
+# connection serves at most MAX_KEEPALIVE_REQUESTS requests
+KEEPALIVE_IDLE_TIMEOUT = 5.0
+MAX_KEEPALIVE_REQUESTS = 100
+
+# List endpoints are cached for RESPONSE_CACHE_TTL seconds so repeated
+# refreshes don't rebuild the same bodies
+RESPONSE_CACHE_TTL = 2
+MAX_RESPONSE_CACHE_ENTRIES = 64
+
+# Pagination defaults for list endpoints
+DEFAULT_PAGE_LIMIT = 100
+MAX_PAGE_LIMIT = 500
+
+# Pre-encoded wrappers for list responses, so only the list itself goes
+# through the JSON encoder
+_GROUPS_PREFIX = b'{"groups":'
+_CLAIMS_PREFIX = b'{"claims":'
+_OFFERS_PREFIX = b'{"offers":'
+_PEERS_PREFIX = b'{"peers":'
+_SUBSCRIPTIONS_PREFIX = b'{"subscriptions":'
+_PAGE_SUFFIX = b',"total":%d,"offset":%d,"limit":%d}'
+
+
+async def _read_head(reader: asyncio.StreamReader) -> List[bytes]:
+    """Read a request head and return its lines without line endings.
+
+    Lines may end in CRLF or a bare LF; the head ends at the first empty
+    line after the request line. Empty lines before the request line are
+    skipped (RFC 7230 section 3.5), so a stray CRLF after a keep-alive
+    request does not end the connection.
+
+    Raises:
+        asyncio.IncompleteReadError: If the client closed the connection
+            before completing the head.
+        asyncio.LimitOverrunError: If the head exceeds MAX_REQUEST_HEAD_BYTES.
+    """
+    lines: List[bytes] = []
+    size = 0
+    while True:
+        try:
+            line = await reader.readline()
+        except ValueError:
+            # A single line longer than the stream limit
+            raise asyncio.LimitOverrunError("request head too large", size)
+        if not line.endswith(b"\n"):
+            raise asyncio.IncompleteReadError(line, None)
+        size += len(line)
+        if size > MAX_REQUEST_HEAD_BYTES:
+            raise asyncio.LimitOverrunError("request head too large", size)
+        line = line.rstrip(b"\r\n")
+        if not line:
+            if lines:
+                return lines
+            continue
+        lines.append(line)
+
+
+def _parse_query(query: bytes) -> Dict[str, str]:
+    """Parse a raw query string into a flat ``{key: value}`` dict.
+
+    The admin API only consults a handful of simple keys (``id``,
+    ``group_id``), so this skips ``urllib.parse.parse_qs`` and its
+    dict-of-lists result. The first occurrence of a key wins and values are
+    percent-decoded only when they actually contain an escape.
+    """
+    params: Dict[str, str] = {}
+    if not query:
+        return params
+    for pair in query.split(b"&"):
+        key, sep, value = pair.partition(b"=")
+        if not sep:
+            continue
+        k = key.decode("utf-8", errors="replace")
+        if k in params:
+            continue
+        if b"%" in value or b"+" in value:
+            params[k] = urllib.parse.unquote_plus(value.decode("utf-8", errors="replace"))
+        else:
+            params[k] = value.decode("utf-8", errors="replace")
+    return params
+
+
+def _parse_page(params: Dict[str, str]) -> tuple[int, int]:
+    """Read ``offset``/``limit`` pagination params.
+
+    Returns:
+        Tuple of (offset, limit) with limit clamped to MAX_PAGE_LIMIT.
+
+    Raises:
+        ValueError: If either value is not a non-negative integer.
+    """
+    offset = int(params.get("offset", "0"))
+    limit = int(params.get("limit", str(DEFAULT_PAGE_LIMIT)))
+    if offset < 0 or limit < 0:
+        raise ValueError("offset and limit must be non-negative")
+    return offset, min(limit, MAX_PAGE_LIMIT)
+
+
+@functools.lru_cache(maxsize=8)
+def _cors_header(origin: Optional[str]) -> bytes:
+    """Return the encoded Access-Control-Allow-Origin line for origin, or b"".
+
+    Browsers send the same Origin on every request, so the result is cached.
+    """
+    if origin and (origin in _ALLOWED_CORS_EXACT or origin.startswith(_ALLOWED_CORS_PREFIXES)):
+        return f"Access-Control-Allow-Origin: {origin}\r\n".encode("utf-8")
+    return b""
+
+
+def _short(value: str, keep: int = 16) -> str:
+    """Abbreviate a key/hash for display, leaving short values untouched."""
+    return value if len(value) <= keep + 3 else value[:keep] + "..."
+
+
+def _list_body(prefix: bytes, items: list) -> bytes:
+    """Encode ``{"<key>": items}`` using a pre-encoded prefix."""
+    return b"".join((prefix, fastjson.dumps(items), b"}"))
+
+
+def _page_body(prefix: bytes, items: list, total: int, offset: int, limit: int) -> bytes:
+    """Encode a paginated ``{"<key>": items, "total", "offset", "limit"}`` body."""
+    return b"".join((prefix, fastjson.dumps(items), _PAGE_SUFFIX % (total, offset, limit)))
+
+
+def _bad_request(message: str) -> tuple:
+    return 400, CONTENT_TYPE_JSON, fastjson.dumps({"error": message})
+
 
 class AdminServer:
     """Lightweight HTTP server for the admin panel.
@@ -58,23 +209,55 @@ class AdminServer:
     def __init__(self, node: "BatteryNode", *, auth_password: Optional[str] = None):
         self.node = node
         self._server: Optional[asyncio.AbstractServer] = None
-        self._routes: Dict[str, Callable[..., Awaitable[tuple]]] = {}
+        self._routes: Dict[bytes, Callable[..., Awaitable[tuple]]] = {}
+        self._param_routes: frozenset[bytes] = frozenset()
+        self._ttl_routes: frozenset[bytes] = frozenset()
+        # Raw request target -> (expires_at monotonic, encoded body)
+        self._response_cache: Dict[bytes, tuple[float, bytes]] = {}
+        self._handler_sem = asyncio.Semaphore(MAX_CONCURRENT_HANDLERS)
+        self._handlers_waiting = 0
         self._auth_password = auth_password
+        # Cached response bodies keyed on the counters they depend on
+        self._node_cache: Optional[tuple[int, int, bytes]] = None
+        self._sync_cache: Optional[tuple[int, int, bytes]] = None
+        # Precompute the expected "Basic" credential so the hot path is a
+        # single constant-time compare against the raw header value.
+        self._expected_auth_b64: Optional[bytes] = None
+        if auth_password is not None:
+            self._expected_auth_b64 = base64.b64encode(
+                f"admin:{auth_password}".encode("utf-8")
+            )
         self._setup_routes()
 
     def _setup_routes(self) -> None:
         """Register all routes."""
         self._routes = {
-            "/": self._handle_dashboard,
-            "/api/node": self._handle_api_node,
-            "/api/groups": self._handle_api_groups,
-            "/api/group": self._handle_api_group_detail,
-            "/api/peers": self._handle_api_peers,
-            "/api/subscriptions": self._handle_api_subscriptions,
-            "/api/offers": self._handle_api_offers,
-            "/api/sync": self._handle_api_sync,
-            "/api/claims": self._handle_api_claims,
-        }
+            b"/": self._handle_dashboard,
+            b"/api/node": self._handle_api_node,
+            b"/api/groups": self._handle_api_groups,
+            b"/api/group": self._handle_api_group_detail,
+            b"/api/peers": self._handle_api_peers,
+            b"/api/subscriptions": self._handle_api_subscriptions,
+            b"/api/offers": self._handle_api_offers,
+            b"/api/sync": self._handle_api_sync,
+            b"/api/claims": self._handle_api_claims,
+            b"/api/dashboard": self._handle_api_dashboard,
+        }
+        # Routes whose handlers read query params; others skip query parsing
+        self._param_routes = frozenset((
+            b"/api/groups",
+            b"/api/group",
+            b"/api/offers",
+            b"/api/claims",
+        ))
+        # Routes whose 200 responses are cached for RESPONSE_CACHE_TTL
+        self._ttl_routes = frozenset((
+            b"/api/groups",
+            b"/api/peers",
+            b"/api/offers",
+            b"/api/subscriptions",
+            b"/api/dashboard",
+        ))
 
     def _check_auth(self, auth_header: Optional[str]) -> bool:
         """Check HTTP Basic Authentication.
@@ -91,30 +274,17 @@ class AdminServer:
         if not auth_header:
             return False
 
-        try:
-            # Parse "Basic <base64>"
-            if not auth_header.startswith("Basic "):
-                return False
-
-            encoded = auth_header[6:]
-            decoded = base64.b64decode(encoded).decode("utf-8")
-
-            # Parse "username:password"
-            if ":" not in decoded:
-                return False
-
-            username, password = decoded.split(":", 1)
-
-            # Only accept username "admin"
-            if username != "admin":
-                return False
-
-            # Constant-time comparison to prevent timing attacks
-            return hmac.compare_digest(password, self._auth_password)
-
-        except Exception:
+        # Parse "Basic <base64>"
+        if not auth_header.startswith("Basic "):
             return False
 
+        # The header is a stable encoding of "admin:<password>", so compare it
+        # directly (constant-time) instead of decoding and splitting per request.
+        encoded = auth_header[6:].strip()
+        return hmac.compare_digest(
+            encoded.encode("utf-8", errors="replace"), self._expected_auth_b64
+        )
+
     async def _send_unauthorized(
         self,
         writer: asyncio.StreamWriter,
@@ -123,33 +293,21 @@ class AdminServer:
         """Send a 401 Unauthorized response with WWW-Authenticate header."""
         body = b"<h1>401 Unauthorized</h1><p>Authentication required.</p>"
 
-        cors_header = ""
-        if origin:
-            allowed_origins = [
-                "http://127.0.0.1", "http://localhost",
-                "https://127.0.0.1", "https://localhost",
-            ]
-            for allowed in allowed_origins:
-                if origin == allowed or origin.startswith(allowed + ":"):
-                    cors_header = f"Access-Control-Allow-Origin: {origin}\r\n"
-                    break
-
         response = (
             f"HTTP/1.1 401 Unauthorized\r\n"
             f"Content-Type: {CONTENT_TYPE_HTML}\r\n"
             f"Content-Length: {len(body)}\r\n"
             f"WWW-Authenticate: Basic realm=\"LBM Admin Panel\"\r\n"
             f"Connection: close\r\n"
-            f"{cors_header}"
-            f"\r\n"
         ).encode("utf-8")
-        writer.write(response + body)
+        writer.writelines((response, _cors_header(origin), b"\r\n", body))
         await writer.drain()
 
     async def start(self, host: str = "127.0.0.1", port: int = 8080) -> None:
         """Start the admin server."""
         self._server = await asyncio.start_server(
-            self._handle_connection, host, port
+            self._handle_connection, host, port,
+            limit=MAX_REQUEST_HEAD_BYTES, backlog=MAX_PENDING_HANDLERS
         )
         logger.info(f"Admin panel running at http://{host}:{port}")
 
@@ -170,71 +328,29 @@ class AdminServer:
     async def _handle_connection(
         self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
     ) -> None:
-        """Handle an incoming HTTP connection."""
-        origin: Optional[str] = None
-        auth_header: Optional[str] = None
+        """Handle an incoming HTTP connection.
+
+        Requests are served in a loop for as long as the client asks for
+        keep-alive; otherwise the connection is closed after one response.
+        """
+        timeout = 30.0
         try:
-            # Read request line
-            request_line = await asyncio.wait_for(
-                reader.readline(), timeout=30.0
-            )
-            if not request_line:
-                return
-
-            request_str = request_line.decode("utf-8", errors="replace").strip()
-            parts = request_str.split(" ")
-            if len(parts) < 2:
-                await self._send_response(writer, 400, "Bad Request", CONTENT_TYPE_HTML, b"Bad Request")
-                return
-
-            method = parts[0]
-            path = parts[1]
-
-            # Read headers and extract Origin for CORS and Authorization for auth
-            while True:
-                header_line = await asyncio.wait_for(reader.readline(), timeout=10.0)
-                if header_line in (b"\r\n", b"\n", b""):
-                    break
-                header_str = header_line.decode("utf-8", errors="replace").strip()
-                header_lower = header_str.lower()
-                # Parse Origin header for CORS
-                if header_lower.startswith("origin:"):
-                    origin = header_str[7:].strip()
-                # Parse Authorization header for Basic Auth
-                elif header_lower.startswith("authorization:"):
-                    auth_header = header_str[14:].strip()
-
-            # Check authentication
-            if not self._check_auth(auth_header):
-                await self._send_unauthorized(writer, origin)
-                return
-
-            # Parse path and query string
-            parsed = urllib.parse.urlparse(path)
-            route_path = parsed.path
-            query_params = urllib.parse.parse_qs(parsed.query)
-
-            # Find route handler
-            handler = self._routes.get(route_path)
-            if handler:
+            for _ in range(MAX_KEEPALIVE_REQUESTS):
+                # Read the whole request head (request line + headers)
                 try:
-                    status, content_type, body = await handler(method, query_params)
-                    await self._send_response(writer, status, "OK", content_type, body, origin)
-                except Exception as e:
-                    logger.error(f"Error handling {route_path}: {e}")
+                    lines = await asyncio.wait_for(_read_head(reader), timeout=timeout)
+                except asyncio.IncompleteReadError:
+                    return
+                except asyncio.LimitOverrunError:
                     await self._send_response(
-                        writer, 500, "Internal Server Error",
-                        CONTENT_TYPE_JSON,
-                        json.dumps({"error": str(e)}).encode(),
-                        origin
+                        writer, 431, "Request Header Fields Too Large",
+                        CONTENT_TYPE_HTML, b"Request Header Fields Too Large"
                     )
-            else:
-                await self._send_response(
-                    writer, 404, "Not Found",
-                    CONTENT_TYPE_HTML,
-                    b"<h1>404 Not Found</h1>",
-                    origin
-                )
+                    return
+
+                if not await self._handle_request(lines, writer):
+                    return
+                timeout = KEEPALIVE_IDLE_TIMEOUT
 
         except asyncio.TimeoutError:
             pass
@@ -247,6 +363,119 @@ class AdminServer:
             except Exception:
                 pass
 
+    async def _handle_request(self, lines: List[bytes], writer: asyncio.StreamWriter) -> bool:
+        """Serve one request given the lines of its head.
+
+        Returns:
+            True if the connection should be kept open for another request.
+        """
+        origin: Optional[str] = None
+        auth_header: Optional[str] = None
+        keep_alive = False
+        has_body = False
+
+        parts = lines[0].strip().split(b" ") if lines else []
+        if len(parts) < 2:
+            await self._send_response(writer, 400, "Bad Request", CONTENT_TYPE_HTML, b"Bad Request")
+            return False
+
+        method = parts[0].decode("ascii", errors="replace")
+        target = parts[1]
+
+        # Extract Origin for CORS, Authorization for auth and Connection for
+        # keep-alive. Header names are matched on a lowercased bytes prefix;
+        # only the values we use are ever decoded.
+        for header_line in lines[1:]:
+            name = header_line[:18].lower()
+            # Values holding control characters are dropped: Origin is
+            # reflected into the response, and neither can legitimately
+            # contain them
+            if name.startswith(b"origin:"):
+                value = header_line[7:].strip()
+                origin = None if _CTL_RE.search(value) else value.decode("latin-1")
+            elif name.startswith(b"authorization:"):
+                value = header_line[14:].strip()
+                auth_header = None if _CTL_RE.search(value) else value.decode("latin-1")
+            elif name.startswith(b"connection:"):
+                keep_alive = b"keep-alive" in header_line[11:].lower()
+            elif name.startswith((b"content-length:", b"transfer-encoding:")):
+                has_body = header_line.partition(b":")[2].strip() not in (b"", b"0")
+
+        # Request bodies are never read, so a connection that sent one can't
+        # be reused: the next "request" would start inside the body.
+        keep_alive = keep_alive and not has_body
+
+        # Check authentication
+        if not self._check_auth(auth_header):
+            await self._send_unauthorized(writer, origin)
+            return False
+
+        # Dispatch on the raw path bytes; only parse the query string for
+        # handlers that consume params
+        route_path, _, query = target.partition(b"?")
+        handler = self._routes.get(route_path)
+        if not handler:
+            await self._send_response(
+                writer, 404, "Not Found",
+                CONTENT_TYPE_HTML,
+                b"<h1>404 Not Found</h1>",
+                origin, keep_alive=keep_alive
+            )
+            return keep_alive
+
+        # Short-lived cache for list endpoints, keyed by path + query. Hits
+        # skip the handler and the concurrency limit entirely.
+        cacheable = method == "GET" and route_path in self._ttl_routes
+        if cacheable:
+            cached = self._response_cache.get(target)
+            if cached is not None and cached[0] > time.monotonic():
+                await self._send_response(
+                    writer, 200, "OK", CONTENT_TYPE_JSON, cached[1],
+                    origin, keep_alive=keep_alive, max_age=RESPONSE_CACHE_TTL
+                )
+                return keep_alive
+
+        if self._handler_sem.locked() and self._handlers_waiting >= MAX_PENDING_HANDLERS:
+            await self._send_response(
+                writer, 503, "Service Unavailable",
+                CONTENT_TYPE_JSON,
+                b'{"error":"server busy"}',
+                origin
+            )
+            return False
+
+        query_params = _parse_query(query) if route_path in self._param_routes else {}
+        self._handlers_waiting += 1
+        try:
+            await self._handler_sem.acquire()
+        finally:
+            self._handlers_waiting -= 1
+        try:
+            status, content_type, body = await handler(method, query_params)
+        except Exception as e:
+            logger.error(f"Error handling {route_path.decode('utf-8', errors='replace')}: {e}")
+            await self._send_response(
+                writer, 500, "Internal Server Error",
+                CONTENT_TYPE_JSON,
+                fastjson.dumps({"error": str(e)}),
+                origin, keep_alive=keep_alive
+            )
+            return keep_alive
+        finally:
+            self._handler_sem.release()
+
+        max_age = None
+        if cacheable and status == 200:
+            if len(self._response_cache) >= MAX_RESPONSE_CACHE_ENTRIES:
+                self._response_cache.clear()
+            self._response_cache[target] = (time.monotonic() + RESPONSE_CACHE_TTL, body)
+            max_age = RESPONSE_CACHE_TTL
+        await self._send_response(
+            writer, status, "OK", content_type, body,
+            origin, keep_alive=keep_alive, max_age=max_age
+        )
+        return keep_alive
+
     async def _send_response(
         self,
         writer: asyncio.StreamWriter,
@@ -254,43 +483,28 @@ class AdminServer:
         status_text: str,
         content_type: str,
         body: bytes,
-        origin: Optional[str] = None
+        origin: Optional[str] = None,
+        *,
+        keep_alive: bool = False,
+        max_age: Optional[int] = None
     ) -> None:
         """Send an HTTP response.
 
         CORS is restricted to localhost origins only for security.
         The admin panel should only be accessed from the same machine.
         """
-        # Only allow CORS for localhost origins
-        cors_header = ""
-        if origin:
-            # Whitelist localhost variants with strict matching
-            # Must be exact match or followed by port (e.g., :8080)
-            allowed_origins = [
-                "http://127.0.0.1",
-                "http://localhost",
-                "https://127.0.0.1",
-                "https://localhost",
-            ]
-            for allowed in allowed_origins:
-                if origin == allowed:
-                    # Exact match (no port)
-                    cors_header = f"Access-Control-Allow-Origin: {origin}\r\n"
-                    break
-                elif origin.startswith(allowed + ":"):
-                    # Match with port (e.g., http://localhost:8080)
-                    cors_header = f"Access-Control-Allow-Origin: {origin}\r\n"
-                    break
-
+        if keep_alive:
+            connection = f"Connection: keep-alive\r\nKeep-Alive: timeout={KEEPALIVE_IDLE_TIMEOUT:g}\r\n"
+        else:
+            connection = "Connection: close\r\n"
+        cache_control = f"Cache-Control: private, max-age={max_age}\r\n" if max_age else ""
         response = (
             f"HTTP/1.1 {status_code} {status_text}\r\n"
             f"Content-Type: {content_type}\r\n"
             f"Content-Length: {len(body)}\r\n"
-            f"Connection: close\r\n"
-            f"{cors_header}"
-            f"\r\n"
+            f"{cache_control}{connection}"
         ).encode("utf-8")
-        writer.write(response + body)
+        writer.writelines((response, _cors_header(origin), b"\r\n", body))
         await writer.drain()
 
     # -------------------------------------------------------------------------
@@ -304,25 +518,41 @@ class AdminServer:
 
     async def _handle_api_node(self, method: str, params: dict) -> tuple:
         """Return node information."""
+        # Everything except the group/offer counts is static for the node's
+        # lifetime, so reuse the encoded body until one of the counts changes.
+        groups_count = len(self.node.groups)
+        offers_count = len(self.node.offer_book)
+        cached = self._node_cache
+        if cached is not None and cached[0] == groups_count and cached[1] == offers_count:
+            return 200, CONTENT_TYPE_JSON, cached[2]
+
         data = {
             "node_id": self.node.node_id,
             "sign_pub": self.node.keys.sign_pub_b64,
             "enc_pub": self.node.keys.enc_pub_b64,
             "data_dir": str(self.node.data_dir),
-            "groups_count": len(self.node.groups),
-            "offers_count": len(self.node.offer_book),
+            "groups_count": groups_count,
+            "offers_count": offers_count,
             "version": __version__,
             "auth_enabled": self._auth_password is not None,
         }
-        return 200, CONTENT_TYPE_JSON, json.dumps(data).encode()
+        body = fastjson.dumps(data)
+        self._node_cache = (groups_count, offers_count, body)
+        return 200, CONTENT_TYPE_JSON, body
 
     async def _handle_api_groups(self, method: str, params: dict) -> tuple:
-        """Return list of all groups."""
+        """Return a page of groups."""
+        try:
+            offset, limit = _parse_page(params)
+        except ValueError as e:
+            return _bad_request(str(e))
+
         groups = []
-        for gid, g in self.node.groups.items():
+        for gid, g in itertools.islice(self.node.groups.items(), offset, offset + limit):
             state = g.chain.state
             groups.append({
                 "group_id": gid,
+                "group_id_short": _short(gid, 12),
                 "name": state.policy.name,
                 "currency": state.policy.currency,
                 "height": g.chain.head.height,
@@ -330,40 +560,42 @@ class AdminServer:
                 "claims_count": len(g.graph.claims) if g.graph else 0,
                 "offers_count": len(state.offers),
             })
-        return 200, CONTENT_TYPE_JSON, json.dumps({"groups": groups}).encode()
+        return 200, CONTENT_TYPE_JSON, _page_body(
+            _GROUPS_PREFIX, groups, len(self.node.groups), offset, limit
+        )
 
     async def _handle_api_group_detail(self, method: str, params: dict) -> tuple:
         """Return detailed info for a specific group."""
-        group_id = params.get("id", [""])[0]
+        group_id = params.get("id", "")
         if not group_id or group_id not in self.node.groups:
-            return 404, CONTENT_TYPE_JSON, json.dumps({"error": "Group not found"}).encode()
+            return 404, CONTENT_TYPE_JSON, fastjson.dumps({"error": "Group not found"})
 
         g = self.node.groups[group_id]
         state = g.chain.state
 
-        # Get members with roles (admins and members are separate sets)
-        members = []
-        for pub in state.admins:
-            members.append({"pub": pub[:16] + "...", "pub_full": pub, "role": "admin"})
-        for pub in state.members:
-            if pub not in state.admins:
-                members.append({"pub": pub[:16] + "...", "pub_full": pub, "role": "member"})
+        # Admins first, then the remaining members (set difference runs in C)
+        admins = state.admins
+        members = [
+            {"pub": _short(pub), "pub_full": pub, "role": "admin"} for pub in admins
+        ]
+        members.extend(
+            {"pub": _short(pub), "pub_full": pub, "role": "member"}
+            for pub in state.members - admins
+        )
 
-        # Get balances
         balances = [
-            {"pub": pub[:16] + "...", "pub_full": pub, "amount": amt}
+            {"pub": _short(pub), "pub_full": pub, "amount": amt}
             for pub, amt in state.balances.items()
             if amt > 0
         ]
 
-        # Get offers
         offers = [
             {
                 "offer_id": oid,
                 "title": o.title,
                 "price": o.price,
                 "active": o.active,
-                "seller": o.seller[:16] + "...",
+                "seller": _short(o.seller),
             }
             for oid, o in state.offers.items()
         ]
@@ -373,7 +605,7 @@ class AdminServer:
             "name": state.policy.name,
             "currency": state.policy.currency,
             "height": g.chain.head.height,
-            "head_hash": g.chain.head.block_id[:16] + "...",
+            "head_hash": _short(g.chain.head.block_id),
             "members": members,
             "balances": balances,
             "offers": offers,
@@ -382,40 +614,46 @@ class AdminServer:
                 "currency": state.policy.currency,
             }
         }
-        return 200, CONTENT_TYPE_JSON, json.dumps(data).encode()
+        return 200, CONTENT_TYPE_JSON, fastjson.dumps(data)
 
     async def _handle_api_claims(self, method: str, params: dict) -> tuple:
-        """Return claims for a specific group."""
-        group_id = params.get("group_id", [""])[0]
+        """Return a page of claims for a specific group."""
+        group_id = params.get("group_id", "")
         if not group_id or group_id not in self.node.groups:
-            return 404, CONTENT_TYPE_JSON, json.dumps({"error": "Group not found"}).encode()
-
-        g = self.node.groups[group_id]
-        claims = []
-
-        if g.graph:
-            for claim_hash, claim in g.graph.claims.items():
-                # Get the actual text from CAS
-                try:
-                    artifact = self.node.cas.get(claim_hash)
-                    artifact_data = json.loads(artifact.decode("utf-8"))
-                    text = artifact_data.get("text", "")
-                    tags = artifact_data.get("tags", [])
-                except Exception:
-                    text = "[Unable to load]"
-                    tags = []
-
-                claims.append({
-                    "hash": claim_hash[:16] + "...",
-                    "hash_full": claim_hash,
-                    "text": text[:200] + ("..." if len(text) > 200 else ""),
-                    "text_full": text,
-                    "tags": tags,
-                    "retracted": claim.retracted,
-                    "created_ms": claim.created_ms,
-                })
-
-        return 200, CONTENT_TYPE_JSON, json.dumps({"claims": claims}).encode()
+            return 404, CONTENT_TYPE_JSON, fastjson.dumps({"error": "Group not found"})
+        try:
+            offset, limit = _parse_page(params)
+        except ValueError as e:
+            return _bad_request(str(e))
+
+        # Building and encoding a page touches the live graph, so do it under
+        # the node lock on a worker thread: a writer holding the lock (e.g. a
+        # publish_claim fsync) then stalls this request, not the event loop.
+        body = await asyncio.to_thread(self._claims_page, group_id, offset, limit)
+        return 200, CONTENT_TYPE_JSON, body
+
+    def _claims_page(self, group_id: str, offset: int, limit: int) -> bytes:
+        """Build the encoded /api/claims body for one page (blocking)."""
+        with self.node._lock:
+            g = self.node.groups[group_id]
+            all_claims = g.graph.claims if g.graph else {}
+
+            # The context graph already holds each claim's text and tags (they
+            # are loaded from the artifact when the claim is added), so rows are
+            # built without re-reading and re-parsing artifacts from CAS.
+            claims = [
+                {
+                    "hash": h[:16] + "...",
+                    "hash_full": h,
+                    "text": c.text if len(c.text) <= 200 else c.text[:200] + "...",
+                    "text_full": c.text,
+                    "tags": c.tags,
+                    "retracted": c.retracted,
+                    "created_ms": c.created_ms,
+                }
+                for h, c in itertools.islice(all_claims.items(), offset, offset + limit)
+            ]
+            return _page_body(_CLAIMS_PREFIX, claims, len(all_claims), offset, limit)
 
     async def _handle_api_peers(self, method: str, params: dict) -> tuple:
         """Return list of registered peers."""
@@ -431,7 +669,7 @@ class AdminServer:
                     "last_error": p.last_error,
                     "added_ms": p.added_ms,
                 })
-        return 200, CONTENT_TYPE_JSON, json.dumps({"peers": peers}).encode()
+        return 200, CONTENT_TYPE_JSON, _list_body(_PEERS_PREFIX, peers)
 
     async def _handle_api_subscriptions(self, method: str, params: dict) -> tuple:
         """Return list of subscriptions."""
@@ -440,6 +678,7 @@ class AdminServer:
             for s in self.node.peer_registry.list_subscriptions():
                 subs.append({
                     "group_id": s.group_id,
+                    "group_id_short": _short(s.group_id, 12),
                     "peer_host": s.peer_host,
                     "peer_port": s.peer_port,
                     "sync_interval_s": s.sync_interval_s,
@@ -447,12 +686,17 @@ class AdminServer:
                     "last_sync_ms": s.last_sync_ms,
                     "last_error": s.last_error,
                 })
-        return 200, CONTENT_TYPE_JSON, json.dumps({"subscriptions": subs}).encode()
+        return 200, CONTENT_TYPE_JSON, _list_body(_SUBSCRIPTIONS_PREFIX, subs)
 
     async def _handle_api_offers(self, method: str, params: dict) -> tuple:
-        """Return list of market offers."""
+        """Return a page of market offers."""
+        try:
+            offset, limit = _parse_page(params)
+        except ValueError as e:
+            return _bad_request(str(e))
+
         offers = []
-        for oid, o in self.node.offer_book.items():
+        for oid, o in itertools.islice(self.node.offer_book.items(), offset, offset + limit):
             # offer_book stores dicts from OfferAnnouncement.to_dict()
             seller_pub = o.get("seller_sign_pub", "")
             offers.append({
@@ -468,26 +712,64 @@ class AdminServer:
                 "created_ms": o.get("created_ms", 0),
                 "expires_ms": o.get("expires_ms"),
             })
-        return 200, CONTENT_TYPE_JSON, json.dumps({"offers": offers}).encode()
+        return 200, CONTENT_TYPE_JSON, _page_body(
+            _OFFERS_PREFIX, offers, len(self.node.offer_book), offset, limit
+        )
+
+    async def _handle_api_dashboard(self, method: str, params: dict) -> tuple:
+        """Return node info and the first page of every list in one response.
+
+        Each section is the exact body its own endpoint returns with default
+        params, spliced into one object without re-encoding.
+        """
+        sections = await asyncio.gather(
+            self._handle_api_node(method, {}),
+            self._handle_api_groups(method, {}),
+            self._handle_api_peers(method, {}),
+            self._handle_api_offers(method, {}),
+            self._handle_api_subscriptions(method, {}),
+        )
+        body = b"".join((
+            b'{"node":', sections[0][2],
+            b',"groups":', sections[1][2],
+            b',"peers":', sections[2][2],
+            b',"offers":', sections[3][2],
+            b',"subscriptions":', sections[4][2],
+            b"}",
+        ))
+        return 200, CONTENT_TYPE_JSON, body
 
     async def _handle_api_sync(self, method: str, params: dict) -> tuple:
         """Return sync daemon status."""
+        # Note: Sync daemon status would need to be passed in or accessed differently
+        # For now, just return subscription counts from registry
+        if not (hasattr(self.node, '_registry') and self.node._registry):
+            data = {
+                "daemon_available": False,
+                "running": False,
+                "subscriptions_total": 0,
+                "subscriptions_enabled": 0,
+                "subscriptions_due": 0,
+            }
+            return 200, CONTENT_TYPE_JSON, fastjson.dumps(data)
+
+        subs = self.node.peer_registry.list_subscriptions()
+        total = len(subs)
+        enabled = sum(1 for s in subs if s.enabled)
+        cached = self._sync_cache
+        if cached is not None and cached[0] == total and cached[1] == enabled:
+            return 200, CONTENT_TYPE_JSON, cached[2]
+
         data = {
-            "daemon_available": False,
+            "daemon_available": True,
             "running": False,
-            "subscriptions_total": 0,
-            "subscriptions_enabled": 0,
+            "subscriptions_total": total,
+            "subscriptions_enabled": enabled,
             "subscriptions_due": 0,
         }
-        # Note: Sync daemon status would need to be passed in or accessed differently
-        # For now, just return subscription counts from registry
-        if hasattr(self.node, '_registry') and self.node._registry:
-            subs = self.node.peer_registry.list_subscriptions()
-            data["subscriptions_total"] = len(subs)
-            data["subscriptions_enabled"] = sum(1 for s in subs if s.enabled)
-            data["daemon_available"] = True
-
-        return 200, CONTENT_TYPE_JSON, json.dumps(data).encode()
+        body = fastjson.dumps(data)
+        self._sync_cache = (total, enabled, body)
+        return 200, CONTENT_TYPE_JSON, body
 
     def _get_dashboard_html(self) -> str:
         """Return the main dashboard HTML."""
@@ -686,6 +968,31 @@ class AdminServer:
             margin: 0.125rem;
         }
 
+        .vscroll {
+            max-height: 60vh;
+            overflow-y: auto;
+        }
+
+        .vtable th {
+            position: sticky;
+            top: 0;
+            background: var(--card-bg);
+        }
+
+        .vtable tbody tr {
+            height: 41px;
+        }
+
+        .vtable td {
+            white-space: nowrap;
+            overflow: hidden;
+        }
+
+        .vtable .vspacer td {
+            padding: 0;
+            border: none;
+        }
+
         .btn {
             padding: 0.5rem 1rem;
             font-size: 0.875rem;
@@ -922,7 +1229,7 @@ class AdminServer:
             <div class="card">
                 <div class="card-header">
                     <span>Knowledge Groups</span>
-                    <button class="btn btn-sm btn-primary" onclick="loadGroups()">Refresh</button>
+                    <button class="btn btn-sm btn-primary" onclick="refresh.groups()">Refresh</button>
                 </div>
                 <div class="card-body" id="groups-table-container">
                     <div class="loading">Loading...</div>
@@ -935,7 +1242,7 @@ class AdminServer:
             <div class="card">
                 <div class="card-header">
                     <span>Knowledge Claims</span>
-                    <select id="group-select" class="btn btn-sm" onchange="loadClaims()">
+                    <select id="group-select" class="btn btn-sm" onchange="refresh.claims()">
                         <option value="">Select a group...</option>
                     </select>
                 </div>
@@ -953,7 +1260,7 @@ class AdminServer:
             <div class="card">
                 <div class="card-header">
                     <span>Registered Peers</span>
-                    <button class="btn btn-sm btn-primary" onclick="loadPeers()">Refresh</button>
+                    <button class="btn btn-sm btn-primary" onclick="refresh.peers()">Refresh</button>
                 </div>
                 <div class="card-body" id="peers-container">
                     <div class="loading">Loading...</div>
@@ -966,7 +1273,7 @@ class AdminServer:
             <div class="card">
                 <div class="card-header">
                     <span>Auto-Sync Subscriptions</span>
-                    <button class="btn btn-sm btn-primary" onclick="loadSubscriptions()">Refresh</button>
+                    <button class="btn btn-sm btn-primary" onclick="refresh.subscriptions()">Refresh</button>
                 </div>
                 <div class="card-body" id="subscriptions-container">
                     <div class="loading">Loading...</div>
@@ -979,7 +1286,7 @@ class AdminServer:
             <div class="card">
                 <div class="card-header">
                     <span>Market Offers</span>
-                    <button class="btn btn-sm btn-primary" onclick="loadOffers()">Refresh</button>
+                    <button class="btn btn-sm btn-primary" onclick="refresh.offers()">Refresh</button>
                 </div>
                 <div class="card-body" id="offers-container">
                     <div class="loading">Loading...</div>
@@ -999,6 +1306,15 @@ class AdminServer:
         </div>
     </div>
 
+    <!-- Row templates: cloned and filled via textContent, never parsed per row -->
+    <template id="row-group"><tr><td><strong></strong></td><td><code></code></td><td></td><td></td><td></td><td></td><td><button class="btn btn-sm btn-primary">Details</button></td></tr></template>
+    <template id="row-claim"><tr><td><code class="clickable"></code></td><td class="claim-text"></td><td></td><td><span></span></td></tr></template>
+    <template id="row-peer"><tr><td></td><td><code></code></td><td></td><td><code></code></td><td class="rel"></td><td><span></span></td></tr></template>
+    <template id="row-subscription"><tr><td><code></code></td><td><code></code></td><td></td><td class="rel"></td><td><span></span></td></tr></template>
+    <template id="row-member"><tr><td><code></code></td><td><span class="badge badge-info"></span></td></tr></template>
+    <template id="row-balance"><tr><td><code></code></td><td></td></tr></template>
+    <template id="row-offer"><tr><td><strong></strong></td><td></td><td></td><td><code></code></td><td><code></code></td><td class="rel"></td></tr></template>
+
     <script>
         // Tab switching
         document.querySelectorAll('.nav-tab').forEach(tab => {
@@ -1010,10 +1326,10 @@ class AdminServer:
 
                 // Load data for the tab
                 switch(tab.dataset.tab) {
-                    case 'groups': loadGroups(); break;
-                    case 'peers': loadPeers(); break;
-                    case 'subscriptions': loadSubscriptions(); break;
-                    case 'market': loadOffers(); break;
+                    case 'groups': refresh.groups(); break;
+                    case 'peers': refresh.peers(); break;
+                    case 'subscriptions': refresh.subscriptions(); break;
+                    case 'market': refresh.offers(); break;
                     case 'knowledge': loadGroupSelect(); break;
                 }
             });
@@ -1040,9 +1356,8 @@ class AdminServer:
         }
 
         // Format relative time
-        function formatRelativeTime(ms) {
+        function formatRelativeTime(ms, now = Date.now()) {
             if (!ms) return '-';
-            const now = Date.now();
             const diff = now - ms;
             if (diff < 60000) return 'Just now';
             if (diff < 3600000) return Math.floor(diff / 60000) + 'm ago';
@@ -1050,43 +1365,275 @@ class AdminServer:
             return Math.floor(diff / 86400000) + 'd ago';
         }
 
+        // Relative-time cells (td.rel) keep their timestamp in data-ts, and a
+        // single timer re-ages the ones on the visible tab
+        function setRelativeTime(td, ms) {
+            td.dataset.ts = ms || 0;
+            td.textContent = formatRelativeTime(ms);
+        }
+
+        setInterval(() => {
+            const now = Date.now();
+            document.querySelectorAll('.tab-content.active td.rel').forEach(td => {
+                td.textContent = formatRelativeTime(+td.dataset.ts, now);
+            });
+        }, 30000);
+
         // API calls
-        async function fetchAPI(endpoint) {
-            const response = await fetch(endpoint);
+        // Responses obtained ahead of a tab switch, keyed by URL. Each entry
+        // is used at most once and only while fresh, so Refresh always refetches.
+        const PREFETCH_TTL_MS = 2000;
+        const prefetched = new Map();
+
+        function prefetch(endpoint, data) {
+            prefetched.set(endpoint, {promise: Promise.resolve(data), at: Date.now()});
+        }
+
+        async function fetchAPI(endpoint, signal) {
+            const hit = prefetched.get(endpoint);
+            if (hit) {
+                prefetched.delete(endpoint);
+                if (Date.now() - hit.at < PREFETCH_TTL_MS) return hit.promise;
+            }
+            const response = await fetch(endpoint, {signal});
             return response.json();
         }
 
-        // Load node info
-        async function loadNodeInfo() {
-            try {
-                const data = await fetchAPI('/api/node');
-                document.getElementById('node-id').textContent = data.node_id;
-                document.getElementById('groups-count').textContent = data.groups_count;
-                document.getElementById('offers-count').textContent = data.offers_count;
-                document.getElementById('version').textContent = 'v' + data.version;
-                document.getElementById('sign-pub').textContent = data.sign_pub;
-                document.getElementById('enc-pub').textContent = data.enc_pub;
-                document.getElementById('data-dir').textContent = data.data_dir;
-
-                // Show security warning if auth is disabled
-                const warningEl = document.getElementById('security-warning');
-                if (!data.auth_enabled) {
-                    warningEl.style.display = 'block';
-                } else {
-                    warningEl.style.display = 'none';
+        // One in-flight request per list: starting a new load aborts the
+        // previous one, so only the latest response is ever rendered.
+        const inflight = {};
+
+        function latestSignal(key) {
+            if (inflight[key]) inflight[key].abort();
+            inflight[key] = new AbortController();
+            return inflight[key].signal;
+        }
+
+        function reportError(what, e) {
+            if (e.name !== 'AbortError') console.error('Failed to load ' + what + ':', e);
+        }
+
+        // Collapse bursts of calls (e.g. click spam) into one per frame
+        function debounceRAF(fn) {
+            let queued = false;
+            return (...args) => {
+                if (queued) return;
+                queued = true;
+                requestAnimationFrame(() => {
+                    queued = false;
+                    fn(...args);
+                });
+            };
+        }
+
+        // Paginated list endpoints: items loaded so far, keyed by list name
+        const PAGE_SIZE = 100;
+        const pages = {};
+
+        function pageURL(endpoint, offset) {
+            const sep = endpoint.includes('?') ? '&' : '?';
+            return endpoint + sep + 'offset=' + offset + '&limit=' + PAGE_SIZE;
+        }
+
+        async function fetchPage(key, endpoint, more) {
+            const st = (more && pages[key]) || {items: [], total: 0};
+            const data = await fetchAPI(pageURL(endpoint, st.items.length), latestSignal(key));
+            st.items = st.items.concat(data[key]);
+            st.total = data.total;
+            pages[key] = st;
+            return st;
+        }
+
+        function loadMoreButton(st, loader) {
+            if (st.items.length >= st.total) return '';
+            return `<div style="text-align: center; margin-top: 1rem;">
+                <button class="btn btn-sm btn-primary" onclick="${loader}(true)">Load more (${st.items.length} of ${st.total})</button>
+            </div>`;
+        }
+
+        // Virtualized tables: only the rows in view (plus overscan) are in the
+        // DOM. A pool of <tr> elements is refilled in place as the user scrolls.
+        const ROW_HEIGHT = 41;
+        const OVERSCAN = 8;
+
+        function makeSpacer(cols) {
+            const tr = document.createElement('tr');
+            tr.className = 'vspacer';
+            const td = tr.insertCell();
+            td.colSpan = cols;
+            return tr;
+        }
+
+        function mountVirtualTable(container, spec, rows, footerHtml, keepScroll) {
+            let vt = container._vt;
+            if (!vt || vt.spec !== spec || !container.contains(vt.scroller)) {
+                container.innerHTML = `
+                    <div class="vscroll">
+                        <table class="vtable">
+                            <thead><tr>${spec.head.map(h => `<th>${h}</th>`).join('')}</tr></thead>
+                            <tbody></tbody>
+                        </table>
+                    </div>
+                    <div class="vfooter"></div>`;
+                vt = {
+                    spec,
+                    pool: [],
+                    scroller: container.querySelector('.vscroll'),
+                    tbody: container.querySelector('tbody'),
+                    footer: container.querySelector('.vfooter'),
+                    top: makeSpacer(spec.head.length),
+                    bottom: makeSpacer(spec.head.length),
+                    scheduled: false,
+                };
+                vt.scroller.addEventListener('scroll', () => {
+                    if (vt.scheduled) return;
+                    vt.scheduled = true;
+                    requestAnimationFrame(() => {
+                        vt.scheduled = false;
+                        renderVirtualRows(vt);
+                    });
+                });
+                container._vt = vt;
+            } else if (!keepScroll) {
+                vt.scroller.scrollTop = 0;
+            }
+            vt.rows = rows;
+            vt.footer.innerHTML = footerHtml;
+            renderVirtualRows(vt);
+        }
+
+        function renderVirtualRows(vt) {
+            const visible = Math.ceil(vt.scroller.clientHeight / ROW_HEIGHT) + 2 * OVERSCAN;
+            const first = Math.max(0, Math.floor(vt.scroller.scrollTop / ROW_HEIGHT) - OVERSCAN);
+            const last = Math.min(vt.rows.length, first + visible);
+            while (vt.pool.length < visible) vt.pool.push(vt.spec.makeRow());
+
+            // Row i always lands in pool slot i % pool size, so scrolling by a
+            // few rows only refills the rows that actually changed.
+            const shown = [];
+            for (let i = first; i < last; i++) {
+                const tr = vt.pool[i % vt.pool.length];
+                if (tr._item !== vt.rows[i]) {
+                    tr._item = vt.rows[i];
+                    vt.spec.fillRow(tr, tr._item);
                 }
+                shown.push(tr);
+            }
+            vt.top.cells[0].style.height = (first * ROW_HEIGHT) + 'px';
+            vt.bottom.cells[0].style.height = ((vt.rows.length - last) * ROW_HEIGHT) + 'px';
+            vt.tbody.replaceChildren(vt.top, ...shown, vt.bottom);
+        }
+
+        function fillTags(td, tags) {
+            td.replaceChildren(...tags.map(t => {
+                const span = document.createElement('span');
+                span.className = 'tag';
+                span.textContent = t;
+                return span;
+            }));
+        }
+
+        function cloneRow(templateId) {
+            return document.getElementById(templateId).content.firstElementChild.cloneNode(true);
+        }
+
+        function setBadge(span, kind, text, title) {
+            span.className = 'badge badge-' + kind;
+            span.textContent = text;
+            span.title = title || '';
+        }
+
+        // Build a whole table off-document in a fragment, then swap it in once
+        function renderTable(container, head, items, templateId, fillRow, footerHtml) {
+            const table = document.createElement('table');
+            table.createTHead().insertRow().append(...head.map(h => {
+                const th = document.createElement('th');
+                th.textContent = h;
+                return th;
+            }));
+            const frag = document.createDocumentFragment();
+            for (const item of items) {
+                const tr = cloneRow(templateId);
+                fillRow(tr, item);
+                frag.appendChild(tr);
+            }
+            table.createTBody().appendChild(frag);
+            container.replaceChildren(table);
+            if (footerHtml) container.insertAdjacentHTML('beforeend', footerHtml);
+        }
+
+        const CLAIM_TABLE = {
+            head: ['Hash', 'Text', 'Tags', 'Status'],
+            makeRow() {
+                const tr = cloneRow('row-claim');
+                tr.cells[0].firstChild.onclick = () => showClaimDetails(tr._item.hash_full);
+                return tr;
+            },
+            fillRow(tr, c) {
+                tr.cells[0].firstChild.textContent = c.hash;
+                tr.cells[1].textContent = c.text;
+                tr.cells[1].title = c.text_full;
+                fillTags(tr.cells[2], c.tags);
+                if (c.retracted) setBadge(tr.cells[3].firstChild, 'danger', 'Retracted');
+                else setBadge(tr.cells[3].firstChild, 'success', 'Active');
+            },
+        };
+
+        const OFFER_TABLE = {
+            head: ['Title', 'Price', 'Tags', 'Seller', 'Host', 'Created'],
+            makeRow() {
+                return cloneRow('row-offer');
+            },
+            fillRow(tr, o) {
+                tr.cells[0].firstChild.textContent = o.title;
+                tr.cells[1].textContent = o.price + ' ' + o.currency;
+                fillTags(tr.cells[2], o.tags);
+                tr.cells[3].firstChild.textContent = o.seller;
+                tr.cells[4].firstChild.textContent = o.host + ':' + o.port;
+                setRelativeTime(tr.cells[5], o.created_ms);
+            },
+        };
+
+        // Initial load: node info plus the first page of every tab in one request
+        async function loadDashboard() {
+            try {
+                const data = await fetchAPI('/api/dashboard');
+                prefetch(pageURL('/api/groups', 0), data.groups);
+                prefetch('/api/peers', data.peers);
+                prefetch(pageURL('/api/offers', 0), data.offers);
+                prefetch('/api/subscriptions', data.subscriptions);
+                showNodeInfo(data.node);
             } catch (e) {
-                console.error('Failed to load node info:', e);
+                console.error('Failed to load dashboard:', e);
+            }
+        }
+
+        function showNodeInfo(data) {
+            document.getElementById('node-id').textContent = data.node_id;
+            document.getElementById('groups-count').textContent = data.groups_count;
+            document.getElementById('offers-count').textContent = data.offers_count;
+            document.getElementById('version').textContent = 'v' + data.version;
+            document.getElementById('sign-pub').textContent = data.sign_pub;
+            document.getElementById('enc-pub').textContent = data.enc_pub;
+            document.getElementById('data-dir').textContent = data.data_dir;
+
+            // Show security warning if auth is disabled
+            const warningEl = document.getElementById('security-warning');
+            if (!data.auth_enabled) {
+                warningEl.style.display = 'block';
+            } else {
+                warningEl.style.display = 'none';
             }
         }
 
         // Load groups
-        async function loadGroups() {
+        async function loadGroups(more) {
             try {
-                const data = await fetchAPI('/api/groups');
+                const page = await fetchPage('groups', '/api/groups', more);
+                const groups = page.items;
                 const container = document.getElementById('groups-table-container');
 
-                if (data.groups.length === 0) {
+                if (groups.length === 0) {
                     container.innerHTML = `
                         <div class="empty-state">
                             <div class="empty-state-icon">📁</div>
@@ -1095,35 +1642,19 @@ class AdminServer:
                     return;
                 }
 
-                container.innerHTML = `
-                    <table>
-                        <thead>
-                            <tr>
-                                <th>Name</th>
-                                <th>Group ID</th>
-                                <th>Height</th>
-                                <th>Members</th>
-                                <th>Claims</th>
-                                <th>Offers</th>
-                                <th>Actions</th>
-                            </tr>
-                        </thead>
-                        <tbody>
-                            ${data.groups.map(g => `
-                                <tr>
-                                    <td><strong>${escapeHtml(g.name)}</strong></td>
-                                    <td><code>${g.group_id.substring(0, 12)}...</code></td>
-                                    <td>${g.height}</td>
-                                    <td>${g.member_count}</td>
-                                    <td>${g.claims_count}</td>
-                                    <td>${g.offers_count}</td>
-                                    <td><button class="btn btn-sm btn-primary" onclick="showGroupDetails('${g.group_id}')">Details</button></td>
-                                </tr>
-                            `).join('')}
-                        </tbody>
-                    </table>`;
+                renderTable(container,
+                    ['Name', 'Group ID', 'Height', 'Members', 'Claims', 'Offers', 'Actions'],
+                    groups, 'row-group', (tr, g) => {
+                        tr.cells[0].firstChild.textContent = g.name;
+                        tr.cells[1].firstChild.textContent = g.group_id_short;
+                        tr.cells[2].textContent = g.height;
+                        tr.cells[3].textContent = g.member_count;
+                        tr.cells[4].textContent = g.claims_count;
+                        tr.cells[5].textContent = g.offers_count;
+                        tr.cells[6].firstChild.onclick = () => showGroupDetails(g.group_id);
+                    }, loadMoreButton(page, 'loadGroups'));
             } catch (e) {
-                console.error('Failed to load groups:', e);
+                reportError('groups', e);
             }
         }
 
@@ -1153,33 +1684,29 @@ class AdminServer:
                         <div class="detail-value"><code>${data.head_hash}</code></div>
                     </div>
                     <h4 style="margin-top: 1rem; margin-bottom: 0.5rem;">Members (${data.members.length})</h4>
-                    <table>
-                        <thead><tr><th>Public Key</th><th>Role</th></tr></thead>
-                        <tbody>
-                            ${data.members.map(m => `
-                                <tr>
-                                    <td><code title="${m.pub_full}">${m.pub}</code></td>
-                                    <td><span class="badge badge-info">${m.role}</span></td>
-                                </tr>
-                            `).join('')}
-                        </tbody>
-                    </table>
+                    <div id="group-members"></div>
                     ${data.balances.length > 0 ? `
                         <h4 style="margin-top: 1rem; margin-bottom: 0.5rem;">Balances</h4>
-                        <table>
-                            <thead><tr><th>Public Key</th><th>Amount</th></tr></thead>
-                            <tbody>
-                                ${data.balances.map(b => `
-                                    <tr>
-                                        <td><code title="${b.pub_full}">${b.pub}</code></td>
-                                        <td>${b.amount} ${data.policy.currency}</td>
-                                    </tr>
-                                `).join('')}
-                            </tbody>
-                        </table>
+                        <div id="group-balances"></div>
                     ` : ''}
                 `;
                 showModal('Group: ' + data.name, content);
+                renderTable(document.getElementById('group-members'),
+                    ['Public Key', 'Role'], data.members, 'row-member', (tr, m) => {
+                        const code = tr.cells[0].firstChild;
+                        code.textContent = m.pub;
+                        code.title = m.pub_full;
+                        tr.cells[1].firstChild.textContent = m.role;
+                    });
+                if (data.balances.length > 0) {
+                    renderTable(document.getElementById('group-balances'),
+                        ['Public Key', 'Amount'], data.balances, 'row-balance', (tr, b) => {
+                            const code = tr.cells[0].firstChild;
+                            code.textContent = b.pub;
+                            code.title = b.pub_full;
+                            tr.cells[1].textContent = b.amount + ' ' + data.policy.currency;
+                        });
+                }
             } catch (e) {
                 console.error('Failed to load group details:', e);
             }
@@ -1188,17 +1715,19 @@ class AdminServer:
         // Load group select for knowledge tab
         async function loadGroupSelect() {
             try {
-                const data = await fetchAPI('/api/groups');
+                const data = await fetchAPI('/api/groups?limit=500');
                 const select = document.getElementById('group-select');
-                select.innerHTML = '<option value="">Select a group...</option>' +
-                    data.groups.map(g => `<option value="${g.group_id}">${escapeHtml(g.name)}</option>`).join('');
+                const frag = document.createDocumentFragment();
+                frag.appendChild(new Option('Select a group...', ''));
+                for (const g of data.groups) frag.appendChild(new Option(g.name, g.group_id));
+                select.replaceChildren(frag);
             } catch (e) {
                 console.error('Failed to load groups for select:', e);
             }
         }
 
         // Load claims
-        async function loadClaims() {
+        async function loadClaims(more) {
             const groupId = document.getElementById('group-select').value;
             const container = document.getElementById('claims-container');
 
@@ -1212,9 +1741,10 @@ class AdminServer:
             }
 
             try {
-                const data = await fetchAPI('/api/claims?group_id=' + groupId);
+                const page = await fetchPage('claims', '/api/claims?group_id=' + groupId, more);
+                const claims = page.items;
 
-                if (data.claims.length === 0) {
+                if (claims.length === 0) {
                     container.innerHTML = `
                         <div class="empty-state">
                             <div class="empty-state-icon">📝</div>
@@ -1223,29 +1753,9 @@ class AdminServer:
                     return;
                 }
 
-                container.innerHTML = `
-                    <table>
-                        <thead>
-                            <tr>
-                                <th>Hash</th>
-                                <th>Text</th>
-                                <th>Tags</th>
-                                <th>Status</th>
-                            </tr>
-                        </thead>
-                        <tbody>
-                            ${data.claims.map(c => `
-                                <tr>
-                                    <td><code class="clickable" onclick="showClaimDetails('${c.hash_full}')">${c.hash}</code></td>
-                                    <td class="claim-text" title="${escapeHtml(c.text_full)}">${escapeHtml(c.text)}</td>
-                                    <td>${c.tags.map(t => `<span class="tag">${escapeHtml(t)}</span>`).join('')}</td>
-                                    <td>${c.retracted ? '<span class="badge badge-danger">Retracted</span>' : '<span class="badge badge-success">Active</span>'}</td>
-                                </tr>
-                            `).join('')}
-                        </tbody>
-                    </table>`;
+                mountVirtualTable(container, CLAIM_TABLE, claims, loadMoreButton(page, 'loadClaims'), more);
             } catch (e) {
-                console.error('Failed to load claims:', e);
+                reportError('claims', e);
             }
         }
 
@@ -1258,7 +1768,7 @@ class AdminServer:
         // Load peers
         async function loadPeers() {
             try {
-                const data = await fetchAPI('/api/peers');
+                const data = await fetchAPI('/api/peers', latestSignal('peers'));
                 const container = document.getElementById('peers-container');
 
                 if (data.peers.length === 0) {
@@ -1271,42 +1781,26 @@ class AdminServer:
                     return;
                 }
 
-                container.innerHTML = `
-                    <table>
-                        <thead>
-                            <tr>
-                                <th>Alias</th>
-                                <th>Host</th>
-                                <th>Port</th>
-                                <th>Node ID</th>
-                                <th>Last Seen</th>
-                                <th>Status</th>
-                            </tr>
-                        </thead>
-                        <tbody>
-                            ${data.peers.map(p => `
-                                <tr>
-                                    <td>${p.alias || '-'}</td>
-                                    <td><code>${p.host}</code></td>
-                                    <td>${p.port}</td>
-                                    <td><code>${p.node_id}</code></td>
-                                    <td>${formatRelativeTime(p.last_seen_ms)}</td>
-                                    <td>${p.last_error ?
-                                        `<span class="badge badge-danger" title="${escapeHtml(p.last_error)}">Error</span>` :
-                                        '<span class="badge badge-success">OK</span>'}</td>
-                                </tr>
-                            `).join('')}
-                        </tbody>
-                    </table>`;
+                renderTable(container,
+                    ['Alias', 'Host', 'Port', 'Node ID', 'Last Seen', 'Status'],
+                    data.peers, 'row-peer', (tr, p) => {
+                        tr.cells[0].textContent = p.alias || '-';
+                        tr.cells[1].firstChild.textContent = p.host;
+                        tr.cells[2].textContent = p.port;
+                        tr.cells[3].firstChild.textContent = p.node_id;
+                        setRelativeTime(tr.cells[4], p.last_seen_ms);
+                        if (p.last_error) setBadge(tr.cells[5].firstChild, 'danger', 'Error', p.last_error);
+                        else setBadge(tr.cells[5].firstChild, 'success', 'OK');
+                    });
             } catch (e) {
-                console.error('Failed to load peers:', e);
+                reportError('peers', e);
             }
         }
 
         // Load subscriptions
         async function loadSubscriptions() {
             try {
-                const data = await fetchAPI('/api/subscriptions');
+                const data = await fetchAPI('/api/subscriptions', latestSignal('subscriptions'));
                 const container = document.getElementById('subscriptions-container');
 
                 if (data.subscriptions.length === 0) {
@@ -1319,45 +1813,31 @@ class AdminServer:
                     return;
                 }
 
-                container.innerHTML = `
-                    <table>
-                        <thead>
-                            <tr>
-                                <th>Group ID</th>
-                                <th>Peer</th>
-                                <th>Interval</th>
-                                <th>Last Sync</th>
-                                <th>Status</th>
-                            </tr>
-                        </thead>
-                        <tbody>
-                            ${data.subscriptions.map(s => `
-                                <tr>
-                                    <td><code>${s.group_id.substring(0, 12)}...</code></td>
-                                    <td><code>${s.peer_host}:${s.peer_port}</code></td>
-                                    <td>${s.sync_interval_s}s</td>
-                                    <td>${formatRelativeTime(s.last_sync_ms)}</td>
-                                    <td>
-                                        ${!s.enabled ? '<span class="badge badge-warning">Disabled</span>' :
-                                          s.last_error ? `<span class="badge badge-danger" title="${escapeHtml(s.last_error)}">Error</span>` :
-                                          '<span class="badge badge-success">Active</span>'}
-                                    </td>
-                                </tr>
-                            `).join('')}
-                        </tbody>
-                    </table>`;
+                renderTable(container,
+                    ['Group ID', 'Peer', 'Interval', 'Last Sync', 'Status'],
+                    data.subscriptions, 'row-subscription', (tr, s) => {
+                        tr.cells[0].firstChild.textContent = s.group_id_short;
+                        tr.cells[1].firstChild.textContent = s.peer_host + ':' + s.peer_port;
+                        tr.cells[2].textContent = s.sync_interval_s + 's';
+                        setRelativeTime(tr.cells[3], s.last_sync_ms);
+                        const badge = tr.cells[4].firstChild;
+                        if (!s.enabled) setBadge(badge, 'warning', 'Disabled');
+                        else if (s.last_error) setBadge(badge, 'danger', 'Error', s.last_error);
+                        else setBadge(badge, 'success', 'Active');
+                    });
             } catch (e) {
-                console.error('Failed to load subscriptions:', e);
+                reportError('subscriptions', e);
             }
         }
 
         // Load offers
-        async function loadOffers() {
+        async function loadOffers(more) {
             try {
-                const data = await fetchAPI('/api/offers');
+                const page = await fetchPage('offers', '/api/offers', more);
+                const offers = page.items;
                 const container = document.getElementById('offers-container');
 
-                if (data.offers.length === 0) {
+                if (offers.length === 0) {
                     container.innerHTML = `
                         <div class="empty-state">
                             <div class="empty-state-icon">🏪</div>
@@ -1367,46 +1847,35 @@ class AdminServer:
                     return;
                 }
 
-                container.innerHTML = `
-                    <table>
-                        <thead>
-                            <tr>
-                                <th>Title</th>
-                                <th>Price</th>
-                                <th>Tags</th>
-                                <th>Seller</th>
-                                <th>Host</th>
-                                <th>Created</th>
-                            </tr>
-                        </thead>
-                        <tbody>
-                            ${data.offers.map(o => `
-                                <tr>
-                                    <td><strong>${escapeHtml(o.title)}</strong></td>
-                                    <td>${o.price} ${o.currency}</td>
-                                    <td>${o.tags.map(t => `<span class="tag">${escapeHtml(t)}</span>`).join('')}</td>
-                                    <td><code>${o.seller}</code></td>
-                                    <td><code>${o.host}:${o.port}</code></td>
-                                    <td>${formatRelativeTime(o.created_ms)}</td>
-                                </tr>
-                            `).join('')}
-                        </tbody>
-                    </table>`;
+                mountVirtualTable(container, OFFER_TABLE, offers, loadMoreButton(page, 'loadOffers'), more);
             } catch (e) {
-                console.error('Failed to load offers:', e);
+                reportError('offers', e);
             }
         }
 
-        // Escape HTML to prevent XSS
+        // Escape HTML to prevent XSS (also safe inside quoted attributes)
+        const HTML_ESCAPES = {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'};
+        const HTML_SPECIAL = /[&<>"']/;
         function escapeHtml(text) {
             if (!text) return '';
-            const div = document.createElement('div');
-            div.textContent = text;
-            return div.innerHTML;
-        }
+            text = String(text);
+            // Most values (names, ids, tags) need no escaping: return them as-is
+            if (!HTML_SPECIAL.test(text)) return text;
+            return text.replace(/[&<>"']/g, c => HTML_ESCAPES[c]);
+        }
+
+        // Debounced entry points for Refresh buttons, tab switches and the
+        // group selector
+        const refresh = {
+            groups: debounceRAF(() => loadGroups()),
+            claims: debounceRAF(() => loadClaims()),
+            peers: debounceRAF(() => loadPeers()),
+            subscriptions: debounceRAF(() => loadSubscriptions()),
+            offers: debounceRAF(() => loadOffers()),
+        };
 
         // Initial load
-        loadNodeInfo();
+        loadDashboard();
     </script>
 </body>
 </html>'''
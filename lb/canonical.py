@@ -4,6 +4,52 @@ import json
 import hashlib
 from typing import Any
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised when orjson is absent
+    orjson = None  # type: ignore[assignment]
+
+HAVE_ORJSON = orjson is not None
+
+# json.dumps() builds a new JSONEncoder whenever non-default options are
+# passed; reuse one configured encoder instead. It drives the same C encoder,
+# so output is byte-identical to json.dumps with these options.
+_CANONICAL_ENCODER = json.JSONEncoder(ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+
+# Exact types for which orjson (with OPT_SORT_KEYS) and the stdlib encoder
+# produce identical bytes, besides dict/list/tuple containers
+_ORJSON_SAFE_TYPES = frozenset((str, int, bool, type(None)))
+
+
+def _orjson_safe(obj: Any) -> bool:
+    """True if orjson's output for obj is byte-identical to the stdlib's.
+
+    The two agree on strings (all code points), ints, bools, null and
+    containers. Floats are spelled differently (1e+16 vs 1e16), and orjson
+    natively serializes types the stdlib rejects (dataclasses, datetimes,
+    subclasses), so anything outside the exact whitelist is refused. Non-str
+    keys and ints beyond 64 bits make orjson raise TypeError instead.
+
+    Each container is visited once, so shared and self-referencing values
+    terminate; orjson then rejects a cycle and the stdlib reports it.
+    """
+    stack = [obj]
+    pop = stack.pop
+    extend = stack.extend
+    safe = _ORJSON_SAFE_TYPES
+    seen = set()
+    while stack:
+        o = pop()
+        t = type(o)
+        if t is dict or t is list or t is tuple:
+            if id(o) in seen:
+                continue
+            seen.add(id(o))
+            extend(o.values() if t is dict else o)
+        elif t not in safe:
+            return False
+    return True
+
 
 def canonical_json(obj: Any) -> str:
     """Canonical JSON for hashing/signing.
@@ -12,16 +58,79 @@ def canonical_json(obj: Any) -> str:
     - sorted keys
     - no whitespace
     """
-    return json.dumps(obj, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return _CANONICAL_ENCODER.encode(obj)
+
+
+def canonical_json_bytes(obj: Any) -> bytes:
+    """canonical_json(obj) as UTF-8 bytes, ready for signing or hashing.
+
+    Uses orjson when it is installed and the value is one it encodes
+    identically; the bytes never depend on which backend produced them.
+    """
+    if HAVE_ORJSON and _orjson_safe(obj):
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+        except TypeError:
+            # Non-str keys, ints beyond 64 bits, nesting too deep, cycles
+            pass
+    return _CANONICAL_ENCODER.encode(obj).encode("utf-8")
 
 
 def sha256_hex(data: bytes) -> str:
     return hashlib.sha256(data).hexdigest()
 
 
+def _encode_into(obj: Any, hasher: Any) -> None:
+    """Feed canonical_json_bytes(obj) into hasher member by member.
+
+    Top-level dict entries and list items are encoded one at a time, so large
+    payloads are never held as one contiguous buffer.
+    """
+    enc = canonical_json_bytes
+    if isinstance(obj, dict) and obj and all(type(k) is str for k in obj):
+        sep = b"{"
+        for key in sorted(obj):
+            hasher.update(sep + enc(key) + b":")
+            hasher.update(enc(obj[key]))
+            sep = b","
+        hasher.update(b"}")
+    elif isinstance(obj, (list, tuple)) and obj:
+        sep = b"["
+        for item in obj:
+            hasher.update(sep)
+            hasher.update(enc(item))
+            sep = b","
+        hasher.update(b"]")
+    else:
+        # Scalars, empty containers and dicts with non-str keys (which the
+        # encoder coerces before ordering) go through the encoder whole.
+        hasher.update(canonical_json_bytes(obj))
+
+
+def hash_obj_digest(obj: Any) -> bytes:
+    """Raw 32-byte SHA-256 of canonical_json(obj).
+
+    Prefer this for in-memory sets and comparisons; a bytes digest is far
+    smaller than its 64-char hex string. Convert with .hex() only where the
+    hash is serialized.
+    """
+    h = hashlib.sha256()
+    _encode_into(obj, h)
+    return h.digest()
+
+
 def hash_obj(obj: Any) -> str:
-    return sha256_hex(canonical_json(obj).encode("utf-8"))
+    return hash_obj_digest(obj).hex()
 
 
 def hash_bytes(data: bytes) -> str:
     return sha256_hex(data)
+
+
+def fast_hash_hex(data: bytes, digest_size: int = 32) -> str:
+    """BLAKE2b hex digest for identifiers nobody else recomputes.
+
+    Faster than SHA-256 in software. Never use it for content addresses,
+    block ids or anything signed or verified by peers; those stay SHA-256.
+    """
+    return hashlib.blake2b(data, digest_size=digest_size).hexdigest()
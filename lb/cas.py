@@ -1,14 +1,21 @@
 from __future__ import annotations
 
+import functools
+import hashlib
+import mmap
 import os
+import re
+import tempfile
 import time
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional, Tuple, Union
 
-from .canonical import sha256_hex
-from .fs import ensure_dir, atomic_write_bytes, atomic_write_json, read_json
+from . import fastjson
+from .canonical import canonical_json_bytes, sha256_hex
+from .fs import ensure_dir, append_bytes, atomic_write_bytes, atomic_write_json
 from .logging_config import get_node_logger
 
 logger = get_node_logger()
@@ -50,11 +57,101 @@ class CASError(Exception):
 # Maximum object size (100 MB default)
 DEFAULT_MAX_OBJECT_SIZE = 100 * 1024 * 1024
 
+# Read size when hashing object files from disk
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Orphans at least this large are evicted from the page cache once
+# validation has hashed them, so a startup sweep doesn't push out hot data
+DROP_CACHE_MIN_SIZE = 8 * 1024 * 1024
+
+# Orphans are handed to hashing threads in batches of this many files, so
+# per-task executor overhead is amortized over a CAS full of small objects
+SCAN_BATCH_SIZE = 64
+
+# Name of a stored object: its lowercase hex SHA-256
+_OBJECT_NAME_RE = re.compile(r"[0-9a-f]{64}\Z")
+
+# put_stream writes to objects/put.* before renaming into place; startup
+# validation removes any a crash left behind
+PUT_TEMP_PREFIX = "put."
+
+# Object paths remembered per CAS; building one costs several Path joins
+OBJ_PATH_CACHE_SIZE = 4096
+
+# Index updates are appended to a journal (index.log) and folded into
+# index.json once the journal outgrows this, or twice index.json's size
+JOURNAL_COMPACT_MIN_BYTES = 1024 * 1024
+
+
+def is_object_name(name: str) -> bool:
+    """True if name is a valid CAS object name (lowercase hex SHA-256)."""
+    return _OBJECT_NAME_RE.match(name) is not None
+
+
+def _hash_fd(fd: int, size: int, *, drop_cache: bool = False) -> str:
+    """SHA-256 hex digest of the size bytes of an open file.
+
+    Files up to HASH_CHUNK_SIZE take a single read(); mapping them would cost
+    more syscalls than it saves. Larger files are hashed straight from a
+    read-only memory map in memoryview slices, so nothing is copied into
+    Python bytes and peak memory stays flat regardless of object size.
+
+    Args:
+        fd: Open file descriptor, positioned at the start
+        size: File size from fstat
+        drop_cache: Read ahead sequentially and evict the file from the page
+            cache afterwards if it is at least DROP_CACHE_MIN_SIZE (POSIX only)
+    """
+    if size <= HASH_CHUNK_SIZE:
+        return hashlib.sha256(os.read(fd, size)).hexdigest()
+    h = hashlib.sha256()
+    drop_cache = drop_cache and size >= DROP_CACHE_MIN_SIZE and hasattr(os, "posix_fadvise")
+    with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+        if drop_cache and hasattr(mm, "madvise"):
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+        for off in range(0, size, HASH_CHUNK_SIZE):
+            h.update(view[off:off + HASH_CHUNK_SIZE])
+    if drop_cache:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    return h.hexdigest()
+
+
+def _hash_file(path: Path, *, drop_cache: bool = False) -> Tuple[str, int]:
+    """Hash a file with SHA-256 without loading it whole (see _hash_fd).
+
+    Returns:
+        Tuple of (hex digest, size in bytes)
+    """
+    with open(path, "rb", buffering=0) as f:
+        size = os.fstat(f.fileno()).st_size
+        return _hash_fd(f.fileno(), size, drop_cache=drop_cache), size
+
+
+def _scan_orphans(paths: List[str]) -> List[Any]:
+    """Hash and stat a batch of orphan object files for _validate_index.
+
+    Returns:
+        For each path, a tuple of (hex digest, size, mtime in ms), or the
+        exception raised.
+    """
+    results: List[Any] = []
+    for path in paths:
+        try:
+            with open(path, "rb", buffering=0) as f:
+                st = os.fstat(f.fileno())
+                digest = _hash_fd(f.fileno(), st.st_size, drop_cache=True)
+            results.append((digest, st.st_size, int(st.st_mtime * 1000)))
+        except Exception as e:
+            results.append(e)
+    return results
+
 
 class CAS:
     """Content-addressed store (sha256) with a tiny metadata index.
 
-    Thread-safe with consistency validation on startup.
+    The index lives in index.json plus an append-only journal of later
+    updates (index.log), so a put() appends one line instead of rewriting
+    the whole index. Thread-safe with consistency validation on startup.
     """
 
     def __init__(self, root: Path, *, validate_on_startup: bool = True, max_object_size: int = DEFAULT_MAX_OBJECT_SIZE):
@@ -63,18 +160,29 @@ class CAS:
         ensure_dir(self.root)
         self.obj_dir = self.root / "objects"
         self.index_path = self.root / "index.json"
+        self.journal_path = self.root / "index.log"
         ensure_dir(self.obj_dir)
+        # h -> path is pure, so cached paths never need invalidating
+        self._obj_path = functools.lru_cache(maxsize=OBJ_PATH_CACHE_SIZE)(self._build_obj_path)
         self._lock = threading.RLock()
+        self._index_bytes = 0
+        self._journal_bytes = 0
 
         if self.index_path.exists():
-            self.index: Dict[str, Dict[str, Any]] = read_json(self.index_path)
+            # The index is the largest JSON document a node parses at startup;
+            # fastjson (orjson when installed) parses it several times faster
+            data = self.index_path.read_bytes()
+            self.index: Dict[str, Dict[str, Any]] = fastjson.loads(data)
+            self._index_bytes = len(data)
         else:
             self.index = {}
+        if self.journal_path.exists():
+            self._replay_journal()
 
         if validate_on_startup:
             self._validate_index()
 
-    def _obj_path(self, h: str) -> Path:
+    def _build_obj_path(self, h: str) -> Path:
         return self.obj_dir / h[:2] / h[2:4] / h
 
     def _validate_index(self) -> Tuple[int, int, int]:
@@ -83,52 +191,68 @@ class CAS:
         Returns:
             Tuple of (valid_count, orphan_files_added, stale_entries_removed)
         """
-        valid = 0
         orphans_added = 0
         stale_removed = 0
 
         with self._lock:
-            # Check for stale index entries (in index but not on disk)
-            stale_hashes = []
-            for h in list(self.index.keys()):
-                if not self._obj_path(h).exists():
-                    logger.warning(f"CAS: removing stale index entry {h[:16]}... (file missing)")
-                    stale_hashes.append(h)
-                else:
-                    valid += 1
+            # One directory walk finds every object file; comparing it with the
+            # index replaces a stat() per index entry
+            on_disk, strays = self._scan_objects()
 
-            for h in stale_hashes:
+            # Check for stale index entries (in index but not on disk)
+            for h in [h for h in self.index if h not in on_disk]:
+                logger.warning(f"CAS: removing stale index entry {h[:16]}... (file missing)")
                 del self.index[h]
                 stale_removed += 1
+            valid = len(self.index)
+
+            # Collect orphan files (on disk but not in index); hashing them
+            # happens below, outside the lock
+            orphan_paths = [p for h, p in on_disk.items() if h not in self.index]
 
-            # Check for orphan files (on disk but not in index)
-            for prefix_dir in self.obj_dir.iterdir():
-                if not prefix_dir.is_dir():
+        # Files that can't be an object at their location (bad name or wrong
+        # prefix directory) are dropped without being read
+        for stray in strays:
+            logger.error(f"CAS: {stray} is not a valid object path, removing")
+            try:
+                os.unlink(stray)
+            except OSError as e:
+                logger.error(f"CAS: error removing {stray}: {e}")
+
+        # hashlib releases the GIL while hashing, so orphans are verified in
+        # parallel without blocking other CAS callers
+        scanned: List[Tuple[str, Any]] = []
+        if orphan_paths:
+            batches = [orphan_paths[i:i + SCAN_BATCH_SIZE] for i in range(0, len(orphan_paths), SCAN_BATCH_SIZE)]
+            workers = min(len(batches), os.cpu_count() or 1)
+            with ThreadPoolExecutor(max_workers=workers) as ex:
+                for batch, results in zip(batches, ex.map(_scan_orphans, batches)):
+                    scanned.extend(zip(batch, results))
+
+        with self._lock:
+            for obj_file, result in scanned:
+                h = os.path.basename(obj_file)
+                if h in self.index:
+                    continue  # stored by a concurrent put() meanwhile
+                if isinstance(result, Exception):
+                    logger.error(f"CAS: error validating orphan {h[:16]}...: {result}")
                     continue
-                for subdir in prefix_dir.iterdir():
-                    if not subdir.is_dir():
-                        continue
-                    for obj_file in subdir.iterdir():
-                        h = obj_file.name
-                        if h not in self.index:
-                            # Verify the hash matches content
-                            try:
-                                data = obj_file.read_bytes()
-                                actual_hash = sha256_hex(data)
-                                if actual_hash == h:
-                                    logger.info(f"CAS: adding orphan file to index {h[:16]}...")
-                                    self.index[h] = CasMeta(
-                                        visibility="public",
-                                        kind="unknown",
-                                        created_ms=int(obj_file.stat().st_mtime * 1000),
-                                        size=len(data)
-                                    ).to_dict()
-                                    orphans_added += 1
-                                else:
-                                    logger.error(f"CAS: orphan file {h[:16]}... has wrong hash, removing")
-                                    obj_file.unlink()
-                            except Exception as e:
-                                logger.error(f"CAS: error validating orphan {h[:16]}...: {e}")
+                actual_hash, size, mtime_ms = result
+                if actual_hash == h:
+                    logger.info(f"CAS: adding orphan file to index {h[:16]}...")
+                    self.index[h] = CasMeta(
+                        visibility="public",
+                        kind="unknown",
+                        created_ms=mtime_ms,
+                        size=size
+                    ).to_dict()
+                    orphans_added += 1
+                else:
+                    logger.error(f"CAS: orphan file {h[:16]}... has wrong hash, removing")
+                    try:
+                        os.unlink(obj_file)
+                    except OSError as e:
+                        logger.error(f"CAS: error removing orphan {h[:16]}...: {e}")
 
             # Save index if modified
             if stale_removed > 0 or orphans_added > 0:
@@ -137,13 +261,84 @@ class CAS:
 
         return (valid, orphans_added, stale_removed)
 
+    def _scan_objects(self) -> Tuple[Dict[str, str], List[str]]:
+        """Walk objects/<xx>/<yy>/ once.
+
+        Paths are kept as the str os.scandir yields rather than Path objects;
+        this runs over every object at startup.
+
+        Returns:
+            Tuple of (object name -> path for files whose name is a hex
+            digest matching their prefix directories, paths of other files,
+            including put_stream temp files left at the top by a crash)
+        """
+        found: Dict[str, str] = {}
+        strays: List[str] = []
+        with os.scandir(self.obj_dir) as top:
+            for prefix_dir in top:
+                if not prefix_dir.is_dir(follow_symlinks=False):
+                    if prefix_dir.name.startswith(PUT_TEMP_PREFIX):
+                        strays.append(prefix_dir.path)
+                    continue
+                with os.scandir(prefix_dir.path) as mid:
+                    for subdir in mid:
+                        if not subdir.is_dir(follow_symlinks=False):
+                            continue
+                        prefix = prefix_dir.name + subdir.name
+                        with os.scandir(subdir.path) as leaf:
+                            for obj_file in leaf:
+                                name = obj_file.name
+                                if name[:4] == prefix and is_object_name(name):
+                                    found[name] = obj_file.path
+                                else:
+                                    strays.append(obj_file.path)
+        return found, strays
+
+    def _replay_journal(self) -> None:
+        """Apply index.log on top of the index loaded from index.json."""
+        data = self.journal_path.read_bytes()
+        for line in data.splitlines():
+            try:
+                record = fastjson.loads(line)
+                if record["meta"] is None:
+                    self.index.pop(record["h"], None)
+                else:
+                    self.index[record["h"]] = record["meta"]
+            except (fastjson.JSONDecodeError, KeyError, TypeError):
+                logger.warning("CAS: skipping corrupt index journal record")
+        self._journal_bytes = len(data)
+        if data and not data.endswith(b"\n"):
+            # Torn final write: fold what survived into index.json so the
+            # next append doesn't land on the partial line
+            self._save_index_unlocked()
+
+    def _journal_unlocked(self, h: str, meta: Optional[Dict[str, Any]]) -> None:
+        """Durably record one index update (None for a delete), compacting if due. Must hold lock."""
+        record = fastjson.dumps({"h": h, "meta": meta}) + b"\n"
+        append_bytes(self.journal_path, record)
+        self._journal_bytes += len(record)
+        if self._journal_bytes > max(JOURNAL_COMPACT_MIN_BYTES, 2 * self._index_bytes):
+            self._save_index_unlocked()
+
     def _save_index_unlocked(self) -> None:
-        """Save index to disk with fsync. Must hold lock."""
+        """Write the full index to index.json with fsync and reset the journal. Must hold lock."""
         atomic_write_json(self.index_path, self.index)
+        self._index_bytes = self.index_path.stat().st_size
+        # Replaying a leftover journal over the new index is harmless, so a
+        # crash before this unlink loses nothing
+        self.journal_path.unlink(missing_ok=True)
+        self._journal_bytes = 0
+
+    def compact(self) -> None:
+        """Fold the index journal into index.json."""
+        with self._lock:
+            self._save_index_unlocked()
 
     def has(self, h: str) -> bool:
+        # The index tracks exactly the objects on disk (validated at startup,
+        # updated by put/delete), so this needs no stat() call
         with self._lock:
-            return self._obj_path(h).exists()
+            return h in self.index
 
     def meta(self, h: str) -> Optional[CasMeta]:
         with self._lock:
@@ -170,18 +365,81 @@ class CAS:
 
         h = sha256_hex(data)
         with self._lock:
+            # Check the file itself, not the index: a stale index entry must
+            # not stop a re-put from restoring a missing object
             p = self._obj_path(h)
             if not p.exists():
                 ensure_dir(p.parent)
                 atomic_write_bytes(p, data)
-            # update index
-            if meta.created_ms is None:
-                meta.created_ms = int(time.time() * 1000)
-            meta.size = len(data)
-            self.index[h] = meta.to_dict()
-            self._save_index_unlocked()
+            self._index_put_unlocked(h, meta, len(data))
+        return h
+
+    def put_stream(self, source: Union[BinaryIO, Iterable[bytes]], meta: CasMeta) -> str:
+        """Store data read from a binary file or an iterable of byte chunks.
+
+        The data is hashed while it is written to a temporary file, so large
+        objects are never held in memory whole.
+
+        Returns:
+            SHA256 hash of the data
+
+        Raises:
+            CASError: If data exceeds max_object_size
+        """
+        if hasattr(source, "read"):
+            read = source.read  # type: ignore[union-attr]
+            chunks: Iterable[bytes] = iter(lambda: read(HASH_CHUNK_SIZE), b"")
+        else:
+            chunks = source
+        ctx = hashlib.sha256()
+        size = 0
+        fd, tmp = tempfile.mkstemp(prefix=PUT_TEMP_PREFIX, dir=str(self.obj_dir))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in chunks:
+                    size += len(chunk)
+                    if size > self.max_object_size:
+                        raise CASError(f"Object too large: more than {self.max_object_size} bytes")
+                    ctx.update(chunk)
+                    f.write(chunk)
+                f.flush()
+                os.fsync(f.fileno())
+            h = ctx.hexdigest()
+            with self._lock:
+                p = self._obj_path(h)
+                if not p.exists():
+                    ensure_dir(p.parent)
+                    os.replace(tmp, p)
+                self._index_put_unlocked(h, meta, size)
+        finally:
+            try:
+                os.unlink(tmp)  # already stored, or failed
+            except FileNotFoundError:
+                pass
         return h
 
+    def _index_put_unlocked(self, h: str, meta: CasMeta, size: int) -> None:
+        """Record metadata for a stored object. Must hold lock."""
+        if meta.created_ms is None:
+            meta.created_ms = int(time.time() * 1000)
+        meta.size = size
+        self.index[h] = meta.to_dict()
+        self._journal_unlocked(h, self.index[h])
+
+    def delete(self, h: str) -> bool:
+        """Remove an object and its index entry.
+
+        Returns:
+            True if the object existed
+        """
+        with self._lock:
+            if h not in self.index:
+                return False
+            self._obj_path(h).unlink(missing_ok=True)
+            del self.index[h]
+            self._journal_unlocked(h, None)
+            return True
+
     def get(self, h: str) -> bytes:
         with self._lock:
             p = self._obj_path(h)
@@ -189,10 +447,24 @@ class CAS:
                 raise FileNotFoundError(h)
             return p.read_bytes()
 
+    def get_range(self, h: str, offset: int, length: int) -> bytes:
+        """Read length bytes of an object starting at offset.
+
+        Returns fewer bytes if the range runs past the end of the object.
+        """
+        if offset < 0 or length < 0:
+            raise ValueError("offset and length must be non-negative")
+        with self._lock:
+            p = self._obj_path(h)
+            if not p.exists():
+                raise FileNotFoundError(h)
+            with open(p, "rb") as f:
+                f.seek(offset)
+                return f.read(length)
+
     def put_json(self, obj: Any, meta: CasMeta) -> str:
-        import json
-        b = json.dumps(obj, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
-        return self.put(b, meta)
+        # Peers re-derive the address from these bytes, so they must be canonical
+        return self.put(canonical_json_bytes(obj), meta)
 
     def get_json(self, h: str) -> Any:
         import json
@@ -202,19 +474,21 @@ class CAS:
         """Verify object integrity by checking hash."""
         with self._lock:
             try:
-                data = self.get(h)
-                return sha256_hex(data) == h
+                return _hash_file(self._obj_path(h))[0] == h
             except FileNotFoundError:
                 return False
 
     def stats(self) -> Dict[str, Any]:
         """Get CAS statistics."""
         with self._lock:
-            total_size = sum(m.get("size", 0) for m in self.index.values())
+            # One pass over the index for both aggregates
+            total_size = 0
             by_kind: Dict[str, int] = {}
+            get_count = by_kind.get
             for m in self.index.values():
+                total_size += m.get("size") or 0
                 kind = m.get("kind", "unknown")
-                by_kind[kind] = by_kind.get(kind, 0) + 1
+                by_kind[kind] = get_count(kind, 0) + 1
             return {
                 "object_count": len(self.index),
                 "total_size_bytes": total_size,
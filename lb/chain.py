@@ -4,7 +4,7 @@ import time
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Tuple
 
-from .canonical import canonical_json, sha256_hex, hash_obj
+from .canonical import canonical_json_bytes, sha256_hex, hash_obj
 from .keys import b64d, b64e, verify_detached, load_sign_pub_raw, sign_detached
 from .config import get_config
 
@@ -85,7 +85,7 @@ def _check_account_cap(policy, current_balance: int, amount: int) -> bool:
     return new_balance <= policy.max_account_balance
 
 
-@dataclass
+@dataclass(slots=True)
 class Offer:
     offer_id: str
     group_id: str
@@ -243,7 +243,7 @@ class GroupState:
         return state
 
 
-@dataclass
+@dataclass(slots=True)
 class Block:
     group_id: str
     height: int
@@ -292,21 +292,43 @@ class Block:
             "author": author_pub_b64,
             "txs": txs,
         }
-        header_bytes = canonical_json(header).encode("utf-8")
+        header_bytes = canonical_json_bytes(header)
         block_id = sha256_hex(header_bytes)
         sig = b64e(sign_detached(author_priv, header_bytes))
         return Block(group_id=group_id, height=int(height), prev=prev, ts_ms=int(ts_ms), author=author_pub_b64, txs=txs, block_id=block_id, sig=sig)
 
-    def verify_sig(self) -> None:
+    def verify_sig(self) -> bytes:
+        """Verify block_id and signature against the canonical header.
+
+        Returns:
+            The canonical header bytes, so callers can reuse them instead of
+            re-serializing the block.
+        """
         try:
             pub = load_sign_pub_raw(b64d(self.author))
         except Exception as e:
             raise ChainError(f"bad block author pub: {e}")
-        header_bytes = canonical_json(self.header_dict()).encode("utf-8")
+        header_bytes = canonical_json_bytes(self.header_dict())
         if sha256_hex(header_bytes) != self.block_id:
             raise ChainError("block_id mismatch")
         if not verify_detached(pub, header_bytes, b64d(self.sig)):
             raise ChainError("bad block signature")
+        return header_bytes
+
+    def encoded_size(self, header_bytes: Optional[bytes] = None) -> int:
+        """Byte length of canonical_json(self.to_dict()) encoded as UTF-8.
+
+        to_dict() is the header plus "block_id" and "sig"; with sorted keys and
+        no whitespace each extra key adds exactly '"key":<value>,', so the size
+        can be derived from already-encoded header bytes.
+        """
+        if header_bytes is None:
+            header_bytes = canonical_json_bytes(self.header_dict())
+        return (
+            len(header_bytes)
+            + len(b'"block_id":,') + len(canonical_json_bytes(self.block_id))
+            + len(b'"sig":,') + len(canonical_json_bytes(self.sig))
+        )
 
 
 def _require(cond: bool, msg: str) -> None:
@@ -319,7 +341,7 @@ def _verify_tx_sig(tx: Dict[str, Any], pub_b64: str) -> None:
     _require(isinstance(sig, str), "missing tx sig")
     body = dict(tx)
     body.pop("sig", None)
-    msg = canonical_json(body).encode("utf-8")
+    msg = canonical_json_bytes(body)
     pub = load_sign_pub_raw(b64d(pub_b64))
     _require(verify_detached(pub, msg, b64d(sig)), "bad tx signature")
 
@@ -368,7 +390,7 @@ class Chain:
         return Block.make(gid, 0, None, author_priv=creator_priv, author_pub_b64=creator_pub_b64, txs=[tx], ts_ms=ts)
 
     def append(self, b: Block) -> None:
-        b.verify_sig()
+        header_bytes = b.verify_sig()
         _require(b.group_id == self.state.group_id, "wrong group_id")
         _require(b.height == self.head.height + 1, "wrong height")
         _require(b.prev == self.head.block_id, "wrong prev")
@@ -378,11 +400,12 @@ class Chain:
         _require(len(b.txs) <= max_txs,
                  f"block has too many transactions ({len(b.txs)} > {max_txs})")
 
-        # Validate serialized block size
-        block_bytes = canonical_json(b.to_dict()).encode("utf-8")
+        # Validate serialized block size (derived from the verified header bytes
+        # rather than serializing the whole block a second time)
+        block_size = b.encoded_size(header_bytes)
         max_size = _get_max_block_size_bytes()
-        _require(len(block_bytes) <= max_size,
-                 f"block too large ({len(block_bytes)} > {max_size} bytes)")
+        _require(block_size <= max_size,
+                 f"block too large ({block_size} > {max_size} bytes)")
 
         # Timestamp validation
         now_ms = int(time.time() * 1000)
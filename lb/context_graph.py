@@ -4,10 +4,10 @@ import time
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Tuple
 
-from .latent import embed, cosine
+from .latent import embed_int8, cosine_int8
 
 
-@dataclass
+@dataclass(slots=True)
 class Claim:
     claim_hash: str
     text: str
@@ -50,12 +50,13 @@ class ContextGraph:
     - claims (text + tags + evidence references)
     - retractions
     - deterministic compilation via latent-space similarity ranking
-    - embedding cache for O(1) retrieval instead of O(n) recomputation
+    - embedding cache for O(1) retrieval instead of O(n) recomputation,
+      holding int8-quantized vectors (64 bytes per claim)
     """
 
     def __init__(self) -> None:
         self.claims: Dict[str, Claim] = {}
-        self._embedding_cache: Dict[str, List[float]] = {}  # claim_hash -> embedding
+        self._embedding_cache: Dict[str, bytes] = {}  # claim_hash -> int8 embedding
 
     def add_claim(
         self,
@@ -79,7 +80,7 @@ class ContextGraph:
             retracted=False,
         )
         # Pre-compute and cache embedding for O(1) lookup during compile
-        self._embedding_cache[claim_hash] = embed(text)
+        self._embedding_cache[claim_hash] = embed_int8(text)
 
     def retract(self, claim_hash: str) -> None:
         c = self.claims.get(claim_hash)
@@ -101,7 +102,7 @@ class ContextGraph:
         Returns:
             Tuple of (formatted context string, list of claim hashes)
         """
-        qv = embed(query)
+        qv = embed_int8(query)
         scored: List[Tuple[float, str]] = []
         for h, c in self.claims.items():
             if c.retracted:
@@ -113,9 +114,9 @@ class ContextGraph:
             if h in self._embedding_cache:
                 cv = self._embedding_cache[h]
             else:
-                cv = embed(c.text)
+                cv = embed_int8(c.text)
                 self._embedding_cache[h] = cv
-            s = cosine(qv, cv)
+            s = cosine_int8(qv, cv)
             scored.append((s, h))
         scored.sort(key=lambda x: (-x[0], x[1]))
         chosen = [h for _, h in scored[: max(0, int(top_k))]]
@@ -144,5 +145,5 @@ class ContextGraph:
             g.claims[h] = claim
             # Pre-compute embedding for cache
             if not claim.retracted:
-                g._embedding_cache[h] = embed(claim.text)
+                g._embedding_cache[h] = embed_int8(claim.text)
         return g
@@ -6,9 +6,10 @@ from typing import Tuple
 
 from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.ciphers.aead import ChaCha20Poly1305
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM, ChaCha20Poly1305
 from cryptography.hazmat.primitives.asymmetric.x25519 import X25519PrivateKey, X25519PublicKey
 
+from .canonical import canonical_json_bytes
 from .keys import b64e, b64d
 
 
@@ -17,10 +18,24 @@ class CryptoError(Exception):
 
 
 def hkdf_sha256(ikm: bytes, *, salt: bytes, info: bytes, length: int) -> bytes:
+    # cryptography's HKDF is implemented natively and measured faster than
+    # two hmac.digest() calls, so there is no pure-Python fast path here
     hk = HKDF(algorithm=hashes.SHA256(), length=length, salt=salt, info=info)
     return hk.derive(ikm)
 
 
+def aead_cipher(key: bytes) -> ChaCha20Poly1305:
+    """AEAD cipher bound to key, for callers that reuse one key many times.
+
+    Building the cipher costs about as much as sealing a small message, so
+    long-lived keys (e.g. secure channel session keys) should hold on to
+    one. The instance holds the key, so drop it with the key.
+    """
+    if len(key) != 32:
+        raise CryptoError("AEAD key must be 32 bytes")
+    return ChaCha20Poly1305(key)
+
+
 def aead_encrypt(key: bytes, nonce: bytes, plaintext: bytes, aad: bytes) -> bytes:
     if len(key) != 32:
         raise CryptoError("AEAD key must be 32 bytes")
@@ -45,11 +60,14 @@ def seal_to_x25519(recipient_pub: X25519PublicKey, plaintext: bytes, *, context:
 
     Returns a JSON-serializable dict {epk, nonce, ct}.
     """
-    eph = X25519PrivateKey.generate()
+    # Scalar, salt and nonce from one getrandom() call; X25519 clamps the
+    # scalar itself, so any 32 random bytes are a valid private key
+    rnd = os.urandom(76)
+    eph = X25519PrivateKey.from_private_bytes(rnd[:32])
+    salt = rnd[32:64]
+    nonce = rnd[64:]
     shared = eph.exchange(recipient_pub)
-    salt = os.urandom(32)
     key = hkdf_sha256(shared, salt=salt, info=context, length=32)
-    nonce = os.urandom(12)
     ct = aead_encrypt(key, nonce, plaintext, aad=context)
     return {
         "epk": b64e(eph.public_key().public_bytes_raw()),
@@ -73,21 +91,43 @@ def open_from_x25519(recipient_priv: X25519PrivateKey, sealed: dict, *, context:
     return aead_decrypt(key, nonce, ct, aad=context)
 
 
-def encrypt_package(plaintext: bytes, *, key: bytes | None = None, aad: bytes = b"") -> Tuple[bytes, bytes]:
-    """Encrypts a package with a random symmetric key and returns (envelope_json_bytes, key)."""
+# Package envelope ciphers by their "cipher" name; both take 32-byte keys
+# and 12-byte nonces
+PACKAGE_CIPHERS = {
+    "chacha20poly1305": ChaCha20Poly1305,
+    "aes-256-gcm": AESGCM,
+}
+
+# Envelopes leave the node, and releases before AES-GCM support only open
+# chacha20poly1305, so that stays the default until every peer reads both
+DEFAULT_PACKAGE_CIPHER = "chacha20poly1305"
+
+
+def encrypt_package(plaintext: bytes, *, key: bytes | None = None, aad: bytes = b"", cipher: str | None = None) -> Tuple[bytes, bytes]:
+    """Encrypts a package with a random symmetric key and returns (envelope_json_bytes, key).
+
+    cipher is a PACKAGE_CIPHERS name; AES-256-GCM is opt-in, since only
+    peers that support it can open the envelope.
+    """
     if key is None:
         key = os.urandom(32)
+    if cipher is None:
+        cipher = DEFAULT_PACKAGE_CIPHER
+    if cipher not in PACKAGE_CIPHERS:
+        raise CryptoError(f"unsupported cipher: {cipher}")
+    if len(key) != 32:
+        raise CryptoError("AEAD key must be 32 bytes")
     nonce = os.urandom(12)
-    ct = aead_encrypt(key, nonce, plaintext, aad=aad)
-    import json
+    ct = PACKAGE_CIPHERS[cipher](key).encrypt(nonce, plaintext, aad)
     env = {
         "v": 1,
-        "cipher": "chacha20poly1305",
+        "cipher": cipher,
         "nonce": b64e(nonce),
         "ct": b64e(ct),
         "aad": b64e(aad),
     }
-    return json.dumps(env, sort_keys=True, separators=(",", ":")).encode("utf-8"), key
+    # All-ASCII envelope, so identical to the previous ensure_ascii encoding
+    return canonical_json_bytes(env), key
 
 
 def decrypt_package(envelope_bytes: bytes, *, key: bytes, aad: bytes | None = None) -> bytes:
@@ -96,11 +136,17 @@ def decrypt_package(envelope_bytes: bytes, *, key: bytes, aad: bytes | None = No
         env = json.loads(envelope_bytes.decode("utf-8"))
     except (json.JSONDecodeError, UnicodeDecodeError) as e:
         raise CryptoError(f"invalid envelope format: {e}")
-    if env.get("cipher") != "chacha20poly1305":
+    cipher = env.get("cipher")
+    cipher_cls = PACKAGE_CIPHERS.get(cipher) if isinstance(cipher, str) else None
+    if cipher_cls is None:
         raise CryptoError("unsupported cipher")
     nonce = b64d(env["nonce"])
     ct = b64d(env["ct"])
     env_aad = b64d(env.get("aad", "")) if env.get("aad") is not None else b""
     if aad is None:
         aad = env_aad
-    return aead_decrypt(key, nonce, ct, aad=aad)
+    if len(key) != 32:
+        raise CryptoError("AEAD key must be 32 bytes")
+    if len(nonce) != 12:
+        raise CryptoError("AEAD nonce must be 12 bytes")
+    return cipher_cls(key).decrypt(nonce, ct, aad)
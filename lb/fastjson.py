@@ -0,0 +1,129 @@
+"""Fast JSON encoding with an optional orjson backend.
+
+orjson is used when it is installed (``pip install learning-battery[speed]``);
+otherwise everything falls back to the stdlib ``json`` module. Both backends
+produce compact UTF-8 JSON as ``bytes``.
+
+This module is for non-consensus data only (API responses, local files, log
+lines). Anything that is hashed or signed must go through ``lb.canonical``.
+"""
+from __future__ import annotations
+
+import json
+from typing import Any, Callable, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised when orjson is absent
+    orjson = None  # type: ignore[assignment]
+
+HAVE_ORJSON = orjson is not None
+
+# orjson.JSONDecodeError subclasses this, so it covers both backends
+JSONDecodeError = json.JSONDecodeError
+
+# orjson holds integers from -2**63 to 2**64 - 1. Anything outside that
+# has at least 20 digits, or at least 19 when negative (-2**63 - 1 is
+# -9223372036854775809). Digits are all mapped to "0" so that runs can be
+# found with bytes.find.
+_DIGITS_TO_ZERO = bytes.maketrans(b"123456789", b"000000000")
+_LONG_RUN = b"0" * 19
+
+# The scan translates a copy of the input, one chunk at a time, so that a
+# memory-mapped document is never copied whole. Chunks overlap so that a run
+# crossing a boundary is seen intact in the next one.
+_SCAN_CHUNK = 1 << 20
+_SCAN_OVERLAP = 64
+
+
+def _may_hold_big_int(data: Union[bytes, bytearray, memoryview]) -> bool:
+    """True if data might contain an integer literal wider than 64 bits.
+
+    orjson silently parses those as floats, which would change the value.
+    Long digit runs inside strings (hex digests) are told apart by the
+    preceding character; a false positive only costs a stdlib parse.
+    """
+    with memoryview(data) as view:
+        end = view.nbytes
+        start = 0
+        while start < end:
+            lo = max(0, start - _SCAN_OVERLAP)
+            flat = bytes(view[lo:start + _SCAN_CHUNK]).translate(_DIGITS_TO_ZERO)
+            if _chunk_may_hold_big_int(flat):
+                return True
+            start += _SCAN_CHUNK
+    return False
+
+
+def _chunk_may_hold_big_int(flat: bytes) -> bool:
+    end = len(flat)
+    i = flat.find(_LONG_RUN)
+    while i != -1:
+        k = i + len(_LONG_RUN)
+        while k < end and flat[k] == 0x30:
+            k += 1
+        j = i - 1
+        negative = j >= 0 and flat[j] == 0x2D  # minus sign
+        # 19 digits only overflow when negative
+        if negative or k - i > len(_LONG_RUN):
+            if negative:
+                j -= 1
+            while j >= 0 and flat[j] in b" \t\r\n":
+                j -= 1
+            if j < 0:
+                # document start, or context cut off by the chunk: assume a number
+                return True
+            if flat[j] in b":[,":
+                return True
+        i = flat.find(_LONG_RUN, k)
+    return False
+
+
+def dumps(obj: Any, *, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """Serialize obj to compact JSON bytes.
+
+    default is called for values neither backend can encode, as in the
+    stdlib. orjson also encodes dataclasses and datetimes natively.
+    """
+    if HAVE_ORJSON:
+        try:
+            return orjson.dumps(obj, default=default)
+        except TypeError:
+            # Non-str keys, integers beyond 64 bits, etc.
+            pass
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=default).encode("utf-8")
+
+
+def dumps_pretty(obj: Any, *, sort_keys: bool = True) -> bytes:
+    """Serialize obj to JSON bytes with 2-space indentation.
+
+    Keys are sorted unless sort_keys is False, which keeps insertion order
+    (for files people edit or diff by hand).
+    """
+    if HAVE_ORJSON:
+        option = orjson.OPT_INDENT_2 | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        try:
+            return orjson.dumps(obj, option=option)
+        except TypeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False, sort_keys=sort_keys, indent=2).encode("utf-8")
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """Parse JSON from bytes or str.
+
+    Values are the same with either backend: documents orjson would parse
+    differently (integers beyond 64 bits) or rejects but the stdlib accepts
+    (NaN/Infinity, as older files may contain) go to the stdlib parser.
+    """
+    if HAVE_ORJSON:
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        if not _may_hold_big_int(data):
+            try:
+                return orjson.loads(data)
+            except orjson.JSONDecodeError:
+                pass  # retried below; the stdlib raises for invalid JSON
+    if isinstance(data, memoryview):
+        data = bytes(data)
+    return json.loads(data)
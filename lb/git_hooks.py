@@ -31,9 +31,21 @@ if [ ! -d ".lbm" ]; then
     exit 0
 fi
 
-# Get commit info
-COMMIT_MSG=$(git log -1 --pretty=%B 2>/dev/null)
-FILES_CHANGED=$(git diff-tree --no-commit-id --name-only -r HEAD 2>/dev/null | tr '\\n' ',')
+# Get commit message and changed files from one git process; the
+# message is terminated by a 0x1f byte and the file names follow it
+OUT=$(git log -1 --format='%B%x1f' --name-only HEAD 2>/dev/null)
+COMMIT_MSG=${OUT%%$'\\x1f'*}
+while [[ $COMMIT_MSG == *$'\\n' ]]; do
+    COMMIT_MSG=${COMMIT_MSG%$'\\n'}
+done
+FILES_CHANGED=${OUT#*$'\\x1f'}
+while [[ $FILES_CHANGED == $'\\n'* ]]; do
+    FILES_CHANGED=${FILES_CHANGED#$'\\n'}
+done
+# Each name is followed by a comma, as 'tr' used to produce
+if [ -n "$FILES_CHANGED" ]; then
+    FILES_CHANGED="${FILES_CHANGED//$'\\n'/,},"
+fi
 
 # Sync in background (don't block commit)
 (lb github sync --commit "$COMMIT_MSG" --files "$FILES_CHANGED" 2>/dev/null &)
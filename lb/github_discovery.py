@@ -7,20 +7,59 @@ This module provides functionality to:
 """
 from __future__ import annotations
 
+import hashlib
 import json
 import os
+import re
+import urllib.parse
 import urllib.request
 import urllib.error
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from pathlib import Path
 
+from . import fastjson
+from .fs import atomic_write_bytes, ensure_dir
 from .logging_config import get_logger
 
 logger = get_logger("lb.github")
 
 GITHUB_API_BASE = "https://api.github.com"
 
+# Largest page size the GitHub REST API allows
+PER_PAGE = 100
+
+# Concurrent requests when fetching the remaining pages of a listing
+MAX_PAGE_WORKERS = 8
+
+
+def default_cache_dir() -> Optional[Path]:
+    """Where GitHub API responses are cached: $LBM_GITHUB_CACHE_DIR, or None.
+
+    Responses can include private data (collaborators of private repos), so
+    nothing is written to disk unless a cache directory is asked for.
+    """
+    path = os.environ.get("LBM_GITHUB_CACHE_DIR")
+    return Path(path) if path else None
+
+
+_LINK_LAST_RE = re.compile(r'<([^>]+)>\s*;\s*rel="last"')
+
+
+def _last_page(link_header: Any) -> int:
+    """Page number of the rel="last" entry of a Link header, or 1."""
+    if not isinstance(link_header, str):
+        return 1
+    m = _LINK_LAST_RE.search(link_header)
+    if not m:
+        return 1
+    query = urllib.parse.parse_qs(urllib.parse.urlparse(m.group(1)).query)
+    try:
+        return max(1, int(query.get("page", ["1"])[0]))
+    except ValueError:
+        return 1
+
 
 @dataclass
 class GitHubUser:
@@ -65,6 +104,10 @@ class GitHubDiscoveryError(Exception):
 class GitHubDiscovery:
     """Discover collaborators via GitHub API.
 
+    When a cache directory is configured, GET responses are cached on disk
+    with their ETag and revalidated with If-None-Match; GitHub answers 304
+    without charging the rate limit.
+
     Usage:
         discovery = GitHubDiscovery("owner/repo")
         collaborators = await discovery.get_collaborators()
@@ -73,17 +116,20 @@ class GitHubDiscovery:
         discovery = GitHubDiscovery("owner/repo", token="ghp_...")
     """
 
-    def __init__(self, repo: str, *, token: Optional[str] = None):
+    def __init__(self, repo: str, *, token: Optional[str] = None, cache_dir: Optional[Path] = None):
         """Initialize GitHub discovery.
 
         Args:
             repo: Repository in "owner/repo" format
             token: GitHub personal access token. If not provided,
                    uses GITHUB_TOKEN environment variable.
+            cache_dir: Directory for cached API responses. Defaults to
+                   default_cache_dir(); no caching if that is None.
         """
         self.repo = repo
         self.token = token or os.environ.get("GITHUB_TOKEN")
         self._owner, self._name = self._parse_repo(repo)
+        self.cache_dir: Optional[Path] = Path(cache_dir) if cache_dir is not None else default_cache_dir()
 
     @staticmethod
     def _parse_repo(repo: str) -> tuple:
@@ -107,6 +153,33 @@ class GitHubDiscovery:
         Raises:
             GitHubDiscoveryError: On API errors
         """
+        return self._request_with_link(endpoint, method, data)[0]
+
+    def _cache_path(self, url: str) -> Path:
+        # Keyed by token too: what a URL returns depends on who asks
+        key = hashlib.sha256(f"{self.token or ''}\n{url}".encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{key}.json"
+
+    def _load_cached(self, url: str) -> Optional[Dict[str, Any]]:
+        if self.cache_dir is None:
+            return None
+        try:
+            entry = fastjson.loads(self._cache_path(url).read_bytes())
+        except (OSError, fastjson.JSONDecodeError):
+            return None
+        return entry if isinstance(entry, dict) and isinstance(entry.get("etag"), str) else None
+
+    def _store_cached(self, url: str, etag: str, body: Any, link: Optional[str]) -> None:
+        if self.cache_dir is None:
+            return
+        try:
+            ensure_dir(self.cache_dir)
+            atomic_write_bytes(self._cache_path(url), fastjson.dumps({"etag": etag, "link": link, "body": body}))
+        except OSError as e:
+            logger.debug(f"Failed to cache GitHub response: {e}")
+
+    def _request_with_link(self, endpoint: str, method: str = "GET", data: Optional[Dict] = None) -> Tuple[Any, Optional[str]]:
+        """Like _request, but also return the response's Link header (pagination)."""
         url = f"{GITHUB_API_BASE}{endpoint}"
         headers = {
             "Accept": "application/vnd.github+json",
@@ -122,12 +195,24 @@ class GitHubDiscovery:
             body = json.dumps(data).encode("utf-8")
             headers["Content-Type"] = "application/json"
 
+        cached = self._load_cached(url) if method == "GET" else None
+        if cached:
+            headers["If-None-Match"] = cached["etag"]
+
         req = urllib.request.Request(url, data=body, headers=headers, method=method)
 
         try:
             with urllib.request.urlopen(req, timeout=30) as resp:
-                return json.loads(resp.read().decode("utf-8"))
+                raw = resp.read()
+                result = json.loads(raw.decode("utf-8")) if raw else None
+                link = resp.headers.get("Link")
+                etag = resp.headers.get("ETag")
+            if method == "GET" and isinstance(etag, str):
+                self._store_cached(url, etag, result, link)
+            return result, link
         except urllib.error.HTTPError as e:
+            if e.code == 304 and cached:
+                return cached.get("body"), cached.get("link")
             error_body = e.read().decode("utf-8") if e.fp else ""
             if e.code == 401:
                 raise GitHubDiscoveryError("GitHub authentication failed. Set GITHUB_TOKEN.")
@@ -143,14 +228,24 @@ class GitHubDiscovery:
     def get_collaborators(self) -> List[Collaborator]:
         """Fetch repository collaborators from GitHub API.
 
+        Fetches every page: the first one tells how many there are (Link
+        header), and the rest are requested concurrently.
+
         Returns:
             List of collaborators with their permissions
 
         Raises:
             GitHubDiscoveryError: On API errors
         """
-        endpoint = f"/repos/{self._owner}/{self._name}/collaborators"
-        data = self._request(endpoint)
+        endpoint = f"/repos/{self._owner}/{self._name}/collaborators?per_page={PER_PAGE}"
+        data, link = self._request_with_link(endpoint)
+        last = _last_page(link)
+        if last > 1:
+            pages = [f"{endpoint}&page={n}" for n in range(2, last + 1)]
+            with ThreadPoolExecutor(max_workers=min(MAX_PAGE_WORKERS, len(pages))) as ex:
+                data = list(data)
+                for page in ex.map(self._request, pages):
+                    data.extend(page)
 
         collaborators = []
         for item in data:
@@ -243,25 +338,26 @@ def load_peers_from_repo(repo_path: Path) -> List[LBMPeer]:
         List of configured peers
     """
     peers_file = repo_path / ".lbm" / "peers.json"
-    if not peers_file.exists():
+    try:
+        raw = peers_file.read_bytes()
+    except FileNotFoundError:
         return []
 
     try:
-        with open(peers_file, "r") as f:
-            data = json.load(f)
-
-        peers = []
-        for p in data.get("peers", []):
-            peers.append(LBMPeer(
+        data = fastjson.loads(raw)
+        # Only the fields LBMPeer holds are read off each entry
+        return [
+            LBMPeer(
                 github_user=p["github_user"],
                 sign_pub=p["sign_pub"],
                 enc_pub=p.get("enc_pub"),
                 last_seen_ms=p.get("last_seen_ms"),
                 host=p.get("host"),
                 port=p.get("port"),
-            ))
-        return peers
-    except (json.JSONDecodeError, KeyError) as e:
+            )
+            for p in data.get("peers", [])
+        ]
+    except (fastjson.JSONDecodeError, KeyError, TypeError, AttributeError) as e:
         logger.warning(f"Failed to parse peers.json: {e}")
         return []
 
@@ -274,25 +370,83 @@ def save_peers_to_repo(repo_path: Path, peers: List[LBMPeer]) -> None:
         peers: List of peers to save
     """
     peers_file = repo_path / ".lbm" / "peers.json"
-    peers_file.parent.mkdir(parents=True, exist_ok=True)
-
-    data = {
-        "peers": [
-            {
-                "github_user": p.github_user,
-                "sign_pub": p.sign_pub,
-                **({"enc_pub": p.enc_pub} if p.enc_pub else {}),
-                **({"last_seen_ms": p.last_seen_ms} if p.last_seen_ms else {}),
-                **({"host": p.host} if p.host else {}),
-                **({"port": p.port} if p.port else {}),
-            }
-            for p in peers
-        ]
-    }
 
-    with open(peers_file, "w") as f:
-        json.dump(data, f, indent=2)
-        f.write("\n")
+    entries = [
+        fastjson.dumps({
+            "github_user": p.github_user,
+            "sign_pub": p.sign_pub,
+            **({"enc_pub": p.enc_pub} if p.enc_pub else {}),
+            **({"last_seen_ms": p.last_seen_ms} if p.last_seen_ms else {}),
+            **({"host": p.host} if p.host else {}),
+            **({"port": p.port} if p.port else {}),
+        })
+        for p in peers
+    ]
+
+    # Compact, but one peer per line: this file is committed to the repo, and
+    # a line per peer keeps diffs and merges of concurrent joins readable
+    if entries:
+        data = b'{"peers":[\n' + b",\n".join(entries) + b"\n]}\n"
+    else:
+        data = b'{"peers":[]}\n'
+    atomic_write_bytes(peers_file, data)
+
+
+def _origin_url_from_config(text: str) -> Optional[str]:
+    """remote.origin.url from the text of a git config file, or None.
+
+    Only the plain `key = value` layout git itself writes is read; includes,
+    quoting, escapes and continuation lines raise ValueError so the caller
+    can ask git instead. The last value wins, as with `git config --get`.
+    """
+    url = None
+    in_origin = False
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line or line[0] in "#;":
+            continue
+        if line.endswith("\\"):
+            raise ValueError("continuation line")
+        if line.startswith("["):
+            header, sep, rest = line[1:].partition("]")
+            if not sep or (rest.strip() and rest.strip()[0] not in "#;"):
+                raise ValueError("unsupported section header")
+            section = header.strip()
+            if section.lower().startswith("include"):
+                raise ValueError("include directive")
+            in_origin = section in ('remote "origin"', "remote.origin")
+            continue
+        if not in_origin:
+            continue
+        key, _, value = line.partition("=")
+        if key.strip().lower() != "url":
+            continue
+        if '"' in value or "\\" in value:
+            raise ValueError("quoted or escaped value")
+        url = re.split(r"[#;]", value, maxsplit=1)[0].strip()
+    return url
+
+
+def _git_origin_url(repo_path: Path) -> Optional[str]:
+    """Read remote.origin.url, without spawning git when possible."""
+    import subprocess
+
+    try:
+        text = (Path(repo_path) / ".git" / "config").read_text(encoding="utf-8")
+        return _origin_url_from_config(text)
+    except (OSError, UnicodeDecodeError, ValueError):
+        pass  # worktree, subdirectory or unusual config: let git resolve it
+
+    result = subprocess.run(
+        ["git", "config", "--get", "remote.origin.url"],
+        cwd=repo_path,
+        capture_output=True,
+        text=True,
+        timeout=5,
+    )
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip()
 
 
 def get_git_remote_repo(repo_path: Path) -> Optional[str]:
@@ -304,21 +458,11 @@ def get_git_remote_repo(repo_path: Path) -> Optional[str]:
     Returns:
         "owner/repo" string or None if not found
     """
-    import subprocess
-
     try:
-        result = subprocess.run(
-            ["git", "config", "--get", "remote.origin.url"],
-            cwd=repo_path,
-            capture_output=True,
-            text=True,
-            timeout=5,
-        )
-        if result.returncode != 0:
+        url = _git_origin_url(repo_path)
+        if not url:
             return None
 
-        url = result.stdout.strip()
-
         # Parse various URL formats:
         # git@github.com:owner/repo.git
         # https://github.com/owner/repo.git
@@ -21,14 +21,17 @@ Usage:
 """
 from __future__ import annotations
 
-import json
+import asyncio
 import os
 import subprocess
 import time
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
+from . import fastjson
+from .fs import atomic_write_bytes
+from .git_hooks import DEFAULT_HOOKS, HOOK_TEMPLATES
 from .github_discovery import (
     GitHubDiscovery,
     GitHubDiscoveryError,
@@ -46,6 +49,14 @@ logger = get_logger("lb.github")
 # Default relay server URL (optional)
 DEFAULT_RELAY_URL = "wss://relay.lbm.dev"
 
+# Peers github_sync pulls from at the same time
+MAX_SYNC_PEERS = 8
+
+# Nodes loaded by this process, keyed by node directory, with the (inode,
+# mtime) of node.json they were loaded from so a re-init is noticed. Like any
+# long-lived node, a cached one does not see writes by other processes.
+_node_cache: Dict[str, Tuple[Tuple[int, int], BatteryNode]] = {}
+
 
 @dataclass
 class LBMConfig:
@@ -63,9 +74,23 @@ class LBMConfig:
     version: str = "1"
 
     def to_dict(self) -> Dict[str, Any]:
-        d = asdict(self)
-        # Remove None values
-        return {k: v for k, v in d.items() if v is not None}
+        d = {
+            "group_id": self.group_id,
+            "group_name": self.group_name,
+            "created_by": self.created_by,
+            "created_at": self.created_at,
+            "github_repo": self.github_repo,
+            "discovery": self.discovery,
+            "relay_url": self.relay_url,
+            "sync_on_commit": self.sync_on_commit,
+            "sync_on_push": self.sync_on_push,
+            "agent_auto_register": self.agent_auto_register,
+            "version": self.version,
+        }
+        # Omit relay_url when unset; the key keeps its place otherwise
+        if self.relay_url is None:
+            del d["relay_url"]
+        return d
 
     @staticmethod
     def from_dict(d: Dict[str, Any]) -> "LBMConfig":
@@ -95,6 +120,26 @@ def is_lbm_initialized(repo_path: Path) -> bool:
     return config_path.exists()
 
 
+def _read_lbm_config(repo_path: Path) -> Optional[LBMConfig]:
+    """Load the repository's LBM config, or None if it has none.
+
+    One open() both checks for and reads the file, so callers don't need a
+    separate is_lbm_initialized() stat first.
+
+    Raises:
+        GitHubIntegrationError: If the config is invalid
+    """
+    config_path = repo_path / ".lbm" / "config.json"
+    try:
+        raw = config_path.read_bytes()
+    except FileNotFoundError:
+        return None
+    try:
+        return LBMConfig.from_dict(fastjson.loads(raw))
+    except (fastjson.JSONDecodeError, KeyError) as e:
+        raise GitHubIntegrationError(f"Invalid LBM config: {e}")
+
+
 def load_lbm_config(repo_path: Path) -> LBMConfig:
     """Load LBM configuration from repository.
 
@@ -107,34 +152,26 @@ def load_lbm_config(repo_path: Path) -> LBMConfig:
     Raises:
         GitHubIntegrationError: If config doesn't exist or is invalid
     """
-    config_path = repo_path / ".lbm" / "config.json"
-    if not config_path.exists():
+    config = _read_lbm_config(repo_path)
+    if config is None:
         raise GitHubIntegrationError(
             f"LBM not initialized in {repo_path}. Run 'lb github init' first."
         )
-
-    try:
-        with open(config_path, "r") as f:
-            data = json.load(f)
-        return LBMConfig.from_dict(data)
-    except (json.JSONDecodeError, KeyError) as e:
-        raise GitHubIntegrationError(f"Invalid LBM config: {e}")
+    return config
 
 
 def save_lbm_config(repo_path: Path, config: LBMConfig) -> None:
     """Save LBM configuration to repository."""
     config_path = repo_path / ".lbm" / "config.json"
-    config_path.parent.mkdir(parents=True, exist_ok=True)
-
-    with open(config_path, "w") as f:
-        json.dump(config.to_dict(), f, indent=2)
-        f.write("\n")
+    # Committed to the repo: keep field order and the trailing newline
+    atomic_write_bytes(config_path, fastjson.dumps_pretty(config.to_dict(), sort_keys=False) + b"\n")
 
 
 def get_or_create_node(repo_path: Path) -> BatteryNode:
     """Get or create LBM node for the repository.
 
-    Node data is stored in .lbm/node/ and should be gitignored.
+    Node data is stored in .lbm/node/ and should be gitignored. Repeated
+    calls in one process return the same instance.
 
     Args:
         repo_path: Path to repository root
@@ -143,11 +180,21 @@ def get_or_create_node(repo_path: Path) -> BatteryNode:
         BatteryNode instance
     """
     node_path = repo_path / ".lbm" / "node"
+    meta_path = node_path / "node.json"
+    key = os.path.abspath(node_path)
 
-    if (node_path / "node.json").exists():
-        return BatteryNode.load(node_path)
+    try:
+        st = os.stat(meta_path)
+    except FileNotFoundError:
+        node = BatteryNode.init(node_path)
+        st = os.stat(meta_path)
     else:
-        return BatteryNode.init(node_path)
+        cached = _node_cache.get(key)
+        if cached is not None and cached[0] == (st.st_ino, st.st_mtime_ns):
+            return cached[1]
+        node = BatteryNode.load(node_path)
+    _node_cache[key] = ((st.st_ino, st.st_mtime_ns), node)
+    return node
 
 
 def github_init(
@@ -288,15 +335,13 @@ def github_join(repo_path: Path) -> LBMConfig:
     """
     repo_path = Path(repo_path).resolve()
 
-    # Verify LBM is initialized
-    if not is_lbm_initialized(repo_path):
+    # Load config, verifying LBM is initialized
+    config = _read_lbm_config(repo_path)
+    if config is None:
         raise GitHubIntegrationError(
             f"LBM not initialized in {repo_path}. Ask repo owner to run 'lb github init'."
         )
 
-    # Load config
-    config = load_lbm_config(repo_path)
-
     # Get current GitHub user
     discovery = GitHubDiscovery(config.github_repo)
     try:
@@ -358,6 +403,22 @@ def github_join(repo_path: Path) -> LBMConfig:
     return config
 
 
+async def _sync_from_peers(
+    node: BatteryNode, peers: List[LBMPeer], group_id: str
+) -> List[Optional[BaseException]]:
+    """Sync a group from several peers concurrently.
+
+    Returns one entry per peer, in order: None on success, else the error.
+    """
+    limit = asyncio.Semaphore(MAX_SYNC_PEERS)
+
+    async def sync_one(peer: LBMPeer) -> None:
+        async with limit:
+            await node.sync_group_from_peer(peer.host, peer.port, group_id)
+
+    return await asyncio.gather(*(sync_one(p) for p in peers), return_exceptions=True)
+
+
 def github_sync(
     repo_path: Path,
     *,
@@ -383,10 +444,9 @@ def github_sync(
     """
     repo_path = Path(repo_path).resolve()
 
-    if not is_lbm_initialized(repo_path):
+    config = _read_lbm_config(repo_path)
+    if config is None:
         raise GitHubIntegrationError(f"LBM not initialized in {repo_path}")
-
-    config = load_lbm_config(repo_path)
     node = get_or_create_node(repo_path)
     peers = load_peers_from_repo(repo_path)
 
@@ -396,19 +456,18 @@ def github_sync(
         "claim_published": False,
     }
 
-    # Sync from peers
-    for peer in peers:
-        if peer.sign_pub == node.keys.sign_pub_b64:
-            continue  # Skip self
-
-        if peer.host and peer.port:
-            try:
-                node.sync_group_from_peer(peer.host, peer.port, config.group_id)
+    # Sync from reachable peers (skipping self); round trips overlap
+    own_pub = node.keys.sign_pub_b64
+    targets = [p for p in peers if p.sign_pub != own_pub and p.host and p.port]
+    if targets:
+        outcomes = asyncio.run(_sync_from_peers(node, targets, config.group_id))
+        for peer, error in zip(targets, outcomes):
+            if error is None:
                 result["synced_from"].append(peer.github_user)
-            except Exception as e:
+            else:
                 result["sync_errors"].append({
                     "peer": peer.github_user,
-                    "error": str(e),
+                    "error": str(error),
                 })
 
     # Publish commit as knowledge if provided
@@ -445,10 +504,9 @@ def github_status(repo_path: Path) -> Dict[str, Any]:
     """
     repo_path = Path(repo_path).resolve()
 
-    if not is_lbm_initialized(repo_path):
+    config = _read_lbm_config(repo_path)
+    if config is None:
         return {"initialized": False}
-
-    config = load_lbm_config(repo_path)
     node = get_or_create_node(repo_path)
     peers = load_peers_from_repo(repo_path)
 
@@ -463,11 +521,8 @@ def github_status(repo_path: Path) -> Dict[str, Any]:
         }
 
     # Find current user in peers
-    my_peer = None
-    for p in peers:
-        if p.sign_pub == node.keys.sign_pub_b64:
-            my_peer = p.github_user
-            break
+    my_sign = node.keys.sign_pub_b64
+    my_peer = next((p.github_user for p in peers if p.sign_pub == my_sign), None)
 
     return {
         "initialized": True,
@@ -481,7 +536,7 @@ def github_status(repo_path: Path) -> Dict[str, Any]:
                 "github_user": p.github_user,
                 "sign_pub": p.sign_pub[:16] + "...",
                 "has_address": bool(p.host and p.port),
-                "is_self": p.sign_pub == node.keys.sign_pub_b64,
+                "is_self": p.sign_pub == my_sign,
             }
             for p in peers
         ],
@@ -514,11 +569,10 @@ def register_agent(
     """
     repo_path = Path(repo_path).resolve()
 
-    if not is_lbm_initialized(repo_path):
+    config = _read_lbm_config(repo_path)
+    if config is None:
         raise GitHubIntegrationError(f"LBM not initialized in {repo_path}")
 
-    config = load_lbm_config(repo_path)
-
     if not config.agent_auto_register:
         raise GitHubIntegrationError("Agent auto-registration disabled in config")
 
@@ -550,72 +604,33 @@ def _install_git_hooks(repo_path: Path) -> None:
     Creates hooks in .lbm/hooks/ and symlinks to .git/hooks/
     """
     hooks_dir = repo_path / ".lbm" / "hooks"
-    hooks_dir.mkdir(parents=True, exist_ok=True)
-
-    # Post-commit hook
-    post_commit = hooks_dir / "post-commit"
-    post_commit_content = '''#!/bin/bash
-# LBM auto-sync on commit
-# Generated by 'lb github init'
-
-# Check if lb command exists
-if ! command -v lb &> /dev/null; then
-    exit 0
-fi
-
-# Get commit info
-COMMIT_MSG=$(git log -1 --pretty=%B 2>/dev/null)
-FILES_CHANGED=$(git diff-tree --no-commit-id --name-only -r HEAD 2>/dev/null | tr '\\n' ',')
-
-# Sync in background (don't block commit)
-(lb github sync --commit "$COMMIT_MSG" --files "$FILES_CHANGED" 2>/dev/null &)
-'''
-    with open(post_commit, "w") as f:
-        f.write(post_commit_content)
-    os.chmod(post_commit, 0o755)
-
-    # Post-checkout hook
-    post_checkout = hooks_dir / "post-checkout"
-    post_checkout_content = '''#!/bin/bash
-# LBM sync on checkout
-# Generated by 'lb github init'
-
-# Only run on branch checkout, not file checkout
-if [ "$3" != "1" ]; then
-    exit 0
-fi
-
-# Check if lb command exists
-if ! command -v lb &> /dev/null; then
-    exit 0
-fi
-
-# Sync in background
-(lb github sync 2>/dev/null &)
-'''
-    with open(post_checkout, "w") as f:
-        f.write(post_checkout_content)
-    os.chmod(post_checkout, 0o755)
-
-    # Symlink to .git/hooks/
     git_hooks_dir = repo_path / ".git" / "hooks"
-    git_hooks_dir.mkdir(parents=True, exist_ok=True)
+    os.makedirs(hooks_dir, exist_ok=True)
+    os.makedirs(git_hooks_dir, exist_ok=True)
 
-    for hook_name in ["post-commit", "post-checkout"]:
-        src = hooks_dir / hook_name
-        dst = git_hooks_dir / hook_name
+    # One listing tells which hooks exist and which are our symlinks
+    with os.scandir(git_hooks_dir) as it:
+        existing = {e.name: e.is_symlink() for e in it if e.name in DEFAULT_HOOKS}
+    rel_dir = os.path.relpath(hooks_dir, git_hooks_dir)
+
+    for hook_name in DEFAULT_HOOKS:
+        fd = os.open(hooks_dir / hook_name, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o755)
+        with os.fdopen(fd, "w") as f:
+            # the open mode is masked by umask and ignored for existing files
+            os.fchmod(fd, 0o755)
+            f.write(HOOK_TEMPLATES[hook_name])
 
         # Don't overwrite existing hooks
-        if dst.exists() and not dst.is_symlink():
+        if existing.get(hook_name) is False:
             logger.warning(f"Existing {hook_name} hook found, not overwriting")
             continue
 
-        # Remove old symlink if exists
-        if dst.is_symlink():
-            dst.unlink()
-
-        # Create relative symlink
-        rel_src = os.path.relpath(src, git_hooks_dir)
-        dst.symlink_to(rel_src)
+        dst = git_hooks_dir / hook_name
+        if existing.get(hook_name):
+            os.unlink(dst)
+        try:
+            os.symlink(os.path.join(rel_dir, hook_name), dst)
+        except FileExistsError:
+            logger.warning(f"Existing {hook_name} hook found, not overwriting")
 
     logger.debug("Installed git hooks")
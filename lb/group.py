@@ -6,7 +6,8 @@ from typing import Any, Dict, Optional, TYPE_CHECKING
 
 from .chain import Chain
 from .context_graph import ContextGraph
-from .fs import ensure_dir, atomic_write_json, read_json
+from .fastjson import dumps_pretty
+from .fs import ensure_dir, atomic_write_many, read_json
 
 if TYPE_CHECKING:
     from .wal import Transaction
@@ -33,15 +34,18 @@ class Group:
         Args:
             wal_tx: Optional WAL transaction for atomic multi-file writes.
                    If provided, writes are staged in the transaction.
-                   If None, writes are done directly (less durable).
+                   If None, both files are written as one batch: each is
+                   replaced atomically, but not both together.
         """
         ensure_dir(self.root)
         if wal_tx is not None:
             wal_tx.write_json(self.chain_path, self.chain.snapshot())
             wal_tx.write_json(self.graph_path, self.graph.snapshot())
         else:
-            atomic_write_json(self.chain_path, self.chain.snapshot())
-            atomic_write_json(self.graph_path, self.graph.snapshot())
+            atomic_write_many({
+                self.chain_path: dumps_pretty(self.chain.snapshot()),
+                self.graph_path: dumps_pretty(self.graph.snapshot()),
+            })
 
     @staticmethod
     def load(root: Path) -> "Group":
@@ -2,28 +2,27 @@ from __future__ import annotations
 
 import math
 import random
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from operator import mul
 from typing import List, Tuple
 
+# The helpers below keep the inner loops in C: sum(map(mul, a, b)) adds the
+# same products in the same order as a generator, without a Python frame
+# per element.
+
 
 def dot(a: List[float], b: List[float]) -> float:
-    return sum(x * y for x, y in zip(a, b))
+    return sum(map(mul, a, b))
 
 
 def matvec(M: List[List[float]], v: List[float]) -> List[float]:
-    return [dot(row, v) for row in M]
+    return [sum(map(mul, row, v)) for row in M]
 
 
 def matmul(A: List[List[float]], B: List[List[float]]) -> List[List[float]]:
-    # A (m x n) times B (n x p)
-    m, n, p = len(A), len(A[0]), len(B[0])
-    out = [[0.0] * p for _ in range(m)]
-    for i in range(m):
-        for k in range(n):
-            aik = A[i][k]
-            for j in range(p):
-                out[i][j] += aik * B[k][j]
-    return out
+    # A (m x n) times B (n x p), as row-by-column dot products
+    cols = list(zip(*B))
+    return [[sum(map(mul, row, col)) for col in cols] for row in A]
 
 
 def transpose(M: List[List[float]]) -> List[List[float]]:
@@ -31,7 +30,7 @@ def transpose(M: List[List[float]]) -> List[List[float]]:
 
 
 def norm(v: List[float]) -> float:
-    return math.sqrt(sum(x * x for x in v))
+    return math.sqrt(sum(map(mul, v, v)))
 
 
 def normalize(v: List[float]) -> List[float]:
@@ -61,12 +60,17 @@ def random_orthogonal(d: int, *, seed: int = 0) -> List[List[float]]:
 class Chart:
     name: str
     R: List[List[float]]  # orthogonal transform to local coords
+    _RT: List[List[float]] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # to_global is called on every update; transpose once, not per call
+        self._RT = transpose(self.R)
 
     def to_local(self, v_global: List[float]) -> List[float]:
         return matvec(self.R, v_global)
 
     def to_global(self, v_local: List[float]) -> List[float]:
-        return matvec(transpose(self.R), v_local)
+        return matvec(self._RT, v_local)
 
 
 def masked_update(v_local: List[float], *, lr: float, k: int) -> List[float]:
@@ -79,21 +83,17 @@ def masked_update(v_local: List[float], *, lr: float, k: int) -> List[float]:
 
 def holonomy_loop(v0: List[float], *, chart_a: Chart, chart_b: Chart, lr: float = 0.1, k: int = 4) -> Tuple[List[float], float]:
     """Apply an A->B->A loop of masked updates and return (v_final, defect_norm)."""
-    # A update
+    # A update; the direct path below starts from the same local coordinates
     va = chart_a.to_local(v0)
-    va2 = masked_update(va, lr=lr, k=k)
-    v1 = chart_a.to_global(va2)
+    v1 = chart_a.to_global(masked_update(va, lr=lr, k=k))
 
     # B update
     vb = chart_b.to_local(v1)
-    vb2 = masked_update(vb, lr=lr, k=k)
-    v2 = chart_b.to_global(vb2)
+    v2 = chart_b.to_global(masked_update(vb, lr=lr, k=k))
 
     # Back to A frame without update
     # compare to doing both updates in a single chart (path dependence)
-    va_direct = chart_a.to_local(v0)
-    va_direct2 = masked_update(masked_update(va_direct, lr=lr, k=k), lr=lr, k=k)
+    va_direct2 = masked_update(masked_update(va, lr=lr, k=k), lr=lr, k=k)
     v_direct = chart_a.to_global(va_direct2)
 
-    defect = [x - y for x, y in zip(v2, v_direct)]
-    return v2, norm(defect)
+    return v2, math.dist(v2, v_direct)
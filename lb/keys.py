@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-import base64
+import binascii
+import functools
 import logging
 import os
 import sys
@@ -13,13 +14,25 @@ from cryptography.hazmat.primitives.serialization import Encoding, PrivateFormat
 
 logger = logging.getLogger("lb.keys")
 
+# pybase64 (pip install learning-battery[speed]) decodes bulk payloads such as
+# artifact data several times faster; otherwise binascii is called directly,
+# skipping the argument handling of the base64 module wrappers. Both are
+# non-validating and raise ValueError subclasses on bad input.
+try:
+    from pybase64 import b64decode as _b64decode, b64encode as _b64encode
+except ImportError:
+    _b64decode = binascii.a2b_base64
+
+    def _b64encode(b: bytes) -> bytes:
+        return binascii.b2a_base64(b, newline=False)
+
 
 def b64e(b: bytes) -> str:
-    return base64.b64encode(b).decode("ascii")
+    return _b64encode(b).decode("ascii")
 
 
 def b64d(s: str) -> bytes:
-    return base64.b64decode(s.encode("ascii"))
+    return _b64decode(s)
 
 
 @dataclass(frozen=True)
@@ -29,11 +42,13 @@ class NodeKeys:
     enc_priv: X25519PrivateKey
     enc_pub: X25519PublicKey
 
-    @property
+    # Keys never change, so the encodings are computed once per instance.
+    # cached_property writes to the instance __dict__, which frozen allows.
+    @functools.cached_property
     def sign_pub_b64(self) -> str:
         return b64e(self.sign_pub.public_bytes(Encoding.Raw, PublicFormat.Raw))
 
-    @property
+    @functools.cached_property
     def enc_pub_b64(self) -> str:
         return b64e(self.enc_pub.public_bytes(Encoding.Raw, PublicFormat.Raw))
 
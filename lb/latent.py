@@ -26,30 +26,65 @@ to a real embedding model while maintaining the same interface.
 """
 from __future__ import annotations
 
+import functools
 import hashlib
 import math
 import re
+import struct
+from array import array
+from operator import mul
 from typing import List
 
 _WORD_RE = re.compile(r"[A-Za-z0-9_]+")
 
+# Token hashes supply one byte per dimension; 64 is BLAKE2b's largest digest
+MAX_DIM = 64
+
+# Byte sums are accumulated in 32-bit lanes of one Python int (SWAR): each
+# token's digest is spread into 4-byte little-endian lanes and the ints are
+# added, so the per-dimension work runs in C. A lane overflows only after
+# 2**32 / 255 (~16.8M) tokens in one text.
+_LANE_BYTES = 4
+_LANES = struct.Struct(f"<{MAX_DIM}I")
+
+
+# Distinct tokens whose lane-packed hash is remembered (~400 bytes each).
+# Word frequencies are Zipfian, so this covers most tokens of most texts.
+TOKEN_CACHE_SIZE = 16384
+
+
+def _spread(digest: bytes) -> int:
+    """Place each digest byte in its own 32-bit lane of an int."""
+    lanes = bytearray(MAX_DIM * _LANE_BYTES)
+    lanes[:len(digest) * _LANE_BYTES:_LANE_BYTES] = digest
+    return int.from_bytes(lanes, "little")
+
+
+@functools.lru_cache(maxsize=TOKEN_CACHE_SIZE)
+def _token_lanes(tok: str, dim: int) -> int:
+    """Lane-packed BLAKE2b digest of one token, dim bytes long."""
+    return _spread(hashlib.blake2b(tok.encode("utf-8"), digest_size=dim).digest())
+
 
 def _tokenize(text: str) -> List[str]:
+    if text.isascii():
+        # one lower() over the text instead of one per token; only safe for
+        # ASCII, since lowering e.g. U+212A (Kelvin sign) yields a word char
+        return _WORD_RE.findall(text.lower())
     return [t.lower() for t in _WORD_RE.findall(text)]
 
 
 def embed(text: str, dim: int = 64) -> List[float]:
+    if not 0 < dim <= MAX_DIM:
+        raise ValueError(f"dim must be between 1 and {MAX_DIM}")
     toks = _tokenize(text)
     if not toks:
         return [0.0] * dim
-    v = [0.0] * dim
-    for t in toks:
-        h1 = hashlib.sha256(t.encode("utf-8")).digest()
-        h2 = hashlib.sha256((t + "\x00").encode("utf-8")).digest()
-        b = h1 + h2  # 64 bytes
-        for i in range(dim):
-            # map byte to [-1, 1]
-            v[i] += (b[i] / 127.5) - 1.0
+    acc = sum(_token_lanes(t, dim) for t in toks)
+    sums = _LANES.unpack(acc.to_bytes(_LANES.size, "little"))
+    # each byte maps to [-1, 1]: sum(b / 127.5 - 1) = sum(b) / 127.5 - count
+    count = len(toks)
+    v = [s / 127.5 - count for s in sums[:dim]]
     # normalize
     n = math.sqrt(sum(x * x for x in v))
     if n == 0.0:
@@ -61,3 +96,33 @@ def cosine(a: List[float], b: List[float]) -> float:
     if len(a) != len(b):
         raise ValueError("dimension mismatch")
     return sum(x * y for x, y in zip(a, b))
+
+
+# Quantized embeddings: each component of a unit vector is stored as a signed
+# byte, round(x * 127). That is 1 byte per dimension instead of a float
+# object, and cosine over the rounded values stays within about 1% of the
+# float result.
+INT8_SCALE = 127
+
+
+def quantize(v: List[float]) -> bytes:
+    """Pack a unit vector as signed int8 components."""
+    return array("b", [round(x * INT8_SCALE) for x in v]).tobytes()
+
+
+def embed_int8(text: str, dim: int = 64) -> bytes:
+    """embed(), quantized to dim signed bytes."""
+    return quantize(embed(text, dim))
+
+
+def cosine_int8(a: bytes, b: bytes) -> float:
+    """Cosine similarity of two quantized embeddings."""
+    if len(a) != len(b):
+        raise ValueError("dimension mismatch")
+    va = memoryview(a).cast("b")
+    vb = memoryview(b).cast("b")
+    # integer dot products are exact; only the final division rounds
+    denom = math.sqrt(sum(map(mul, va, va)) * sum(map(mul, vb, vb)))
+    if denom == 0.0:
+        return 0.0
+    return sum(map(mul, va, vb)) / denom
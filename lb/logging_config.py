@@ -5,15 +5,18 @@ Supports both console and file output with JSON formatting option.
 """
 from __future__ import annotations
 
+import atexit
 import logging
 import logging.handlers
-import json
 import os
+import queue
 import sys
+import threading
 import time
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
+from . import fastjson
 
 # Log levels
 DEBUG = logging.DEBUG
@@ -28,9 +31,28 @@ DEFAULT_LOG_FORMAT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
 DEFAULT_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 LOG_DIR = os.environ.get("LB_LOG_DIR", "")
 
+# Console output buffer; records written in one burst leave in one write()
+CONSOLE_BUFFER_SIZE = 8192
+
 
 class JsonFormatter(logging.Formatter):
-    """JSON formatter for structured logging."""
+    """JSON formatter for structured logging.
+
+    The strftime part of the timestamp is cached per whole second, since
+    records logged in bursts mostly share it.
+    """
+
+    _time_cache: Tuple[int, Optional[str], str] = (-1, None, "")
+
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        sec = int(record.created)
+        cached_sec, cached_fmt, s = self._time_cache
+        if sec != cached_sec or datefmt != cached_fmt:
+            s = time.strftime(datefmt or self.default_time_format, self.converter(sec))
+            self._time_cache = (sec, datefmt, s)
+        if not datefmt and self.default_msec_format:
+            s = self.default_msec_format % (s, record.msecs)
+        return s
 
     def format(self, record: logging.LogRecord) -> str:
         log_entry = {
@@ -51,7 +73,112 @@ class JsonFormatter(logging.Formatter):
         if hasattr(record, "extra_data"):
             log_entry["data"] = record.extra_data
 
-        return json.dumps(log_entry, ensure_ascii=False, default=str)
+        return fastjson.dumps(log_entry, default=str).decode("utf-8")
+
+
+class SizeTrackingRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """RotatingFileHandler that counts what it writes instead of seeking.
+
+    The stock handler seeks to the end of the file before every record to
+    learn its size in bytes; this one stats the file when opened and after
+    each rollover, and adds up the encoded size of each record in between.
+    Rollover points match the stock handler's as long as this handler is
+    the file's only writer.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._size = self._file_size()
+        self._pending = ""
+
+    def _file_size(self) -> int:
+        try:
+            return os.path.getsize(self.baseFilename)
+        except OSError:
+            return 0
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if self.maxBytes <= 0:
+            return False
+        self._pending = self.format(record) + self.terminator
+        # file size in bytes plus record length in characters, the same
+        # comparison the stock handler makes
+        return self._size + len(self._pending) >= self.maxBytes
+
+    def doRollover(self) -> None:
+        super().doRollover()
+        self._size = self._file_size()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self._pending = ""
+        super().emit(record)
+        msg = self._pending
+        if msg and self.stream is not None:
+            if msg.isascii():
+                self._size += len(msg)
+            else:
+                self._size += len(msg.encode(self.stream.encoding, "replace"))
+
+
+class _DeferredFlushStreamHandler(logging.StreamHandler):
+    """StreamHandler that leaves flushing to the queue listener."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+class _CoalescingQueueListener(logging.handlers.QueueListener):
+    """QueueListener that flushes its handlers once the queue runs dry."""
+
+    def handle(self, record: logging.LogRecord) -> None:
+        super().handle(record)
+        if self.queue.empty():
+            for handler in self.handlers:
+                handler.flush()
+
+
+_console_queue: "queue.Queue[logging.LogRecord]" = queue.Queue()
+_console_listener: Optional[_CoalescingQueueListener] = None
+_console_lock = threading.Lock()
+
+
+def _console_stream():
+    """A buffered text stream on stderr's fd, or stderr itself if it has none."""
+    try:
+        fd = sys.stderr.fileno()
+    except (AttributeError, OSError, ValueError):
+        return sys.stderr
+    return open(
+        fd, "w", buffering=CONSOLE_BUFFER_SIZE, closefd=False,
+        encoding=getattr(sys.stderr, "encoding", None) or "utf-8", errors="backslashreplace",
+    )
+
+
+def _console_handler(formatter: logging.Formatter) -> logging.Handler:
+    """Handler that hands records to the shared console writer thread.
+
+    Records are formatted by the emitting thread (QueueHandler.prepare), so
+    loggers keep their own formats; the listener thread only writes them,
+    flushing once per burst instead of once per line. The listener is stopped
+    (draining the queue) at exit.
+    """
+    global _console_listener
+    with _console_lock:
+        if _console_listener is None:
+            target = _DeferredFlushStreamHandler(_console_stream())
+            _console_listener = _CoalescingQueueListener(
+                _console_queue, target, respect_handler_level=True
+            )
+            _console_listener.start()
+            atexit.register(_console_listener.stop)
+    handler = logging.handlers.QueueHandler(_console_queue)
+    handler.setFormatter(formatter)
+    return handler
 
 
 class ContextLogger(logging.LoggerAdapter):
@@ -103,9 +230,7 @@ def setup_logging(
 
     # Console handler
     if console:
-        console_handler = logging.StreamHandler(sys.stderr)
-        console_handler.setFormatter(formatter)
-        logger.addHandler(console_handler)
+        logger.addHandler(_console_handler(formatter))
 
     # File handler
     if log_file or LOG_DIR:
@@ -117,7 +242,7 @@ def setup_logging(
         file_path.parent.mkdir(parents=True, exist_ok=True)
 
         # Rotating file handler (10MB max, keep 5 backups)
-        file_handler = logging.handlers.RotatingFileHandler(
+        file_handler = SizeTrackingRotatingFileHandler(
             file_path,
             maxBytes=10 * 1024 * 1024,
             backupCount=5,
@@ -162,6 +287,8 @@ def log_operation(
         **kwargs: Additional context to log
     """
     level = INFO if success else ERROR
+    if not logger.isEnabledFor(level):
+        return
     status = "SUCCESS" if success else "FAILED"
 
     msg_parts = [f"{operation}: {status}"]
@@ -172,6 +299,8 @@ def log_operation(
     if duration_ms is not None:
         extra_data["duration_ms"] = duration_ms
 
+    # makeRecord + handle rather than logger.log: the record has no source
+    # location, so this skips logger.log's findCaller stack walk
     record = logger.makeRecord(
         logger.name,
         level,
@@ -180,8 +309,8 @@ def log_operation(
         " ".join(msg_parts),
         (),
         None,
+        extra={"extra_data": extra_data},
     )
-    record.extra_data = extra_data
     logger.handle(record)
 
 
@@ -47,14 +47,13 @@ The MCP interface is best suited for:
 from __future__ import annotations
 
 import asyncio
-import base64
-import json
 import os
 import sys
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
-from . import __version__
+from . import __version__, fastjson
+from .keys import b64e
 from .node import BatteryNode, NodeError
 from .logging_config import get_logger
 
@@ -92,14 +91,34 @@ def _require_int(params: Dict[str, Any], field: str) -> int:
         raise MCPParamError(field, "must be an integer")
 
 
+# Pre-encoded response envelopes, so only the id and payload go through
+# the JSON encoder
+_ID_PREFIX = b'{"id":'
+_OK_MID = b',"result":'
+_OK_SUFFIX = b',"error":null}\n'
+_ERR_MID = b',"result":null,"error":'
+_ERR_SUFFIX = b'}\n'
+
+
+def _send(data: bytes) -> None:
+    """Write one encoded response line, bypassing the text layer."""
+    out = getattr(sys.stdout, "buffer", None)
+    if out is None:
+        # stdout replaced by a text-only stream
+        sys.stdout.write(data.decode("utf-8"))
+        sys.stdout.flush()
+        return
+    out.write(data)
+    out.flush()
+
+
 def _ok(rid: Any, result: Any) -> None:
-    sys.stdout.write(json.dumps({"id": rid, "result": result, "error": None}, ensure_ascii=False) + "\n")
-    sys.stdout.flush()
+    _send(_ID_PREFIX + fastjson.dumps(rid) + _OK_MID + fastjson.dumps(result) + _OK_SUFFIX)
 
 
 def _err(rid: Any, code: str, message: str) -> None:
-    sys.stdout.write(json.dumps({"id": rid, "result": None, "error": {"code": code, "message": message}}, ensure_ascii=False) + "\n")
-    sys.stdout.flush()
+    error = fastjson.dumps({"code": code, "message": message})
+    _send(_ID_PREFIX + fastjson.dumps(rid) + _ERR_MID + error + _ERR_SUFFIX)
 
 
 def _detect_lbm_repo(working_dir: Optional[str] = None) -> Optional[Path]:
@@ -194,6 +213,244 @@ def _load_node_for_mcp(
     return node, None
 
 
+def _initialize(node: BatteryNode, config_info: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    response = {
+        "node_id": node.node_id,
+        "sign_pub": node.keys.sign_pub_b64,
+        "enc_pub": node.keys.enc_pub_b64,
+        "version": __version__,
+    }
+    # Include GitHub integration info if available
+    if config_info:
+        response["github_integration"] = {
+            "enabled": True,
+            "github_repo": config_info.get("github_repo"),
+            "group_id": config_info.get("group_id"),
+            "group_name": config_info.get("group_name"),
+            "agent_registered": config_info.get("agent_registered", False),
+        }
+    return response
+
+
+def _list_groups(node: BatteryNode, params: Dict[str, Any]) -> Dict[str, Any]:
+    gs = []
+    for gid, g in node.groups.items():
+        gs.append({"group_id": gid, "name": g.chain.state.policy.name, "currency": g.chain.state.policy.currency})
+    return {"groups": gs}
+
+
+def _publish_claim(node: BatteryNode, params: Dict[str, Any]) -> Dict[str, Any]:
+    gid = params["group_id"]
+    text = params["text"]
+    tags = list(params.get("tags", []))
+    parent_hash = params.get("parent_hash")  # Optional threading
+    h = node.publish_claim(gid, text, tags, parent_hash=parent_hash)
+    return {"claim_hash": h}
+
+
+def _retract_claim(node: BatteryNode, params: Dict[str, Any]) -> Dict[str, Any]:
+    node.retract_claim(params["group_id"], params["claim_hash"])
+    return {"ok": True}
+
+
+def _submit_experience(node: BatteryNode, params: Dict[str, Any]) -> Dict[str, Any]:
+    gid = params["group_id"]
+    exp = params.get("experience", {}) or {}
+    h = node.submit_experience(gid, exp)
+    return {"experience_hash": h}
+
+
+def _compile_context(node: BatteryNode, params: Dict[str, Any]) -> Dict[str, Any]:
+    gid = params["group_id"]
+    q = params["query"]
+    top_k = int(params.get("top_k", 8))
+    since_ms = params.get("since_ms")  # Optional time filter
+    if since_ms is not None:
+        since_ms = int(since_ms)
+    text, chosen = node.compile_context(gid, q, top_k=top_k, since_ms=since_ms)
+    return {"context": text, "claim_hashes": chosen}
+
+
+def _create_offer(node: BatteryNode, params: Dict[str, Any]) -> Dict[str, Any]:
+    gid = params["group_id"]
+    title = params["title"]
+    text = params["text"]
+    price = int(params["price"])
+    tags = list(params.get("tags", []))
+    host = str(params.get("announce_host", "127.0.0.1"))
+    port = int(params.get("announce_port", 0))
+    offer_id, package_hash = node.create_offer(gid, title=title, text=text, price=price, tags=tags, announce_host=host, announce_port=port)
+    return {"offer_id": offer_id, "package_hash": package_hash}
+
+
+def _list_offers(node: BatteryNode, params: Dict[str, Any]) -> Dict[str, Any]:
+    return {"offers": [o.to_dict() for o in node.list_offers()]}
+
+
+def _market_pull(node: BatteryNode, params: Dict[str, Any]) -> Dict[str, Any]:
+    host = params["host"]
+    port = int(params["port"])
+    n = asyncio.run(node.pull_market_offers_from_peer(host, port))
+    return {"imported": n}
+
+
+def _sync_group(node: BatteryNode, params: Dict[str, Any]) -> Dict[str, Any]:
+    host = params["host"]
+    port = int(params["port"])
+    gid = params["group_id"]
+    replaced = asyncio.run(node.sync_group_from_peer(host, port, gid))
+    return {"replaced": replaced}
+
+
+def _purchase_offer(node: BatteryNode, params: Dict[str, Any]) -> Dict[str, Any]:
+    host = params["host"]
+    port = int(params["port"])
+    offer_id = params["offer_id"]
+    package_hash, pt = asyncio.run(node.purchase_offer_from_peer(host=host, port=port, offer_id=offer_id))
+    # attempt to decode json package straight from the bytes
+    try:
+        pkg = fastjson.loads(pt)
+    except ValueError:  # invalid JSON or not UTF-8
+        pkg = {"raw_b64": b64e(pt)}
+    return {"package_hash": package_hash, "package": pkg}
+
+
+# ========== Task Management ==========
+
+def _create_task(node: BatteryNode, params: Dict[str, Any]) -> Dict[str, Any]:
+    gid = _require_str(params, "group_id")
+    task_id = _require_str(params, "task_id")
+    title = _require_str(params, "title")
+    description = params.get("description", "")
+    assignee = params.get("assignee")
+    due_ms = int(params["due_ms"]) if params.get("due_ms") else None
+    reward = int(params.get("reward", 0))
+    node.create_task(gid, task_id, title, description=description, assignee=assignee, due_ms=due_ms, reward=reward)
+    return {"task_id": task_id}
+
+
+def _assign_task(node: BatteryNode, params: Dict[str, Any]) -> Dict[str, Any]:
+    gid = _require_str(params, "group_id")
+    task_id = _require_str(params, "task_id")
+    assignee = _require_str(params, "assignee")
+    node.assign_task(gid, task_id, assignee)
+    return {"ok": True}
+
+
+def _start_task(node: BatteryNode, params: Dict[str, Any]) -> Dict[str, Any]:
+    gid = _require_str(params, "group_id")
+    task_id = _require_str(params, "task_id")
+    node.start_task(gid, task_id)
+    return {"ok": True}
+
+
+def _complete_task(node: BatteryNode, params: Dict[str, Any]) -> Dict[str, Any]:
+    gid = _require_str(params, "group_id")
+    task_id = _require_str(params, "task_id")
+    result_hash = params.get("result_hash")
+    node.complete_task(gid, task_id, result_hash=result_hash)
+    return {"ok": True}
+
+
+def _fail_task(node: BatteryNode, params: Dict[str, Any]) -> Dict[str, Any]:
+    gid = _require_str(params, "group_id")
+    task_id = _require_str(params, "task_id")
+    error_message = params.get("error_message", "")
+    node.fail_task(gid, task_id, error_message=error_message)
+    return {"ok": True}
+
+
+def _list_tasks(node: BatteryNode, params: Dict[str, Any]) -> Dict[str, Any]:
+    gid = _require_str(params, "group_id")
+    status = params.get("status")
+    assignee = params.get("assignee")
+    tasks = node.get_tasks(gid, status=status, assignee=assignee)
+    return {"tasks": tasks}
+
+
+# ========== Agent Presence ==========
+
+def _update_presence(node: BatteryNode, params: Dict[str, Any]) -> Dict[str, Any]:
+    gid = _require_str(params, "group_id")
+    status = params.get("status", "active")
+    metadata = params.get("metadata")
+    node.update_presence(gid, status, metadata=metadata)
+    return {"ok": True}
+
+
+def _get_presence(node: BatteryNode, params: Dict[str, Any]) -> Dict[str, Any]:
+    gid = _require_str(params, "group_id")
+    stale_threshold_ms = int(params.get("stale_threshold_ms", 300000))
+    presence = node.get_presence(gid, stale_threshold_ms=stale_threshold_ms)
+    return {"presence": presence}
+
+
+# ========== Time-Windowed Queries ==========
+
+def _get_recent_claims(node: BatteryNode, params: Dict[str, Any]) -> Dict[str, Any]:
+    gid = _require_str(params, "group_id")
+    since_ms = _require_int(params, "since_ms")
+    limit = int(params.get("limit", 100))
+    claims = node.get_recent_claims(gid, since_ms, limit=limit)
+    return {"claims": claims, "count": len(claims)}
+
+
+def _watch_claims(node: BatteryNode, params: Dict[str, Any]) -> Dict[str, Any]:
+    # Polling-based subscription: returns claims since cursor
+    gid = _require_str(params, "group_id")
+    last_seen_ms = _require_int(params, "last_seen_ms")
+    limit = int(params.get("limit", 50))
+    claims = node.get_recent_claims(gid, last_seen_ms, limit=limit)
+    # Return next cursor for pagination
+    next_cursor = max((c["created_ms"] for c in claims), default=last_seen_ms) + 1 if claims else last_seen_ms
+    return {"claims": claims, "next_cursor": next_cursor}
+
+
+def _get_group_state(node: BatteryNode, params: Dict[str, Any]) -> Dict[str, Any]:
+    gid = _require_str(params, "group_id")
+    g = node.groups.get(gid)
+    if not g:
+        raise NodeError(f"unknown group_id {gid}")
+    state = g.chain.state
+    return {
+        "group_id": gid,
+        "height": g.chain.head.height,
+        "head_block_id": g.chain.head.block_id,
+        "last_block_ts_ms": g.chain.head.ts_ms,
+        "member_count": len(state.members),
+        "task_count": len(state.tasks),
+        "presence_count": len(state.presence),
+        "total_supply": state.total_supply,
+    }
+
+
+# Method name -> handler. "initialize" is added per session in run_mcp
+# because it reports the session's GitHub integration info.
+_HANDLERS: Dict[str, Callable[[BatteryNode, Dict[str, Any]], Any]] = {
+    "list_groups": _list_groups,
+    "publish_claim": _publish_claim,
+    "retract_claim": _retract_claim,
+    "submit_experience": _submit_experience,
+    "compile_context": _compile_context,
+    "create_offer": _create_offer,
+    "list_offers": _list_offers,
+    "market_pull": _market_pull,
+    "sync_group": _sync_group,
+    "purchase_offer": _purchase_offer,
+    "create_task": _create_task,
+    "assign_task": _assign_task,
+    "start_task": _start_task,
+    "complete_task": _complete_task,
+    "fail_task": _fail_task,
+    "list_tasks": _list_tasks,
+    "update_presence": _update_presence,
+    "get_presence": _get_presence,
+    "get_recent_claims": _get_recent_claims,
+    "watch_claims": _watch_claims,
+    "get_group_state": _get_group_state,
+}
+
+
 def run_mcp(
     data_dir: str,
     working_dir: Optional[str] = None,
@@ -215,13 +472,16 @@ def run_mcp(
         agent_name = f"mcp-{os.getpid()}"
 
     node, config_info = _load_node_for_mcp(data_dir, working_dir, agent_name)
+    handlers = dict(_HANDLERS)
+    handlers["initialize"] = lambda node, params: _initialize(node, config_info)
 
-    for line in sys.stdin:
+    # Request lines are parsed straight from the byte stream
+    for line in getattr(sys.stdin, "buffer", sys.stdin):
         line = line.strip()
         if not line:
             continue
         try:
-            req = json.loads(line)
+            req = fastjson.loads(line)
         except Exception as e:
             _err(None, "bad_json", str(e))
             continue
@@ -230,185 +490,13 @@ def run_mcp(
         method = req.get("method")
         params = req.get("params") or {}
 
+        handler = handlers.get(method) if isinstance(method, str) else None
+        if handler is None:
+            _err(rid, "not_found", f"unknown method {method}")
+            continue
+
         try:
-            if method == "initialize":
-                response = {
-                    "node_id": node.node_id,
-                    "sign_pub": node.keys.sign_pub_b64,
-                    "enc_pub": node.keys.enc_pub_b64,
-                    "version": __version__,
-                }
-                # Include GitHub integration info if available
-                if config_info:
-                    response["github_integration"] = {
-                        "enabled": True,
-                        "github_repo": config_info.get("github_repo"),
-                        "group_id": config_info.get("group_id"),
-                        "group_name": config_info.get("group_name"),
-                        "agent_registered": config_info.get("agent_registered", False),
-                    }
-                _ok(rid, response)
-            elif method == "list_groups":
-                gs = []
-                for gid, g in node.groups.items():
-                    gs.append({"group_id": gid, "name": g.chain.state.policy.name, "currency": g.chain.state.policy.currency})
-                _ok(rid, {"groups": gs})
-            elif method == "publish_claim":
-                gid = params["group_id"]
-                text = params["text"]
-                tags = list(params.get("tags", []))
-                parent_hash = params.get("parent_hash")  # Optional threading
-                h = node.publish_claim(gid, text, tags, parent_hash=parent_hash)
-                _ok(rid, {"claim_hash": h})
-            elif method == "retract_claim":
-                node.retract_claim(params["group_id"], params["claim_hash"])
-                _ok(rid, {"ok": True})
-            elif method == "submit_experience":
-                gid = params["group_id"]
-                exp = params.get("experience", {}) or {}
-                h = node.submit_experience(gid, exp)
-                _ok(rid, {"experience_hash": h})
-            elif method == "compile_context":
-                gid = params["group_id"]
-                q = params["query"]
-                top_k = int(params.get("top_k", 8))
-                since_ms = params.get("since_ms")  # Optional time filter
-                if since_ms is not None:
-                    since_ms = int(since_ms)
-                text, chosen = node.compile_context(gid, q, top_k=top_k, since_ms=since_ms)
-                _ok(rid, {"context": text, "claim_hashes": chosen})
-            elif method == "create_offer":
-                gid = params["group_id"]
-                title = params["title"]
-                text = params["text"]
-                price = int(params["price"])
-                tags = list(params.get("tags", []))
-                host = str(params.get("announce_host", "127.0.0.1"))
-                port = int(params.get("announce_port", 0))
-                offer_id, package_hash = node.create_offer(gid, title=title, text=text, price=price, tags=tags, announce_host=host, announce_port=port)
-                _ok(rid, {"offer_id": offer_id, "package_hash": package_hash})
-            elif method == "list_offers":
-                _ok(rid, {"offers": [o.to_dict() for o in node.list_offers()]})
-            elif method == "market_pull":
-                host = params["host"]
-                port = int(params["port"])
-                n = asyncio.run(node.pull_market_offers_from_peer(host, port))
-                _ok(rid, {"imported": n})
-            elif method == "sync_group":
-                host = params["host"]
-                port = int(params["port"])
-                gid = params["group_id"]
-                replaced = asyncio.run(node.sync_group_from_peer(host, port, gid))
-                _ok(rid, {"replaced": replaced})
-            elif method == "purchase_offer":
-                host = params["host"]
-                port = int(params["port"])
-                offer_id = params["offer_id"]
-                package_hash, pt = asyncio.run(node.purchase_offer_from_peer(host=host, port=port, offer_id=offer_id))
-                # attempt to decode json package
-                try:
-                    pkg = json.loads(pt.decode("utf-8"))
-                except Exception:
-                    pkg = {"raw_b64": base64.b64encode(pt).decode("ascii")}
-                _ok(rid, {"package_hash": package_hash, "package": pkg})
-
-            # ========== Task Management ==========
-            elif method == "create_task":
-                gid = _require_str(params, "group_id")
-                task_id = _require_str(params, "task_id")
-                title = _require_str(params, "title")
-                description = params.get("description", "")
-                assignee = params.get("assignee")
-                due_ms = int(params["due_ms"]) if params.get("due_ms") else None
-                reward = int(params.get("reward", 0))
-                node.create_task(gid, task_id, title, description=description, assignee=assignee, due_ms=due_ms, reward=reward)
-                _ok(rid, {"task_id": task_id})
-
-            elif method == "assign_task":
-                gid = _require_str(params, "group_id")
-                task_id = _require_str(params, "task_id")
-                assignee = _require_str(params, "assignee")
-                node.assign_task(gid, task_id, assignee)
-                _ok(rid, {"ok": True})
-
-            elif method == "start_task":
-                gid = _require_str(params, "group_id")
-                task_id = _require_str(params, "task_id")
-                node.start_task(gid, task_id)
-                _ok(rid, {"ok": True})
-
-            elif method == "complete_task":
-                gid = _require_str(params, "group_id")
-                task_id = _require_str(params, "task_id")
-                result_hash = params.get("result_hash")
-                node.complete_task(gid, task_id, result_hash=result_hash)
-                _ok(rid, {"ok": True})
-
-            elif method == "fail_task":
-                gid = _require_str(params, "group_id")
-                task_id = _require_str(params, "task_id")
-                error_message = params.get("error_message", "")
-                node.fail_task(gid, task_id, error_message=error_message)
-                _ok(rid, {"ok": True})
-
-            elif method == "list_tasks":
-                gid = _require_str(params, "group_id")
-                status = params.get("status")
-                assignee = params.get("assignee")
-                tasks = node.get_tasks(gid, status=status, assignee=assignee)
-                _ok(rid, {"tasks": tasks})
-
-            # ========== Agent Presence ==========
-            elif method == "update_presence":
-                gid = _require_str(params, "group_id")
-                status = params.get("status", "active")
-                metadata = params.get("metadata")
-                node.update_presence(gid, status, metadata=metadata)
-                _ok(rid, {"ok": True})
-
-            elif method == "get_presence":
-                gid = _require_str(params, "group_id")
-                stale_threshold_ms = int(params.get("stale_threshold_ms", 300000))
-                presence = node.get_presence(gid, stale_threshold_ms=stale_threshold_ms)
-                _ok(rid, {"presence": presence})
-
-            # ========== Time-Windowed Queries ==========
-            elif method == "get_recent_claims":
-                gid = _require_str(params, "group_id")
-                since_ms = _require_int(params, "since_ms")
-                limit = int(params.get("limit", 100))
-                claims = node.get_recent_claims(gid, since_ms, limit=limit)
-                _ok(rid, {"claims": claims, "count": len(claims)})
-
-            elif method == "watch_claims":
-                # Polling-based subscription: returns claims since cursor
-                gid = _require_str(params, "group_id")
-                last_seen_ms = _require_int(params, "last_seen_ms")
-                limit = int(params.get("limit", 50))
-                claims = node.get_recent_claims(gid, last_seen_ms, limit=limit)
-                # Return next cursor for pagination
-                next_cursor = max((c["created_ms"] for c in claims), default=last_seen_ms) + 1 if claims else last_seen_ms
-                _ok(rid, {"claims": claims, "next_cursor": next_cursor})
-
-            elif method == "get_group_state":
-                gid = _require_str(params, "group_id")
-                g = node.groups.get(gid)
-                if not g:
-                    raise NodeError(f"unknown group_id {gid}")
-                state = g.chain.state
-                _ok(rid, {
-                    "group_id": gid,
-                    "height": g.chain.head.height,
-                    "head_block_id": g.chain.head.block_id,
-                    "last_block_ts_ms": g.chain.head.ts_ms,
-                    "member_count": len(state.members),
-                    "task_count": len(state.tasks),
-                    "presence_count": len(state.presence),
-                    "total_supply": state.total_supply,
-                })
-
-            else:
-                _err(rid, "not_found", f"unknown method {method}")
+            _ok(rid, handler(node, params))
         except MCPParamError as e:
             _err(rid, "bad_request", str(e))
         except KeyError as e:
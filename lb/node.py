@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import os
 import time
 import json
@@ -11,11 +12,11 @@ from typing import Any, Dict, List, Optional, Tuple
 
 from .keys import gen_node_keys, NodeKeys, dump_sign_priv_raw, dump_enc_priv_raw, b64e, b64d, ensure_mode_600, load_sign_priv_raw, load_enc_priv_raw
 from .fs import ensure_dir, atomic_write_json, read_json, atomic_write_bytes
-from .cas import CAS, CasMeta
+from .cas import CAS, CasMeta, is_object_name
 from .chain import Chain, Block, ChainError, Offer, TREASURY
 from .context_graph import ContextGraph
 from .group import Group
-from .canonical import sha256_hex, canonical_json
+from .canonical import sha256_hex, canonical_json_bytes, fast_hash_hex
 from .crypto import encrypt_package, decrypt_package, seal_to_x25519, open_from_x25519, CryptoError
 from .secure_channel import client_handshake, SecureSession
 from .wire import read_frame, write_frame
@@ -42,7 +43,7 @@ def _node_id_from_pub(sign_pub_b64: str) -> str:
     return sha256_hex(sign_pub_b64.encode("utf-8"))[:12]
 
 
-@dataclass
+@dataclass(slots=True)
 class OfferAnnouncement:
     offer_id: str
     group_id: str
@@ -579,17 +580,25 @@ class BatteryNode:
                 raise NodeError("empty snapshot")
             replaced = self.import_group_snapshot(snap)
 
-            # fetch referenced artifacts (claims + experiences)
+            # fetch referenced artifacts (claims + experiences), deduplicated
+            # on raw 32-byte digests rather than their hex strings
             g = self.groups[group_id]
-            artifact_hashes: List[str] = []
+            wanted: Dict[bytes, None] = {}
             for b in g.chain.blocks:
                 for tx in b.txs:
                     if tx.get("type") in ("claim", "experience"):
                         h = tx.get("artifact_hash")
-                        if isinstance(h, str):
-                            artifact_hashes.append(h)
-
-            for h in artifact_hashes:
+                        if not isinstance(h, str):
+                            continue
+                        # bytes.fromhex() would also accept uppercase hex and
+                        # whitespace; only canonical CAS names are fetched
+                        if is_object_name(h):
+                            wanted[bytes.fromhex(h)] = None
+                        else:
+                            logger.warning(f"Skipping malformed artifact hash {h[:16]}... in group {group_id}")
+
+            for digest in wanted:
+                h = digest.hex()
                 if self.cas.has(h):
                     continue
                 # fetch from peer
@@ -609,7 +618,7 @@ class BatteryNode:
                     continue
                 data = b64d(data_b64)
                 # integrity check
-                if sha256_hex(data) != h:
+                if hashlib.sha256(data).digest() != digest:
                     logger.error(f"Integrity check failed for artifact {h[:16]}... from {host}:{port}: hash mismatch")
                     continue
                 meta = CasMeta.from_dict(meta_d) if hasattr(CasMeta, "from_dict") else CasMeta(visibility=f"group:{group_id}", kind="artifact", group_id=group_id)
@@ -1007,8 +1016,11 @@ class BatteryNode:
             aad = f"offer|{group_id}|{title}".encode("utf-8")
             env_bytes, sym_key = encrypt_package(pkg_bytes, aad=aad)
             package_hash = self.cas.put(env_bytes, CasMeta(visibility="public", kind="package", group_id=group_id))
-            # deterministic offer id
-            offer_id = sha256_hex(f"{group_id}|{package_hash}|{self.keys.sign_pub_b64}|{_now_ms()}".encode("utf-8"))[:16]
+            # unique offer id; only ever compared, never recomputed by peers
+            offer_id = fast_hash_hex(
+                f"{group_id}|{package_hash}|{self.keys.sign_pub_b64}|{_now_ms()}".encode("utf-8"),
+                digest_size=8,
+            )
             offer = Offer(
                 offer_id=offer_id,
                 group_id=group_id,
@@ -1065,7 +1077,7 @@ class BatteryNode:
         }
         if offer.expires_ms is not None:
             body["expires_ms"] = int(offer.expires_ms)
-        sig = sign_detached(self.keys.sign_priv, canonical_json(body).encode("utf-8"))
+        sig = sign_detached(self.keys.sign_priv, canonical_json_bytes(body))
         return OfferAnnouncement(
             offer_id=offer.offer_id,
             group_id=offer.group_id,
@@ -1120,14 +1132,21 @@ class BatteryNode:
         for d in anns:
             try:
                 ann = OfferAnnouncement.from_dict(d)
-                body = ann.body()
+                ann_dict = ann.to_dict()
+                # Periodic market pulls mostly return announcements we already
+                # hold. An identical entry (same signature included) was
+                # verified when it was first accepted, so skip re-encoding and
+                # re-verifying it.
+                if self.offer_book.get(ann.offer_id) == ann_dict:
+                    n += 1
+                    continue
                 pub = load_sign_pub_raw(b64d(ann.seller_sign_pub))
-                if not verify_detached(pub, canonical_json(body).encode("utf-8"), b64d(ann.sig)):
+                if not verify_detached(pub, canonical_json_bytes(ann.body()), b64d(ann.sig)):
                     logger.debug(f"Rejected offer {ann.offer_id}: invalid signature")
                     rejected += 1
                     continue
                 # accept
-                accepted.append((ann.offer_id, ann.to_dict()))
+                accepted.append((ann.offer_id, ann_dict))
                 n += 1
             except Exception as e:
                 logger.debug(f"Failed to parse offer announcement: {type(e).__name__}: {e}")
@@ -1216,8 +1235,8 @@ class BatteryNode:
         if not ann_d:
             raise NodeError("unknown offer id in local offer book (run market-pull)")
         ann = OfferAnnouncement.from_dict(ann_d)
-        # Generate cryptographically strong nonce (full SHA256 = 64 hex chars = 256 bits)
-        nonce = sha256_hex(os.urandom(32))
+        # Cryptographically strong nonce: 256 random bits as 64 hex chars
+        nonce = os.urandom(32).hex()
         body = {
             "type": "purchase",
             "group_id": ann.group_id,
@@ -1229,7 +1248,7 @@ class BatteryNode:
             "ts_ms": _now_ms(),
         }
         from .keys import sign_detached
-        sig = sign_detached(self.keys.sign_priv, canonical_json(body).encode("utf-8"))
+        sig = sign_detached(self.keys.sign_priv, canonical_json_bytes(body))
         body["sig"] = b64e(sig)
         return body
 
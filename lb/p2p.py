@@ -96,7 +96,7 @@ class P2PServer:
     async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
         peer_addr = writer.get_extra_info("peername", ("unknown", 0))
         peer_ip = peer_addr[0] if isinstance(peer_addr, tuple) else str(peer_addr)
-        logger.debug(f"New connection from {peer_addr}")
+        logger.debug("New connection from %s", peer_addr)
 
         # Track connection
         async with self._connections_lock:
@@ -117,7 +117,7 @@ class P2PServer:
         try:
             conn_result = await rate_limiter.check_connection(peer_ip)
         except Exception as e:
-            logger.warning(f"Rate limiter error for {peer_ip}: {e}")
+            logger.warning("Rate limiter error for %s: %s", peer_ip, e)
             try:
                 writer.close()
                 await writer.wait_closed()
@@ -126,7 +126,7 @@ class P2PServer:
             return
 
         if not conn_result.allowed:
-            logger.warning(f"Connection rejected from {peer_ip}: {conn_result.reason}")
+            logger.warning("Connection rejected from %s: %s", peer_ip, conn_result.reason)
             try:
                 writer.close()
                 await writer.wait_closed()
@@ -160,13 +160,13 @@ class P2PServer:
                     # Read with idle timeout
                     env = await asyncio.wait_for(read_frame(reader), timeout=idle_timeout)
                 except asyncio.TimeoutError:
-                    logger.debug(f"Client {peer_sign[:16]}... idle timeout ({idle_timeout}s)")
+                    logger.debug("Client %.16s... idle timeout (%ss)", peer_sign, idle_timeout)
                     break
                 except asyncio.IncompleteReadError:
-                    logger.debug(f"Client {peer_sign[:16]}... disconnected (incomplete read)")
+                    logger.debug("Client %.16s... disconnected (incomplete read)", peer_sign)
                     break
                 except ConnectionResetError:
-                    logger.debug(f"Client {peer_sign[:16]}... connection reset")
+                    logger.debug("Client %.16s... connection reset", peer_sign)
                     break
                 except Exception as e:
                     logger.warning(f"Error reading from {peer_sign[:16]}...: {type(e).__name__}: {e}")
@@ -180,7 +180,7 @@ class P2PServer:
                 # Rate limit: check request rate per peer
                 req_result = await rate_limiter.check_request(peer_sign)
                 if not req_result.allowed:
-                    logger.warning(f"Request rate limit exceeded for {peer_sign[:16]}...: {req_result.reason}")
+                    logger.warning("Request rate limit exceeded for %.16s...: %s", peer_sign, req_result.reason)
                     resp = {"id": req.get("id"), "result": None, "error": _err("rate_limited", req_result.reason)}
                     try:
                         await write_frame(writer, session.seal(resp))
@@ -378,7 +378,7 @@ class P2PServer:
                 try:
                     await write_frame(writer, session.seal(resp))
                 except BrokenPipeError:
-                    logger.debug(f"Client {peer_sign[:16]}... connection broken (write)")
+                    logger.debug("Client %.16s... connection broken (write)", peer_sign)
                     break
                 except Exception as e:
                     logger.warning(f"Error writing to {peer_sign[:16]}...: {type(e).__name__}: {e}")
@@ -394,12 +394,12 @@ class P2PServer:
 
             # Close connection
             log_id = peer_sign[:16] if peer_sign else peer_ip
-            logger.debug(f"Closing connection to {log_id}...")
+            logger.debug("Closing connection to %s...", log_id)
             try:
                 writer.close()
                 await writer.wait_closed()
             except Exception as e:
-                logger.debug(f"Error closing connection to {log_id}: {e}")
+                logger.debug("Error closing connection to %s: %s", log_id, e)
 
 
 async def rpc_call(host: str, port: int, node: BatteryNode, method: str, params: Optional[Dict[str, Any]] = None, *, req_id: int = 1) -> Dict[str, Any]:
@@ -420,7 +420,7 @@ async def rpc_call(host: str, port: int, node: BatteryNode, method: str, params:
         RPCError: If the RPC call fails
         ConnectionError: If connection fails
     """
-    logger.debug(f"RPC call to {host}:{port} method={method}")
+    logger.debug("RPC call to %s:%s method=%s", host, port, method)
     try:
         reader, writer = await asyncio.open_connection(host, port)
     except OSError as e:
@@ -437,7 +437,7 @@ async def rpc_call(host: str, port: int, node: BatteryNode, method: str, params:
             err = resp["error"]
             logger.warning(f"RPC error from {host}:{port}: {err.get('code')}: {err.get('message')}")
             raise RPCError(err.get("code", "error"), err.get("message", "error"))
-        logger.debug(f"RPC call to {host}:{port} method={method} succeeded")
+        logger.debug("RPC call to %s:%s method=%s succeeded", host, port, method)
         return resp.get("result") or {}
     except RPCError:
         raise
@@ -449,4 +449,4 @@ async def rpc_call(host: str, port: int, node: BatteryNode, method: str, params:
             writer.close()
             await writer.wait_closed()
         except Exception as e:
-            logger.debug(f"Error closing connection to {host}:{port}: {e}")
+            logger.debug("Error closing connection to %s:%s: %s", host, port, e)
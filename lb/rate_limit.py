@@ -5,11 +5,11 @@ Includes memory bounds to prevent DoS via key exhaustion.
 """
 from __future__ import annotations
 
+import functools
 import time
-import asyncio
-from collections import OrderedDict
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Optional
 
 from .config import get_config
 from .logging_config import get_p2p_logger
@@ -21,7 +21,7 @@ DEFAULT_MAX_TRACKED_KEYS = 10000  # Maximum unique keys to track
 DEFAULT_MAX_TRACKED_IPS = 1000   # Maximum unique IPs for connection limiting
 
 
-@dataclass
+@dataclass(slots=True)
 class RateLimitResult:
     """Result of a rate limit check."""
     allowed: bool
@@ -34,6 +34,12 @@ class SlidingWindowRateLimiter:
 
     Tracks requests within a time window and limits to max_requests.
     Uses LRU eviction when max_keys is reached to prevent memory exhaustion.
+
+    Timestamps come from a monotonic clock and are only ever appended, so
+    each per-key deque stays sorted and expiry pops from the left.
+
+    No method awaits while touching shared state, so calls are atomic with
+    respect to other coroutines on the event loop and need no lock.
     """
 
     def __init__(self, window_seconds: float, max_requests: int, *, max_keys: int = DEFAULT_MAX_TRACKED_KEYS):
@@ -41,9 +47,8 @@ class SlidingWindowRateLimiter:
         self.max_requests = max_requests
         self.max_keys = max_keys
         # Use OrderedDict for LRU eviction - most recently used keys at end
-        self._requests: OrderedDict[str, List[float]] = OrderedDict()
-        self._lock = asyncio.Lock()
-        self._last_cleanup = time.time()
+        self._requests: OrderedDict[str, Deque[float]] = OrderedDict()
+        self._last_cleanup = time.monotonic()
         self._cleanup_interval = 60.0  # Auto-cleanup every 60 seconds
 
     async def check(self, key: str) -> RateLimitResult:
@@ -55,122 +60,108 @@ class SlidingWindowRateLimiter:
         Returns:
             RateLimitResult with allowed status and wait time if blocked
         """
-        async with self._lock:
-            now = time.time()
-            cutoff = now - self.window_seconds
-
-            # Periodic auto-cleanup to prevent memory buildup
-            if now - self._last_cleanup > self._cleanup_interval:
-                self._cleanup_expired_unlocked(now, cutoff)
-
-            # Get or create entry, moving to end (most recently used)
-            if key in self._requests:
-                self._requests.move_to_end(key)
-                timestamps = self._requests[key]
-            else:
-                # Check if we need to evict old entries
-                if len(self._requests) >= self.max_keys:
-                    self._evict_oldest_unlocked(cutoff)
-                timestamps = []
-                self._requests[key] = timestamps
-
+        now = time.monotonic()
+        cutoff = now - self.window_seconds
+
+        # Periodic auto-cleanup to prevent memory buildup
+        if now - self._last_cleanup > self._cleanup_interval:
+            self._cleanup_expired_unlocked(now, cutoff)
+
+        requests = self._requests
+        timestamps = requests.get(key)
+        new_key = timestamps is None
+        if new_key:
+            timestamps = deque()
+        else:
             # Remove expired entries for this key
-            timestamps[:] = [ts for ts in timestamps if ts > cutoff]
-
-            if len(timestamps) >= self.max_requests:
-                # Calculate wait time
-                oldest = timestamps[0] if timestamps else now
-                wait_seconds = oldest + self.window_seconds - now
-                return RateLimitResult(
-                    allowed=False,
-                    wait_seconds=max(0, wait_seconds),
-                    reason=f"rate limit exceeded: {len(timestamps)}/{self.max_requests} requests in {self.window_seconds}s"
-                )
-
-            # Allow and record
-            timestamps.append(now)
-            return RateLimitResult(allowed=True)
-
-    def _evict_oldest_unlocked(self, cutoff: float) -> int:
-        """Evict oldest entries to make room. Must hold lock."""
-        evicted = 0
+            while timestamps and timestamps[0] <= cutoff:
+                timestamps.popleft()
+
+        if len(timestamps) >= self.max_requests:
+            # Calculate wait time
+            oldest = timestamps[0] if timestamps else now
+            wait_seconds = oldest + self.window_seconds - now
+            return RateLimitResult(
+                allowed=False,
+                wait_seconds=max(0, wait_seconds),
+                reason=f"rate limit exceeded: {len(timestamps)}/{self.max_requests} requests in {self.window_seconds}s"
+            )
+
+        # Allow and record. Only allowed requests move a key to the end, so
+        # keys stay ordered by their newest timestamp and fully expired keys
+        # are always at the front.
+        if new_key:
+            # Check if we need to evict old entries
+            if len(requests) >= self.max_keys:
+                self._evict_oldest_unlocked()
+            requests[key] = timestamps
+        else:
+            requests.move_to_end(key)
+        timestamps.append(now)
+        return RateLimitResult(allowed=True)
+
+    def _evict_oldest_unlocked(self) -> int:
+        """Evict the keys with the oldest requests to make room. Called synchronously from check().
+
+        Keys are ordered by their newest timestamp (see check()), so fully
+        expired keys are evicted before any key with a live request.
+        """
         # Evict up to 10% of max_keys or at least 1
-        to_evict = max(1, self.max_keys // 10)
-
-        keys_to_remove = []
-        for key, timestamps in self._requests.items():
-            if evicted >= to_evict:
-                break
-            # First try to remove completely expired keys
-            active = [ts for ts in timestamps if ts > cutoff]
-            if not active:
-                keys_to_remove.append(key)
-                evicted += 1
-
-        # If we didn't find enough expired keys, evict LRU (oldest accessed)
-        if evicted < to_evict:
-            for key in self._requests.keys():
-                if evicted >= to_evict:
-                    break
-                if key not in keys_to_remove:
-                    keys_to_remove.append(key)
-                    evicted += 1
-
-        for key in keys_to_remove:
-            del self._requests[key]
+        to_evict = min(max(1, self.max_keys // 10), len(self._requests))
+        for _ in range(to_evict):
+            self._requests.popitem(last=False)
 
-        if evicted > 0:
-            logger.debug(f"Rate limiter evicted {evicted} keys (memory bounds)")
+        if to_evict > 0:
+            logger.debug("Rate limiter evicted %d keys (memory bounds)", to_evict)
 
-        return evicted
+        return to_evict
 
     def _cleanup_expired_unlocked(self, now: float, cutoff: float) -> int:
-        """Remove all expired entries. Must hold lock."""
+        """Remove fully expired keys. Called synchronously from check()/cleanup().
+
+        Expired keys sit at the front (see check()), so this stops at the first live key instead of visiting every key.
+        Stale timestamps of live keys are dropped by their next check().
+        """
         self._last_cleanup = now
         removed = 0
-        empty_keys = []
-
-        for key, timestamps in self._requests.items():
-            before = len(timestamps)
-            timestamps[:] = [ts for ts in timestamps if ts > cutoff]
-            removed += before - len(timestamps)
-            if not timestamps:
-                empty_keys.append(key)
 
-        for key in empty_keys:
-            del self._requests[key]
+        requests = self._requests
+        while requests:
+            timestamps = requests[next(iter(requests))]
+            if timestamps and timestamps[-1] > cutoff:
+                break
+            removed += len(timestamps)
+            requests.popitem(last=False)
 
         return removed
 
     async def cleanup(self) -> int:
-        """Remove expired entries from all keys. Returns count removed."""
-        async with self._lock:
-            now = time.time()
-            cutoff = now - self.window_seconds
-            return self._cleanup_expired_unlocked(now, cutoff)
+        """Remove keys whose entries have all expired. Returns count removed."""
+        now = time.monotonic()
+        cutoff = now - self.window_seconds
+        return self._cleanup_expired_unlocked(now, cutoff)
 
     async def stats(self) -> Dict[str, int]:
         """Get rate limiter statistics."""
-        async with self._lock:
-            total_timestamps = sum(len(ts) for ts in self._requests.values())
-            return {
-                "tracked_keys": len(self._requests),
-                "max_keys": self.max_keys,
-                "total_timestamps": total_timestamps,
-            }
+        total_timestamps = sum(len(ts) for ts in self._requests.values())
+        return {
+            "tracked_keys": len(self._requests),
+            "max_keys": self.max_keys,
+            "total_timestamps": total_timestamps,
+        }
 
 
 class ConnectionLimiter:
     """Limits concurrent connections per IP address.
 
     Includes memory bounds to prevent tracking unlimited IPs.
+    Like SlidingWindowRateLimiter, it never awaits and so needs no lock.
     """
 
     def __init__(self, max_per_ip: int, *, max_ips: int = DEFAULT_MAX_TRACKED_IPS):
         self.max_per_ip = max_per_ip
         self.max_ips = max_ips
         self._connections: Dict[str, int] = {}
-        self._lock = asyncio.Lock()
 
     async def acquire(self, ip: str) -> bool:
         """Try to acquire a connection slot for the IP.
@@ -181,64 +172,69 @@ class ConnectionLimiter:
         Returns:
             True if connection allowed, False if limit reached
         """
-        async with self._lock:
-            current = self._connections.get(ip, 0)
-            if current >= self.max_per_ip:
-                return False
-
-            # Check memory bounds - only for new IPs
-            if ip not in self._connections and len(self._connections) >= self.max_ips:
-                # Evict IPs with 0 connections (shouldn't exist, but safety check)
-                to_remove = [k for k, v in self._connections.items() if v <= 0]
-                for k in to_remove:
-                    del self._connections[k]
-
-                # If still at limit, reject new IP
-                if len(self._connections) >= self.max_ips:
-                    logger.warning(f"Connection limiter at max IPs ({self.max_ips}), rejecting new IP {ip}")
-                    return False
-
-            self._connections[ip] = current + 1
-            return True
+        connections = self._connections
+        current = connections.get(ip, 0)
+        if current >= self.max_per_ip:
+            return False
+
+        # Check memory bounds - only for new IPs. release() deletes an IP as
+        # soon as its count reaches zero, so every tracked IP is in use and
+        # there is nothing to evict.
+        if current == 0 and len(connections) >= self.max_ips:
+            logger.warning("Connection limiter at max IPs (%d), rejecting new IP %s", self.max_ips, ip)
+            return False
+
+        connections[ip] = current + 1
+        return True
 
     async def release(self, ip: str) -> None:
         """Release a connection slot for the IP. Safe to call multiple times."""
-        async with self._lock:
-            if ip in self._connections:
-                self._connections[ip] -= 1
-                if self._connections[ip] <= 0:
-                    del self._connections[ip]
+        current = self._connections.get(ip)
+        if current is None:
+            return
+        if current <= 1:
+            del self._connections[ip]
+        else:
+            self._connections[ip] = current - 1
 
     async def get_count(self, ip: str) -> int:
         """Get current connection count for IP."""
-        async with self._lock:
-            return self._connections.get(ip, 0)
+        return self._connections.get(ip, 0)
 
     async def stats(self) -> Dict[str, int]:
         """Get connection limiter statistics."""
-        async with self._lock:
-            total_connections = sum(self._connections.values())
-            return {
-                "tracked_ips": len(self._connections),
-                "max_ips": self.max_ips,
-                "total_connections": total_connections,
-            }
+        total_connections = sum(self._connections.values())
+        return {
+            "tracked_ips": len(self._connections),
+            "max_ips": self.max_ips,
+            "total_connections": total_connections,
+        }
 
 
 @dataclass
 class P2PRateLimiter:
-    """Combined rate limiter for P2P operations."""
+    """Combined rate limiter for P2P operations.
+
+    Limiters not passed in are built from a single read of the P2P config.
+    """
 
     # Connection limiting
-    connection_limiter: ConnectionLimiter = field(default_factory=lambda: ConnectionLimiter(
-        max_per_ip=get_config().p2p.max_connections_per_ip
-    ))
+    connection_limiter: Optional[ConnectionLimiter] = None
 
     # Request rate limiting (per connection/peer)
-    request_limiter: SlidingWindowRateLimiter = field(default_factory=lambda: SlidingWindowRateLimiter(
-        window_seconds=60.0,
-        max_requests=get_config().p2p.max_requests_per_minute
-    ))
+    request_limiter: Optional[SlidingWindowRateLimiter] = None
+
+    def __post_init__(self) -> None:
+        if self.connection_limiter is not None and self.request_limiter is not None:
+            return
+        p2p = get_config().p2p
+        if self.connection_limiter is None:
+            self.connection_limiter = ConnectionLimiter(max_per_ip=p2p.max_connections_per_ip)
+        if self.request_limiter is None:
+            self.request_limiter = SlidingWindowRateLimiter(
+                window_seconds=60.0,
+                max_requests=p2p.max_requests_per_minute
+            )
 
     async def check_connection(self, ip: str) -> RateLimitResult:
         """Check if a new connection is allowed from this IP."""
@@ -262,27 +258,14 @@ class P2PRateLimiter:
         return await self.request_limiter.cleanup()
 
 
-# Global rate limiter instance with thread-safe initialization
-_rate_limiter: Optional[P2PRateLimiter] = None
-_rate_limiter_lock = asyncio.Lock()
-import threading
-_rate_limiter_thread_lock = threading.Lock()
-
-
+# Global rate limiter instance, built on first use so it picks up the
+# current config
+@functools.lru_cache(maxsize=1)
 def get_rate_limiter() -> P2PRateLimiter:
-    """Get the global rate limiter instance (thread-safe)."""
-    global _rate_limiter
-    if _rate_limiter is not None:
-        return _rate_limiter
-    # Thread-safe initialization
-    with _rate_limiter_thread_lock:
-        if _rate_limiter is None:
-            _rate_limiter = P2PRateLimiter()
-        return _rate_limiter
+    """Get the global rate limiter instance."""
+    return P2PRateLimiter()
 
 
 def reset_rate_limiter() -> None:
-    """Reset the global rate limiter (thread-safe)."""
-    global _rate_limiter
-    with _rate_limiter_thread_lock:
-        _rate_limiter = None
+    """Reset the global rate limiter."""
+    get_rate_limiter.cache_clear()
@@ -22,7 +22,7 @@ def _now_ms() -> int:
     return int(time.time() * 1000)
 
 
-@dataclass
+@dataclass(slots=True)
 class Peer:
     """Registered peer node."""
     host: str
@@ -4,13 +4,13 @@ import asyncio
 import json
 import os
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, Dict, Tuple
 
 from cryptography.hazmat.primitives.asymmetric.x25519 import X25519PrivateKey, X25519PublicKey
 
-from .canonical import canonical_json, sha256_hex
-from .crypto import hkdf_sha256, aead_encrypt, aead_decrypt, CryptoError
+from .canonical import canonical_json_bytes, sha256_hex
+from .crypto import hkdf_sha256, aead_cipher, CryptoError
 from .keys import NodeKeys, b64e, b64d, verify_detached, sign_detached, load_sign_pub_raw
 
 from .wire import read_frame, write_frame
@@ -62,6 +62,13 @@ class SecureSession:
     nonce_prefix_recv: bytes
     send_ctr: int = 0
     recv_ctr: int = 0
+    # Ciphers keyed once per session rather than once per message
+    _send_aead: Any = field(init=False, repr=False, compare=False)
+    _recv_aead: Any = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._send_aead = aead_cipher(self.send_key)
+        self._recv_aead = aead_cipher(self.recv_key)
 
     def seal(self, obj: Dict[str, Any]) -> bytes:
         pt = json.dumps(obj, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
@@ -69,7 +76,7 @@ class SecureSession:
         self.send_ctr += 1
         nonce = self.nonce_prefix_send + ctr.to_bytes(8, "big")
         aad = (PROTO + "|").encode("utf-8") + ctr.to_bytes(8, "big")
-        ct = aead_encrypt(self.send_key, nonce, pt, aad=aad)
+        ct = self._send_aead.encrypt(nonce, pt, aad)
         env = {"ctr": ctr, "ct": b64e(ct)}
         return json.dumps(env, sort_keys=True, separators=(",", ":")).encode("utf-8")
 
@@ -84,13 +91,13 @@ class SecureSession:
         ct = b64d(env.get("ct", ""))
         nonce = self.nonce_prefix_recv + ctr.to_bytes(8, "big")
         aad = (PROTO + "|").encode("utf-8") + ctr.to_bytes(8, "big")
-        pt = aead_decrypt(self.recv_key, nonce, ct, aad=aad)
+        pt = self._recv_aead.decrypt(nonce, ct, aad)
         return json.loads(pt.decode("utf-8"))
 
 
 def _sign_json(keys: NodeKeys, msg: Dict[str, Any]) -> Dict[str, Any]:
     m = dict(msg)
-    sig = sign_detached(keys.sign_priv, canonical_json(m).encode("utf-8"))
+    sig = sign_detached(keys.sign_priv, canonical_json_bytes(m))
     m["sig"] = b64e(sig)
     return m
 
@@ -110,7 +117,7 @@ def _verify_signed(msg: Dict[str, Any]) -> Tuple[str, str]:
         raise HandshakeError(f"bad sign_pub: {e}")
     body = dict(msg)
     body.pop("sig", None)
-    ok = verify_detached(pub, canonical_json(body).encode("utf-8"), b64d(sig_b64))
+    ok = verify_detached(pub, canonical_json_bytes(body), b64d(sig_b64))
     if not ok:
         raise HandshakeError("bad signature")
     return sign_pub_b64, enc_pub_b64
@@ -10,10 +10,22 @@ import pytest
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from lb.admin import AdminServer
+from lb.admin import AdminServer, _cors_header, _parse_query
+from lb.keys import gen_node_keys
 from lb.node import BatteryNode
 
 
+async def _http_request(port: int, raw: bytes) -> bytes:
+    """Send a raw HTTP request to a local admin server and return the response."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(raw)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    await writer.wait_closed()
+    return response
+
+
 class TestAdminServer:
     """Tests for the admin panel server."""
 
@@ -47,6 +59,21 @@ class TestAdminServer:
             assert "enc_pub" in data
             assert "version" in data
 
+    @pytest.mark.asyncio
+    async def test_admin_api_node_cache_invalidation(self):
+        """Test /api/node reuses its body until group/offer counts change."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            node = BatteryNode.init(Path(tmpdir))
+            server = AdminServer(node)
+
+            _, _, body1 = await server._handle_api_node("GET", {})
+            _, _, body2 = await server._handle_api_node("GET", {})
+            assert body1 is body2
+
+            node.create_group("test:cache")
+            _, _, body3 = await server._handle_api_node("GET", {})
+            assert json.loads(body3)["groups_count"] == json.loads(body1)["groups_count"] + 1
+
     @pytest.mark.asyncio
     async def test_admin_api_groups(self):
         """Test the /api/groups endpoint."""
@@ -63,6 +90,44 @@ class TestAdminServer:
             assert "groups" in data
             assert len(data["groups"]) == 1
             assert data["groups"][0]["name"] == "test:admin"
+            assert data["groups"][0]["group_id_short"] == gid[:12] + "..."
+
+    @pytest.mark.asyncio
+    async def test_admin_api_pagination(self):
+        """Test offset/limit pagination on list endpoints."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            node = BatteryNode.init(Path(tmpdir))
+            gids = [node.create_group(f"test:page{i}") for i in range(3)]
+            for i in range(5):
+                node.publish_claim(gids[0], f"claim {i}", [])
+
+            server = AdminServer(node)
+
+            _, _, body = await server._handle_api_groups("GET", {"offset": "1", "limit": "1"})
+            data = json.loads(body)
+            assert data["total"] == 3
+            assert data["offset"] == 1
+            assert data["limit"] == 1
+            assert [g["group_id"] for g in data["groups"]] == [gids[1]]
+
+            _, _, body = await server._handle_api_claims(
+                "GET", {"group_id": gids[0], "offset": "3", "limit": "10"}
+            )
+            data = json.loads(body)
+            assert data["total"] == 5
+            assert [c["text"] for c in data["claims"]] == ["claim 3", "claim 4"]
+
+            # Limit is capped
+            _, _, body = await server._handle_api_offers("GET", {"limit": "100000"})
+            data = json.loads(body)
+            assert data["limit"] == 500
+            assert data["total"] == 0
+
+            # Invalid values are rejected
+            status, _, _ = await server._handle_api_groups("GET", {"offset": "-1"})
+            assert status == 400
+            status, _, _ = await server._handle_api_groups("GET", {"limit": "abc"})
+            assert status == 400
 
     @pytest.mark.asyncio
     async def test_admin_api_group_detail(self):
@@ -70,19 +135,24 @@ class TestAdminServer:
         with tempfile.TemporaryDirectory() as tmpdir:
             node = BatteryNode.init(Path(tmpdir))
             gid = node.create_group("test:detail")
+            member_pub = gen_node_keys().sign_pub_b64
+            node.add_member(gid, member_pub)
 
             server = AdminServer(node)
 
             # Test with valid group
-            status, content_type, body = await server._handle_api_group_detail("GET", {"id": [gid]})
+            status, content_type, body = await server._handle_api_group_detail("GET", {"id": gid})
             assert status == 200
             data = json.loads(body.decode())
             assert data["group_id"] == gid
             assert data["name"] == "test:detail"
             assert "members" in data
+            roles = {m["pub_full"]: m["role"] for m in data["members"]}
+            assert roles == {node.keys.sign_pub_b64: "admin", member_pub: "member"}
+            assert data["members"][0]["pub"] == node.keys.sign_pub_b64[:16] + "..."
 
             # Test with invalid group
-            status, _, body = await server._handle_api_group_detail("GET", {"id": ["invalid"]})
+            status, _, body = await server._handle_api_group_detail("GET", {"id": "invalid"})
             assert status == 404
 
     @pytest.mark.asyncio
@@ -94,13 +164,23 @@ class TestAdminServer:
             node.publish_claim(gid, "Test claim content", ["test", "admin"])
 
             server = AdminServer(node)
-            status, content_type, body = await server._handle_api_claims("GET", {"group_id": [gid]})
+            status, content_type, body = await server._handle_api_claims("GET", {"group_id": gid})
 
             assert status == 200
             data = json.loads(body.decode())
             assert "claims" in data
             assert len(data["claims"]) == 1
             assert "Test claim" in data["claims"][0]["text"]
+            assert data["claims"][0]["tags"] == ["test", "admin"]
+
+            # Long texts are truncated for the table but kept in full
+            long_text = "x" * 300
+            h = node.publish_claim(gid, long_text, [])
+            _, _, body = await server._handle_api_claims("GET", {"group_id": gid})
+            row = next(c for c in json.loads(body)["claims"] if c["hash_full"] == h)
+            assert row["text"] == "x" * 200 + "..."
+            assert row["text_full"] == long_text
+            assert row["retracted"] is False
 
     @pytest.mark.asyncio
     async def test_admin_api_peers(self):
@@ -141,6 +221,25 @@ class TestAdminServer:
             data = json.loads(body.decode())
             assert "offers" in data
 
+    @pytest.mark.asyncio
+    async def test_admin_api_dashboard(self):
+        """Test /api/dashboard bundles the individual endpoint bodies."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            node = BatteryNode.init(Path(tmpdir))
+            node.create_group("test:dashboard")
+
+            server = AdminServer(node)
+            status, content_type, body = await server._handle_api_dashboard("GET", {})
+
+            assert status == 200
+            assert "application/json" in content_type
+            data = json.loads(body)
+            assert set(data) == {"node", "groups", "peers", "offers", "subscriptions"}
+            _, _, groups_body = await server._handle_api_groups("GET", {})
+            assert data["groups"] == json.loads(groups_body)
+            assert data["groups"]["groups"][0]["name"] == "test:dashboard"
+            assert data["node"]["groups_count"] == 1
+
     @pytest.mark.asyncio
     async def test_admin_dashboard_html(self):
         """Test the dashboard HTML is returned."""
@@ -158,6 +257,237 @@ class TestAdminServer:
             assert "Admin Panel" in html
             assert "nav-tab" in html
 
+    def test_admin_check_auth(self):
+        """Test HTTP Basic Authentication header checking."""
+        import base64
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            node = BatteryNode.init(Path(tmpdir))
+
+            # Auth disabled accepts anything
+            assert AdminServer(node)._check_auth(None)
+
+            server = AdminServer(node, auth_password="s3cret")
+            good = "Basic " + base64.b64encode(b"admin:s3cret").decode()
+            wrong_pw = "Basic " + base64.b64encode(b"admin:nope").decode()
+            wrong_user = "Basic " + base64.b64encode(b"root:s3cret").decode()
+
+            assert server._check_auth(good)
+            assert not server._check_auth(None)
+            assert not server._check_auth("")
+            assert not server._check_auth(wrong_pw)
+            assert not server._check_auth(wrong_user)
+            assert not server._check_auth("Bearer token")
+            assert not server._check_auth("Basic \u00e9\u00e9")
+
+    def test_admin_cors_header(self):
+        """Test CORS is only granted to localhost origins."""
+        assert _cors_header("http://localhost") == b"Access-Control-Allow-Origin: http://localhost\r\n"
+        assert _cors_header("https://127.0.0.1:8443").startswith(b"Access-Control-Allow-Origin:")
+        assert _cors_header(None) == b""
+        assert _cors_header("") == b""
+        assert _cors_header("http://localhost.evil.com") == b""
+        assert _cors_header("http://evil.com") == b""
+        assert _cors_header("null") == b""
+
+    def test_admin_parse_query(self):
+        """Test query string parsing for admin API params."""
+        assert _parse_query(b"") == {}
+        assert _parse_query(b"id=abc123") == {"id": "abc123"}
+        assert _parse_query(b"group_id=g1&id=x") == {"group_id": "g1", "id": "x"}
+        # First value wins, bare keys are ignored
+        assert _parse_query(b"id=a&id=b&flag") == {"id": "a"}
+        # Percent/plus escapes are decoded
+        assert _parse_query(b"id=a%2Fb+c") == {"id": "a/b c"}
+
+    @pytest.mark.asyncio
+    async def test_admin_http_roundtrip(self):
+        """Test full HTTP requests against a running admin server."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            node = BatteryNode.init(Path(tmpdir))
+            server = AdminServer(node)
+            await server.start("127.0.0.1", 0)
+            port = server._server.sockets[0].getsockname()[1]
+            try:
+                resp = await _http_request(
+                    port,
+                    b"GET /api/node HTTP/1.1\r\nHost: x\r\n"
+                    b"Origin: http://localhost:8080\r\n\r\n",
+                )
+                head, _, body = resp.partition(b"\r\n\r\n")
+                assert head.startswith(b"HTTP/1.1 200")
+                assert b"Access-Control-Allow-Origin: http://localhost:8080" in head
+                assert json.loads(body)["node_id"] == node.node_id
+
+                resp = await _http_request(port, b"GET /nope HTTP/1.1\r\n\r\n")
+                assert resp.startswith(b"HTTP/1.1 404")
+
+                gid = node.create_group("test:http")
+                node.publish_claim(gid, "over the wire", [])
+                resp = await _http_request(
+                    port, b"GET /api/claims?group_id=" + gid.encode() + b"&limit=5 HTTP/1.1\r\n\r\n"
+                )
+                head, _, body = resp.partition(b"\r\n\r\n")
+                assert head.startswith(b"HTTP/1.1 200")
+                data = json.loads(body)
+                assert data["limit"] == 5
+                assert data["claims"][0]["text"] == "over the wire"
+
+                # Oversized request heads are rejected
+                big = b"GET / HTTP/1.1\r\nX-Pad: " + b"a" * 20000 + b"\r\n\r\n"
+                resp = await _http_request(port, big)
+                assert resp.startswith(b"HTTP/1.1 431")
+
+                # Bare LF line endings are accepted
+                resp = await _http_request(port, b"GET /api/node HTTP/1.1\nOrigin: http://localhost\n\n")
+                assert resp.startswith(b"HTTP/1.1 200")
+                assert b"Access-Control-Allow-Origin: http://localhost\r\n" in resp
+
+                # A LF inside a header value ends the header instead of being
+                # reflected, and values with other control characters are dropped
+                for raw in (
+                    b"GET /api/node HTTP/1.1\r\nOrigin: http://localhost\nSet-Cookie: x=1\r\n\r\n",
+                    b"GET /api/node HTTP/1.1\r\nOrigin: http://localhost:1\rSet-Cookie: x=1\r\n\r\n",
+                ):
+                    resp = await _http_request(port, raw)
+                    head = resp.partition(b"\r\n\r\n")[0]
+                    assert head.startswith(b"HTTP/1.1 200")
+                    assert b"Set-Cookie" not in head
+            finally:
+                await server.stop()
+
+    @pytest.mark.asyncio
+    async def test_admin_http_keep_alive_and_cache(self):
+        """Test keep-alive connections and the short-lived list response cache."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            node = BatteryNode.init(Path(tmpdir))
+            server = AdminServer(node)
+            await server.start("127.0.0.1", 0)
+            port = server._server.sockets[0].getsockname()[1]
+            try:
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                bodies = []
+                for _ in range(2):
+                    writer.write(b"GET /api/groups HTTP/1.1\r\nConnection: keep-alive\r\n\r\n")
+                    head = await reader.readuntil(b"\r\n\r\n")
+                    assert head.startswith(b"HTTP/1.1 200")
+                    assert b"Connection: keep-alive" in head
+                    assert b"Cache-Control: private, max-age=2" in head
+                    length = int(head.split(b"Content-Length: ")[1].split(b"\r\n")[0])
+                    bodies.append(await reader.readexactly(length))
+                    # A group created now is hidden until the cached entry expires
+                    node.create_group("test:cached")
+                assert bodies[0] == bodies[1]
+                writer.close()
+                await writer.wait_closed()
+
+                server._response_cache.clear()
+                resp = await _http_request(port, b"GET /api/groups HTTP/1.1\r\n\r\n")
+                head, _, body = resp.partition(b"\r\n\r\n")
+                assert b"Connection: close" in head
+                assert json.loads(body)["total"] == 2
+            finally:
+                await server.stop()
+
+    @pytest.mark.asyncio
+    async def test_admin_http_leading_empty_lines(self):
+        """Test that empty lines before a request line are ignored."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            node = BatteryNode.init(Path(tmpdir))
+            server = AdminServer(node)
+            await server.start("127.0.0.1", 0)
+            port = server._server.sockets[0].getsockname()[1]
+            try:
+                resp = await _http_request(port, b"\r\nGET /api/node HTTP/1.1\r\n\r\n")
+                assert resp.startswith(b"HTTP/1.1 200")
+
+                # A stray CRLF between keep-alive requests
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                for prefix in (b"", b"\r\n"):
+                    writer.write(prefix + b"GET /api/node HTTP/1.1\r\nConnection: keep-alive\r\n\r\n")
+                    head = await reader.readuntil(b"\r\n\r\n")
+                    assert head.startswith(b"HTTP/1.1 200")
+                    length = int(head.split(b"Content-Length: ")[1].split(b"\r\n")[0])
+                    await reader.readexactly(length)
+                writer.close()
+                await writer.wait_closed()
+
+                # An empty head still gets an answer
+                class _Writer:
+                    def __init__(self):
+                        self.data = b""
+
+                    def write(self, data):
+                        self.data += data
+
+                    def writelines(self, chunks):
+                        self.data += b"".join(chunks)
+
+                    async def drain(self):
+                        pass
+
+                w = _Writer()
+                assert await server._handle_request([], w) is False
+                assert w.data.startswith(b"HTTP/1.1 400")
+            finally:
+                await server.stop()
+
+    @pytest.mark.asyncio
+    async def test_admin_http_busy(self):
+        """Test that requests are rejected once the handler backlog is full."""
+        from lb import admin
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            node = BatteryNode.init(Path(tmpdir))
+            server = AdminServer(node)
+            await server.start("127.0.0.1", 0)
+            port = server._server.sockets[0].getsockname()[1]
+            try:
+                # Simulate every slot taken and a full wait queue
+                server._handler_sem = asyncio.Semaphore(0)
+                server._handlers_waiting = admin.MAX_PENDING_HANDLERS
+                resp = await _http_request(port, b"GET /api/node HTTP/1.1\r\n\r\n")
+                assert resp.startswith(b"HTTP/1.1 503")
+
+                server._handler_sem = asyncio.Semaphore(admin.MAX_CONCURRENT_HANDLERS)
+                server._handlers_waiting = 0
+                resp = await _http_request(port, b"GET /api/node HTTP/1.1\r\n\r\n")
+                assert resp.startswith(b"HTTP/1.1 200")
+            finally:
+                await server.stop()
+
+    @pytest.mark.asyncio
+    async def test_admin_http_requires_auth(self):
+        """Test that a password-protected server rejects missing credentials."""
+        import base64
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            node = BatteryNode.init(Path(tmpdir))
+            server = AdminServer(node, auth_password="pw")
+            await server.start("127.0.0.1", 0)
+            port = server._server.sockets[0].getsockname()[1]
+            try:
+                resp = await _http_request(port, b"GET /api/node HTTP/1.1\r\n\r\n")
+                assert resp.startswith(b"HTTP/1.1 401")
+
+                creds = base64.b64encode(b"admin:pw")
+                resp = await _http_request(
+                    port,
+                    b"GET /api/node HTTP/1.1\r\nAuthorization: Basic " + creds + b"\r\n\r\n",
+                )
+                assert resp.startswith(b"HTTP/1.1 200")
+
+                # Header names are case-insensitive
+                resp = await _http_request(
+                    port,
+                    b"GET /api/node HTTP/1.1\r\nORIGIN: http://127.0.0.1\r\n"
+                    b"authorization:Basic " + creds + b"\r\n\r\n",
+                )
+                assert resp.startswith(b"HTTP/1.1 200")
+                assert b"Access-Control-Allow-Origin: http://127.0.0.1\r\n" in resp
+            finally:
+                await server.stop()
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
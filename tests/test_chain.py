@@ -288,6 +288,49 @@ class TestBlockSizeValidation:
         with pytest.raises(ChainError, match="too many transactions"):
             chain.append(block)
 
+    def test_encoded_size_matches_serialization(self, chain, creator_keys):
+        """Test that the size derived from header bytes equals the full encoding."""
+        from lb.canonical import canonical_json
+
+        txs = [
+            {"type": "mint", "to": creator_keys.sign_pub_b64, "amount": 1, "ts_ms": int(time.time() * 1000)},
+            {"type": "claim", "artifact_hash": "ü\"\\\n" * 3, "ts_ms": 1},
+        ]
+        block = Block.make(
+            chain.state.group_id,
+            chain.head.height + 1,
+            chain.head.block_id,
+            author_priv=creator_keys.sign_priv,
+            author_pub_b64=creator_keys.sign_pub_b64,
+            txs=txs
+        )
+        header_bytes = block.verify_sig()
+        expected = len(canonical_json(block.to_dict()).encode("utf-8"))
+        assert block.encoded_size(header_bytes) == expected
+        assert block.encoded_size() == expected
+
+        # Escaped characters in block_id/sig are accounted for too
+        block.block_id = 'x"\u00e9'
+        block.sig = "\\"
+        assert block.encoded_size() == len(canonical_json(block.to_dict()).encode("utf-8"))
+
+    def test_oversized_block_fails(self, chain, creator_keys, monkeypatch):
+        """Test that blocks over the configured byte limit are rejected."""
+        from lb.config import get_config
+
+        monkeypatch.setattr(get_config().chain, "max_block_size_bytes", 600)
+        tx = {"type": "mint", "to": creator_keys.sign_pub_b64, "amount": 1, "ts_ms": int(time.time() * 1000)}
+        block = Block.make(
+            chain.state.group_id,
+            chain.head.height + 1,
+            chain.head.block_id,
+            author_priv=creator_keys.sign_priv,
+            author_pub_b64=creator_keys.sign_pub_b64,
+            txs=[tx] * 5
+        )
+        with pytest.raises(ChainError, match="block too large"):
+            chain.append(block)
+
 
 class TestForkResolution:
     """Tests for fork resolution logic (snapshot/restore)."""
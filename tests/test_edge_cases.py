@@ -630,6 +630,74 @@ class TestContextGraphEdgeCases:
         assert graph.claims["child"].parent_hash == "nonexistent"
 
 
+class TestLatentEmbedEdgeCases:
+    """Test hash-embedding edge cases."""
+
+    @staticmethod
+    def _reference(text, dim):
+        """Per-dimension float loop the accumulated embedding must match."""
+        import hashlib
+        import math
+        from lb.latent import _tokenize
+
+        v = [0.0] * dim
+        for t in _tokenize(text):
+            b = hashlib.blake2b(t.encode("utf-8"), digest_size=dim).digest()
+            for i in range(dim):
+                v[i] += (b[i] / 127.5) - 1.0
+        n = math.sqrt(sum(x * x for x in v))
+        return [x / n for x in v]
+
+    @pytest.mark.parametrize("dim", [1, 16, 64])
+    def test_embed_matches_reference(self, dim):
+        from lb.latent import embed
+
+        text = "Capture the compiler invocation; capture it TWICE."
+        got = embed(text, dim)
+        assert len(got) == dim
+        assert got == pytest.approx(self._reference(text, dim), abs=1e-12)
+        assert sum(x * x for x in got) == pytest.approx(1.0)
+
+    @pytest.mark.parametrize("text", [
+        "Mixed CASE words_and_123 numbers",
+        "non-ascii \u212a\u0130 stays out of tokens",
+    ])
+    def test_tokenize_lowercases_ascii_words(self, text):
+        import re
+        from lb.latent import _tokenize
+
+        assert _tokenize(text) == [t.lower() for t in re.findall(r"[A-Za-z0-9_]+", text)]
+
+    def test_embed_empty_and_bad_dim(self):
+        from lb.latent import embed
+
+        assert embed("!!! ---", 8) == [0.0] * 8
+        with pytest.raises(ValueError):
+            embed("text", 65)
+        with pytest.raises(ValueError):
+            embed("text", 0)
+
+    def test_int8_cosine_close_to_float(self):
+        from lb.latent import cosine, cosine_int8, embed, embed_int8
+
+        texts = [
+            "deploy the cache layer before the api",
+            "the api layer needs a cache",
+            "unrelated words about gardening tomatoes",
+        ]
+        for a in texts:
+            qa = embed_int8(a)
+            assert len(qa) == 64
+            assert cosine_int8(qa, qa) == pytest.approx(1.0)
+            for b in texts:
+                exact = cosine(embed(a), embed(b))
+                assert cosine_int8(qa, embed_int8(b)) == pytest.approx(exact, abs=0.01)
+
+        assert cosine_int8(embed_int8(""), embed_int8("text")) == 0.0
+        with pytest.raises(ValueError):
+            cosine_int8(embed_int8("a", 8), embed_int8("a", 16))
+
+
 # =============================================================================
 # Node Method Edge Cases
 # =============================================================================
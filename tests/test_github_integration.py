@@ -3,11 +3,14 @@
 Tests git hooks, GitHub discovery, LBM config management,
 and MCP auto-detection of .lbm/ directories.
 """
+import asyncio
+import base64
 import json
 import os
 import shutil
 import subprocess
 import tempfile
+import time
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
@@ -28,7 +31,7 @@ from lb.github_discovery import (
 from lb.github_integration import (
     LBMConfig, GitHubIntegrationError,
     is_lbm_initialized, load_lbm_config, save_lbm_config,
-    get_or_create_node, github_status
+    get_or_create_node, github_status, github_sync, _install_git_hooks
 )
 from lb.mcp import _detect_lbm_repo, _load_node_for_mcp
 
@@ -160,10 +163,63 @@ class TestGitHooks:
             # Should reference lb command
             assert "lb" in content
 
+    @pytest.mark.skipif(shutil.which("bash") is None, reason="hooks are bash scripts")
+    def test_post_commit_hook_arguments(self, git_repo, tmp_path):
+        """The post-commit hook passes the commit message and changed files."""
+        args_file = tmp_path / "args"
+        fake_lb = tmp_path / "bin" / "lb"
+        fake_lb.parent.mkdir()
+        fake_lb.write_text(f'#!/bin/bash\nprintf "%s\\n" "$@" > {args_file}\n')
+        fake_lb.chmod(0o755)
+
+        (git_repo / "a.txt").write_text("a")
+        (git_repo / "sub").mkdir()
+        (git_repo / "sub" / "b.txt").write_text("b")
+        subprocess.run(["git", "add", "."], cwd=git_repo, check=True)
+        subprocess.run(["git", "commit", "-qm", "Subject\n\nBody text"], cwd=git_repo, check=True)
+
+        env = dict(os.environ, PATH=f"{fake_lb.parent}{os.pathsep}{os.environ['PATH']}")
+        hook = tmp_path / "post-commit"
+        hook.write_text(HOOK_TEMPLATES["post-commit"])
+        subprocess.run(["bash", str(hook)], cwd=git_repo, env=env, check=True)
+        for _ in range(100):
+            if args_file.exists() and args_file.read_text().endswith("\n"):
+                break
+            time.sleep(0.05)
+
+        args = args_file.read_text().split("\n")
+        assert args[:3] == ["github", "sync", "--commit"]
+        files_at = args.index("--files")
+        assert "\n".join(args[3:files_at]) == "Subject\n\nBody text"
+        assert args[files_at + 1] == "a.txt,sub/b.txt,"
+
+    def test_init_hook_install(self, git_repo):
+        """Init-time install replaces its own symlinks but keeps user hooks."""
+        git_hooks = git_repo / ".git" / "hooks"
+        git_hooks.mkdir(exist_ok=True)
+        (git_hooks / "post-checkout").write_text("#!/bin/sh\necho mine\n")
+        (git_hooks / "post-commit").symlink_to("missing-target")
+
+        _install_git_hooks(git_repo)
+        _install_git_hooks(git_repo)
+
+        assert (git_hooks / "post-checkout").read_text() == "#!/bin/sh\necho mine\n"
+        commit_hook = git_hooks / "post-commit"
+        assert commit_hook.is_symlink()
+        assert commit_hook.read_text() == HOOK_TEMPLATES["post-commit"]
+        for hook_name in DEFAULT_HOOKS:
+            lbm_hook = git_repo / ".lbm" / "hooks" / hook_name
+            assert os.stat(lbm_hook).st_mode & 0o777 == 0o755
+
 
 class TestGitHubDiscovery:
     """Tests for GitHub API discovery (mocked)."""
 
+    @pytest.fixture(autouse=True)
+    def isolated_cache(self, tmp_path, monkeypatch):
+        """Keep the response cache out of the real home directory."""
+        monkeypatch.setenv("LBM_GITHUB_CACHE_DIR", str(tmp_path / "github"))
+
     def test_parse_repo_format(self):
         """Test parsing owner/repo format."""
         discovery = GitHubDiscovery("owner/repo")
@@ -209,6 +265,96 @@ class TestGitHubDiscovery:
         assert collaborators[1].can_push
         assert not collaborators[1].is_admin
 
+    @patch('lb.github_discovery.urllib.request.urlopen')
+    def test_get_collaborators_paginated(self, mock_urlopen):
+        """Test all pages are fetched when the Link header names a last page."""
+        import urllib.parse
+
+        base = "https://api.github.com/repos/owner/repo/collaborators"
+
+        def respond(req, timeout=None):
+            query = urllib.parse.parse_qs(urllib.parse.urlparse(req.full_url).query)
+            assert query["per_page"] == ["100"]
+            page = int(query.get("page", ["1"])[0])
+            resp = MagicMock()
+            resp.read.return_value = json.dumps([
+                {"login": f"user{page}-{i}", "id": page * 1000 + i, "permissions": {"push": True}}
+                for i in range(100 if page < 3 else 5)
+            ]).encode()
+            resp.headers = {"Link": f'<{base}?per_page=100&page=2>; rel="next", <{base}?per_page=100&page=3>; rel="last"'}
+            resp.__enter__ = lambda s: s
+            resp.__exit__ = lambda s, *args: None
+            return resp
+
+        mock_urlopen.side_effect = respond
+
+        collaborators = GitHubDiscovery("owner/repo", token="test-token").get_collaborators()
+
+        assert mock_urlopen.call_count == 3
+        assert len(collaborators) == 205
+        assert collaborators[0].user.login == "user1-0"
+        assert collaborators[-1].user.login == "user3-4"
+
+
+    @patch('lb.github_discovery.urllib.request.urlopen')
+    def test_etag_revalidation(self, mock_urlopen):
+        """Test a cached response is sent with If-None-Match and reused on 304."""
+        import urllib.error
+
+        sent_etags = []
+
+        def respond(req, timeout=None):
+            sent_etags.append(req.get_header("If-none-match"))
+            if len(sent_etags) > 1:
+                raise urllib.error.HTTPError(req.full_url, 304, "Not Modified", {}, None)
+            resp = MagicMock()
+            resp.read.return_value = json.dumps({"full_name": "owner/repo", "private": False}).encode()
+            resp.headers = {"ETag": 'W/"abc"'}
+            resp.__enter__ = lambda s: s
+            resp.__exit__ = lambda s, *args: None
+            return resp
+
+        mock_urlopen.side_effect = respond
+
+        discovery = GitHubDiscovery("owner/repo", token="test-token")
+        first = discovery.get_repo_info()
+        second = GitHubDiscovery("owner/repo", token="test-token").get_repo_info()
+
+        assert first == second == {"full_name": "owner/repo", "private": False}
+        assert sent_etags == [None, 'W/"abc"']
+        # A different token does not see another token's cache entry
+        assert GitHubDiscovery("owner/repo", token="other")._load_cached(
+            "https://api.github.com/repos/owner/repo") is None
+
+    @patch('lb.github_discovery.urllib.request.urlopen')
+    def test_no_disk_cache_by_default(self, mock_urlopen, tmp_path, monkeypatch):
+        """Test responses are not written to disk unless a cache dir is set."""
+        monkeypatch.delenv("LBM_GITHUB_CACHE_DIR")
+        monkeypatch.setenv("HOME", str(tmp_path / "home"))
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+
+        sent_etags = []
+
+        def respond(req, timeout=None):
+            sent_etags.append(req.get_header("If-none-match"))
+            resp = MagicMock()
+            resp.read.return_value = json.dumps({"full_name": "owner/repo", "private": True}).encode()
+            resp.headers = {"ETag": 'W/"abc"'}
+            resp.__enter__ = lambda s: s
+            resp.__exit__ = lambda s, *args: None
+            return resp
+
+        mock_urlopen.side_effect = respond
+
+        discovery = GitHubDiscovery("owner/repo", token="test-token")
+        assert discovery.cache_dir is None
+        discovery.get_repo_info()
+        GitHubDiscovery("owner/repo", token="test-token").get_repo_info()
+
+        assert sent_etags == [None, None]
+        assert not (tmp_path / "home").exists()
+        assert not (tmp_path / "xdg").exists()
+
 
 class TestLBMPeers:
     """Tests for peer management."""
@@ -233,6 +379,12 @@ class TestLBMPeers:
         # Check file exists
         peers_file = repo_with_lbm / ".lbm" / "peers.json"
         assert peers_file.exists()
+        # Compact, one peer per line, field order kept, trailing newline
+        lines = peers_file.read_text().split("\n")
+        assert lines[0] == '{"peers":['
+        assert lines[1] == '{"github_user":"alice","sign_pub":"pubkey1","enc_pub":"enckey1"},'
+        assert lines[2].startswith('{"github_user":"bob",')
+        assert lines[3:] == ["]}", ""]
 
         # Load back
         loaded = load_peers_from_repo(repo_with_lbm)
@@ -244,6 +396,12 @@ class TestLBMPeers:
         assert loaded[1].host == "192.168.1.1"
         assert loaded[1].port == 7337
 
+    def test_save_no_peers(self, repo_with_lbm):
+        """An empty peer list round-trips."""
+        save_peers_to_repo(repo_with_lbm, [])
+        assert json.loads((repo_with_lbm / ".lbm" / "peers.json").read_text()) == {"peers": []}
+        assert load_peers_from_repo(repo_with_lbm) == []
+
     def test_load_peers_no_file(self, repo_with_lbm):
         """Test loading peers when file doesn't exist."""
         peers = load_peers_from_repo(repo_with_lbm)
@@ -286,6 +444,29 @@ class TestGetGitRemoteRepo:
         result = get_git_remote_repo(git_repo_with_remote)
         assert result is None
 
+    def test_config_read_matches_git(self, git_repo_with_remote):
+        """The in-process config reader agrees with git, without spawning it."""
+        for args in (
+            ["remote", "add", "upstream", "https://github.com/other/fork.git"],
+            ["remote", "add", "origin", "https://github.com/owner/first.git"],
+            ["config", "--add", "remote.origin.url", "git@github.com:owner/repo.git"],
+        ):
+            subprocess.run(["git", *args], cwd=git_repo_with_remote, check=True)
+
+        with patch("subprocess.run") as run:
+            assert get_git_remote_repo(git_repo_with_remote) == "owner/repo"
+        run.assert_not_called()
+
+    def test_subdirectory_falls_back_to_git(self, git_repo_with_remote):
+        """Paths without their own .git/config are resolved by git."""
+        subprocess.run(
+            ["git", "remote", "add", "origin", "https://github.com/owner/repo"],
+            cwd=git_repo_with_remote
+        )
+        sub = git_repo_with_remote / "src"
+        sub.mkdir()
+        assert get_git_remote_repo(sub) == "owner/repo"
+
 
 class TestLBMConfig:
     """Tests for LBM configuration."""
@@ -314,6 +495,23 @@ class TestLBMConfig:
         assert restored.sync_on_commit == config.sync_on_commit
         assert restored.agent_auto_register == config.agent_auto_register
 
+    @pytest.mark.parametrize("relay_url", ["wss://relay.example.com", None])
+    def test_to_dict_covers_all_fields(self, relay_url):
+        """to_dict lists every field in declaration order, minus a None relay."""
+        from dataclasses import fields
+
+        config = LBMConfig(
+            group_id="g", group_name="n", created_by="github:a",
+            created_at="2024-01-15T00:00:00Z", github_repo="o/r",
+            relay_url=relay_url,
+        )
+        expected = [f.name for f in fields(LBMConfig)]
+        if relay_url is None:
+            expected.remove("relay_url")
+        data = config.to_dict()
+        assert list(data) == expected
+        assert LBMConfig.from_dict(data) == config
+
     def test_save_load_config(self):
         """Test saving and loading config to file."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -341,6 +539,15 @@ class TestLBMConfig:
             with pytest.raises(GitHubIntegrationError, match="not initialized"):
                 load_lbm_config(Path(tmpdir))
 
+    def test_invalid_config_is_not_uninitialized(self, tmp_path):
+        """A corrupt config raises instead of reading as 'not initialized'."""
+        (tmp_path / ".lbm").mkdir()
+        (tmp_path / ".lbm" / "config.json").write_text('{"group_id": "g"}')
+        with pytest.raises(GitHubIntegrationError, match="Invalid LBM config"):
+            github_status(tmp_path)
+        with pytest.raises(GitHubIntegrationError, match="Invalid LBM config"):
+            github_sync(tmp_path)
+
 
 class TestGitHubStatus:
     """Tests for github_status function."""
@@ -371,17 +578,72 @@ class TestGitHubStatus:
             from lb.node import BatteryNode
             BatteryNode.init(node_path)
 
-            # Save peers
-            peers = [LBMPeer(github_user="alice", sign_pub="pubkey1")]
+            # Save peers, including this node itself
+            node = BatteryNode.load(node_path)
+            peers = [
+                LBMPeer(github_user="alice", sign_pub="pubkey1"),
+                LBMPeer(github_user="me", sign_pub=node.keys.sign_pub_b64, host="h", port=1),
+            ]
             save_peers_to_repo(repo_path, peers)
 
             status = github_status(repo_path)
 
             assert status["initialized"]
+            assert status["my_identity"] == "me"
+            assert [p["is_self"] for p in status["peers"]] == [False, True]
+            assert status["peers"][1]["has_address"]
             assert status["github_repo"] == "owner/repo"
             assert status["group_name"] == "test-project"
             assert status["group_id"] == "group123"
-            assert len(status["peers"]) == 1
+            assert len(status["peers"]) == 2
+
+
+class TestGitHubSync:
+    """Tests for github_sync."""
+
+    def test_peers_synced_concurrently(self, tmp_path):
+        """Peers are pulled from at the same time; failures are reported per peer."""
+        config = LBMConfig(
+            group_id="group123",
+            group_name="test-project",
+            created_by="github:alice",
+            created_at="2024-01-15T00:00:00Z",
+            github_repo="owner/repo",
+        )
+        save_lbm_config(tmp_path, config)
+        save_peers_to_repo(tmp_path, [
+            LBMPeer(github_user="me", sign_pub="self-key", host="10.0.0.1", port=7337),
+            LBMPeer(github_user="bob", sign_pub="k1", host="10.0.0.2", port=7337),
+            LBMPeer(github_user="carol", sign_pub="k2", host="10.0.0.3", port=7337),
+            LBMPeer(github_user="dave", sign_pub="k3", host="10.0.0.4", port=7337),
+            LBMPeer(github_user="erin", sign_pub="k4"),
+        ])
+
+        calls = []
+        in_flight = 0
+        peak = 0
+
+        async def fake_sync(host, port, group_id):
+            nonlocal in_flight, peak
+            calls.append((host, group_id))
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if host == "10.0.0.3":
+                raise ConnectionError("refused")
+            return True
+
+        node = MagicMock()
+        node.keys.sign_pub_b64 = "self-key"
+        node.sync_group_from_peer = fake_sync
+        with patch("lb.github_integration.get_or_create_node", return_value=node):
+            result = github_sync(tmp_path)
+
+        assert sorted(calls) == [(h, "group123") for h in ("10.0.0.2", "10.0.0.3", "10.0.0.4")]
+        assert peak == 3
+        assert result["synced_from"] == ["bob", "dave"]
+        assert result["sync_errors"] == [{"peer": "carol", "error": "refused"}]
 
 
 class TestMCPDetection:
@@ -445,6 +707,109 @@ class TestMCPDetection:
                     os.environ.pop("LBM_REPO_PATH", None)
 
 
+class TestMCPStdio:
+    """Tests for the MCP line protocol."""
+
+    def test_byte_stream_requests(self, tmp_path, monkeypatch):
+        """Requests are read and responses written as UTF-8 JSON lines."""
+        import io
+        from lb.mcp import run_mcp
+        from lb.node import BatteryNode
+
+        BatteryNode.init(tmp_path / "node")
+        stdin = io.TextIOWrapper(io.BytesIO(
+            '{"id": 1, "method": "initialize"}\n'
+            '\n'
+            'not json\n'
+            '{"id": "\u00e9", "method": "nope"}\n'.encode("utf-8")
+        ), encoding="utf-8")
+        stdout = io.TextIOWrapper(io.BytesIO(), encoding="utf-8")
+        monkeypatch.setattr("sys.stdin", stdin)
+        monkeypatch.setattr("sys.stdout", stdout)
+
+        run_mcp(str(tmp_path / "node"), working_dir=str(tmp_path))
+
+        stdout.flush()
+        lines = stdout.buffer.getvalue().decode("utf-8").splitlines()
+        responses = [json.loads(line) for line in lines]
+        assert len(responses) == 3
+        assert responses[0]["id"] == 1 and responses[0]["error"] is None
+        assert responses[1]["error"]["code"] == "bad_json"
+        assert responses[2]["id"] == "\u00e9"
+        assert responses[2]["error"]["code"] == "not_found"
+        assert "\u00e9" in lines[2]
+
+    def test_method_dispatch(self, tmp_path, monkeypatch):
+        """Methods route to their handlers and errors map to error codes."""
+        import io
+        from lb.mcp import run_mcp
+        from lb.node import BatteryNode
+
+        node = BatteryNode.init(tmp_path / "node")
+        gid = node.create_group("g")
+        requests = [
+            {"id": 1, "method": "list_groups"},
+            {"id": 2, "method": "publish_claim", "params": {"group_id": gid, "text": "hello", "tags": ["t"]}},
+            {"id": 3, "method": "retract_claim", "params": {"group_id": gid}},
+            {"id": 4, "method": "list_tasks", "params": {}},
+            {"id": 5, "method": ["not", "a", "name"]},
+        ]
+        stdin = io.TextIOWrapper(io.BytesIO(
+            "".join(json.dumps(r) + "\n" for r in requests).encode("utf-8")
+        ), encoding="utf-8")
+        stdout = io.TextIOWrapper(io.BytesIO(), encoding="utf-8")
+        monkeypatch.setattr("sys.stdin", stdin)
+        monkeypatch.setattr("sys.stdout", stdout)
+
+        run_mcp(str(tmp_path / "node"), working_dir=str(tmp_path))
+
+        stdout.flush()
+        responses = [json.loads(line) for line in stdout.buffer.getvalue().splitlines()]
+        assert [r["id"] for r in responses] == [1, 2, 3, 4, 5]
+        assert responses[0]["result"]["groups"][0]["group_id"] == gid
+        assert len(responses[1]["result"]["claim_hash"]) == 64
+        assert responses[2]["error"]["code"] == "bad_request"
+        assert responses[3]["error"] == {"code": "bad_request", "message": "group_id is required"}
+        assert responses[4]["error"]["code"] == "not_found"
+
+    @pytest.mark.parametrize("pt,package", [
+        (b'{"title": "t", "n": 1}', {"title": "t", "n": 1}),
+        (b"\xff\xfe not utf-8", {"raw_b64": base64.b64encode(b"\xff\xfe not utf-8").decode("ascii")}),
+        (b"plain text", {"raw_b64": base64.b64encode(b"plain text").decode("ascii")}),
+    ])
+    def test_purchase_offer_package(self, pt, package):
+        """Purchased packages are parsed as JSON, else returned as base64."""
+        from lb.mcp import _purchase_offer
+
+        class Node:
+            async def purchase_offer_from_peer(self, host, port, offer_id):
+                return "hash", pt
+
+        result = _purchase_offer(Node(), {"host": "h", "port": 1, "offer_id": "o"})
+        assert result == {"package_hash": "hash", "package": package}
+
+    @pytest.mark.parametrize("rid", [1, "x", None, "\u00e9"])
+    def test_response_envelopes(self, rid, monkeypatch):
+        """Pre-encoded envelopes match encoding the whole response dict."""
+        import io
+        from lb import fastjson
+        from lb.mcp import _ok, _err
+
+        stdout = io.TextIOWrapper(io.BytesIO(), encoding="utf-8")
+        monkeypatch.setattr("sys.stdout", stdout)
+        result = {"groups": [{"name": "g", "n": 2}], "ok": True}
+
+        _ok(rid, result)
+        _err(rid, "not_found", "no such \"thing\"")
+
+        stdout.flush()
+        assert stdout.buffer.getvalue().splitlines() == [
+            fastjson.dumps({"id": rid, "result": result, "error": None}),
+            fastjson.dumps({"id": rid, "result": None,
+                            "error": {"code": "not_found", "message": "no such \"thing\""}}),
+        ]
+
+
 class TestGetOrCreateNode:
     """Tests for node creation in .lbm/node/."""
 
@@ -475,6 +840,24 @@ class TestGetOrCreateNode:
 
             assert node2.node_id == node_id
 
+    def test_node_cached_until_reinit(self, tmp_path):
+        """The same instance is returned until node.json is replaced."""
+        import lb.github_integration as gi
+
+        (tmp_path / ".lbm").mkdir()
+        node1 = get_or_create_node(tmp_path)
+        assert get_or_create_node(tmp_path) is node1
+
+        gi._node_cache.clear()
+        node2 = get_or_create_node(tmp_path)
+        assert node2 is not node1
+        assert node2.node_id == node1.node_id
+
+        shutil.rmtree(tmp_path / ".lbm" / "node")
+        node3 = get_or_create_node(tmp_path)
+        assert node3.node_id != node1.node_id
+        assert get_or_create_node(tmp_path) is node3
+
 
 class TestHookTemplates:
     """Tests for hook template content."""
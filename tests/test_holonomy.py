@@ -1,6 +1,6 @@
 import unittest
 
-from lb.holonomy import Chart, random_orthogonal, holonomy_loop
+from lb.holonomy import Chart, random_orthogonal, holonomy_loop, matmul, matvec, transpose
 
 
 class TestHolonomy(unittest.TestCase):
@@ -12,6 +12,26 @@ class TestHolonomy(unittest.TestCase):
         _, defect = holonomy_loop(v0, chart_a=chart_a, chart_b=chart_b, lr=0.2, k=5)
         self.assertGreater(defect, 1e-6)
 
+    def test_chart_round_trip(self):
+        chart = Chart("A", random_orthogonal(8, seed=4))
+        v = [float(i) for i in range(8)]
+        back = chart.to_global(chart.to_local(v))
+        for x, y in zip(back, v):
+            self.assertAlmostEqual(x, y, places=9)
+        self.assertEqual(chart, Chart("A", [list(row) for row in chart.R]))
+
+    def test_matrix_helpers(self):
+        A = [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]]
+        B = [[7.0, 8.0], [9.0, 10.0], [11.0, 12.0]]
+        self.assertEqual(matmul(A, B), [[58.0, 64.0], [139.0, 154.0]])
+        self.assertEqual(matvec(A, [1.0, 0.0, -1.0]), [-2.0, -2.0])
+
+        R = random_orthogonal(8, seed=3)
+        RRt = matmul(R, transpose(R))
+        for i in range(8):
+            for j in range(8):
+                self.assertAlmostEqual(RRt[i][j], 1.0 if i == j else 0.0, places=9)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -65,6 +65,34 @@ class TestMarketEndToEnd(unittest.TestCase):
         asyncio.run(run())
 
 
+class TestOfferImport(unittest.TestCase):
+    def test_reimport_skips_known_and_rejects_tampered(self):
+        with tempfile.TemporaryDirectory() as d1, tempfile.TemporaryDirectory() as d2:
+            nodeA = BatteryNode.init(Path(d1))
+            nodeB = BatteryNode.init(Path(d2))
+            gid = nodeA.create_group("demo")
+            offer_id, _ = nodeA.create_offer(
+                gid,
+                title="Reimport",
+                text="body",
+                price=10,
+                tags=["demo"],
+                announce_host="127.0.0.1",
+                announce_port=0,
+            )
+            ann = nodeA.offer_book[offer_id]
+
+            self.assertEqual(nodeB.import_offer_announcements([ann]), 1)
+            # Identical announcement again: still counted, book unchanged
+            self.assertEqual(nodeB.import_offer_announcements([dict(ann)]), 1)
+            self.assertEqual(nodeB.offer_book[offer_id], ann)
+
+            # Same offer id with altered content must still be verified
+            tampered = dict(ann, price=1)
+            self.assertEqual(nodeB.import_offer_announcements([tampered]), 0)
+            self.assertEqual(nodeB.offer_book[offer_id]["price"], 10)
+
+
 class TestAccessControl(unittest.TestCase):
     def test_private_cas_requires_membership(self):
         async def run():
@@ -155,6 +183,53 @@ class TestGroupSync(unittest.TestCase):
 
         asyncio.run(run())
 
+    def test_sync_skips_non_canonical_artifact_hashes(self):
+        async def run():
+            with tempfile.TemporaryDirectory() as d1, tempfile.TemporaryDirectory() as d2:
+                nodeA = BatteryNode.init(Path(d1))
+                nodeB = BatteryNode.init(Path(d2))
+                gid = nodeA.create_group("demo")
+                nodeA.add_member(gid, nodeB.keys.sign_pub_b64, role="member")
+                nodeA.publish_claim(gid, "capture compiler invocation", ["build"])
+
+                bad = ["AB" * 32, " " + "cd" * 32, "ef" * 16 + " " + "ef" * 16]
+                real_import = nodeB.import_group_snapshot
+
+                def import_with_bad_hashes(snap):
+                    replaced = real_import(snap)
+                    txs = nodeB.groups[gid].chain.blocks[-1].txs
+                    txs.extend({"type": "claim", "artifact_hash": h} for h in bad)
+                    return replaced
+
+                nodeB.import_group_snapshot = import_with_bad_hashes
+                looked_up = []
+                real_has = nodeB.cas.has
+
+                def spy_has(h):
+                    looked_up.append(h)
+                    return real_has(h)
+
+                nodeB.cas.has = spy_has
+
+                srv = P2PServer(nodeA)
+                await srv.start("127.0.0.1", 0)
+                port = srv._server.sockets[0].getsockname()[1]
+                task = asyncio.create_task(srv.serve_forever())
+                try:
+                    await nodeB.sync_group_from_peer("127.0.0.1", port, gid)
+                    normalized = {"ab" * 32, "cd" * 32, "ef" * 32}
+                    self.assertFalse(normalized & set(looked_up))
+                    ctx, _ = nodeB.compile_context(gid, "how to debug build", top_k=4)
+                    self.assertIn("capture compiler invocation", ctx)
+                finally:
+                    task.cancel()
+                    try:
+                        await task
+                    except asyncio.CancelledError:
+                        pass
+
+        asyncio.run(run())
+
 
 if __name__ == "__main__":
     unittest.main()
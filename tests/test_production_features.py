@@ -4,10 +4,13 @@ Tests key encryption, CAS consistency, rate limiting, and other
 production hardening features.
 """
 import asyncio
+import base64
+import hashlib
 import json
 import os
 import shutil
 import tempfile
+from http import HTTPStatus
 from pathlib import Path
 
 import pytest
@@ -22,18 +25,44 @@ from lb.key_encryption import (
     init_encrypted_keys, load_keys, encrypt_existing_keys, change_key_password,
     KeyEncryptionError, encrypt_wallet_keys, decrypt_wallet_keys
 )
-from lb.cas import CAS, CasMeta
+from lb.cas import CAS, CasMeta, CASError, is_object_name
 from lb.rate_limit import (
     SlidingWindowRateLimiter, ConnectionLimiter, P2PRateLimiter,
     get_rate_limiter, reset_rate_limiter
 )
 from lb.keys import gen_node_keys, dump_sign_priv_raw
-from lb.fs import ensure_dir
+from lb.fs import ensure_dir, atomic_write_many
+from lb import fastjson
 
 
 class TestKeyEncryption:
     """Tests for key encryption at rest."""
 
+    def test_public_key_encodings_cached(self):
+        """Base64 public keys are computed once and keys stay immutable."""
+        import dataclasses
+
+        keys = gen_node_keys()
+        raw = keys.sign_pub.public_bytes_raw()
+        assert keys.sign_pub_b64 == base64.b64encode(raw).decode("ascii")
+        assert keys.sign_pub_b64 is keys.sign_pub_b64
+        assert keys.enc_pub_b64 is keys.enc_pub_b64
+        assert base64.b64decode(keys.enc_pub_b64) == keys.enc_pub.public_bytes_raw()
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            keys.sign_pub = gen_node_keys().sign_pub
+
+    @pytest.mark.parametrize("data", [b"", b"\x00", os.urandom(32), os.urandom(1000)])
+    def test_b64_matches_stdlib(self, data):
+        """b64e/b64d agree with the base64 module; bad input raises ValueError."""
+        from lb.keys import b64d, b64e
+
+        encoded = b64e(data)
+        assert encoded == base64.b64encode(data).decode("ascii")
+        assert b64d(encoded) == data
+        for bad in ("abc", "\u00e9"):
+            with pytest.raises(ValueError):
+                b64d(bad)
+
     def test_encrypt_decrypt_roundtrip(self):
         """Test that encryption and decryption are inverse operations."""
         test_data = os.urandom(32)
@@ -259,6 +288,162 @@ class TestCASConsistency:
             assert h in cas2.index
             assert cas2.get(h) == data
 
+    def test_cas_validation_many_orphans(self, monkeypatch):
+        """Test parallel orphan validation indexes good files and drops corrupt ones."""
+        from lb import cas as cas_mod
+
+        # Spread the orphans over several hashing batches
+        monkeypatch.setattr(cas_mod, "SCAN_BATCH_SIZE", 3)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cas_path = Path(tmpdir)
+            cas = CAS(cas_path, validate_on_startup=False)
+            meta = CasMeta(visibility="public", kind="test")
+            hashes = [cas.put(f"orphan {i}".encode(), meta) for i in range(8)]
+
+            # Corrupt one object, then forget the whole index
+            bad = hashes[0]
+            cas._obj_path(bad).write_bytes(b"tampered")
+            cas.index = {}
+            cas._save_index_unlocked()
+
+            # Files that cannot be objects where they are: a non-digest name
+            # and a correct object filed under the wrong prefix
+            stray = cas._obj_path(hashes[1]).parent / "not-an-object"
+            stray.write_bytes(b"junk")
+            misplaced_data = b"misplaced"
+            misplaced_h = hashlib.sha256(misplaced_data).hexdigest()
+            misplaced = cas._obj_path(hashes[1]).parent / misplaced_h
+            misplaced.write_bytes(misplaced_data)
+
+            cas2 = CAS(cas_path, validate_on_startup=True)
+            assert bad not in cas2.index
+            assert not cas2.has(bad)
+            for h in hashes[1:]:
+                assert cas2.index[h]["size"] == len(cas2.get(h))
+            assert misplaced_h not in cas2.index
+            assert not stray.exists() and not misplaced.exists()
+
+    def test_cas_index_journal(self):
+        """Test puts are journaled, replayed on reopen and compacted."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cas_path = Path(tmpdir)
+            cas = CAS(cas_path, validate_on_startup=False)
+            meta = CasMeta(visibility="public", kind="test")
+            h1 = cas.put(b"first", meta)
+            h2 = cas.put(b"second", CasMeta(visibility="public", kind="test"))
+
+            # put() appends to the journal rather than rewriting index.json
+            assert not cas.index_path.exists()
+            assert len(cas.journal_path.read_bytes().splitlines()) == 2
+
+            # Simulate a torn append after the last complete record
+            with open(cas.journal_path, "ab") as f:
+                f.write(b'{"h":"abc')
+            cas2 = CAS(cas_path, validate_on_startup=True)
+            assert set(cas2.index) == {h1, h2}
+            # The torn journal was folded into index.json and removed
+            assert not cas2.journal_path.exists()
+            assert set(json.loads(cas2.index_path.read_text())) == {h1, h2}
+
+            h3 = cas2.put(b"third", CasMeta(visibility="public", kind="test"))
+            cas2.compact()
+            assert not cas2.journal_path.exists()
+            assert set(CAS(cas_path).index) == {h1, h2, h3}
+
+    def test_cas_put_json_address(self):
+        """Test put_json addresses objects by their canonical JSON bytes."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cas = CAS(Path(tmpdir), validate_on_startup=False)
+            obj = {"text": "naïve ☃", "tags": ["b", "a"], "n": 3, "nested": {"z": 1, "a": None}}
+            h = cas.put_json(obj, CasMeta(visibility="public", kind="test"))
+            expected = json.dumps(obj, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+            assert h == hashlib.sha256(expected).hexdigest()
+            assert cas.get_json(h) == obj
+
+    def test_cas_put_stream(self):
+        """Test streamed puts match put(), dedup and enforce the size limit."""
+        import io
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cas = CAS(Path(tmpdir), validate_on_startup=False, max_object_size=3 * 1024 * 1024)
+            data = os.urandom(2 * 1024 * 1024 + 7)
+            h = cas.put_stream(io.BytesIO(data), CasMeta(visibility="public", kind="test"))
+            assert h == hashlib.sha256(data).hexdigest()
+            assert cas.get(h) == data
+            assert cas.meta(h).size == len(data)
+
+            # Iterable of chunks, same content: deduplicated
+            chunks = [data[:100], data[100:]]
+            assert cas.put_stream(chunks, CasMeta(visibility="public", kind="test")) == h
+
+            with pytest.raises(CASError):
+                cas.put_stream(iter([b"x" * (2 * 1024 * 1024)] * 2), CasMeta(visibility="public", kind="test"))
+            # No temp files left behind
+            assert [p.name for p in cas.obj_dir.iterdir() if p.is_file()] == []
+
+    def test_cas_put_restores_missing_object(self):
+        """Test re-putting an object whose file vanished behind the index rewrites it."""
+        import io
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cas = CAS(Path(tmpdir), validate_on_startup=False)
+            meta = CasMeta(visibility="public", kind="test")
+            h = cas.put(b"payload", meta)
+            s = cas.put_stream(io.BytesIO(b"streamed"), meta)
+            cas._obj_path(h).unlink()
+            cas._obj_path(s).unlink()
+
+            assert cas.put(b"payload", CasMeta(visibility="public", kind="test")) == h
+            assert cas.get(h) == b"payload"
+            assert cas.put_stream([b"stream", b"ed"], CasMeta(visibility="public", kind="test")) == s
+            assert cas.get(s) == b"streamed"
+
+    def test_cas_validation_removes_stream_temp_files(self):
+        """Test startup validation sweeps put_stream temp files left by a crash."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cas = CAS(Path(tmpdir), validate_on_startup=False)
+            h = cas.put(b"kept", CasMeta(visibility="public", kind="test"))
+            leftover = cas.obj_dir / "put.abc123"
+            leftover.write_bytes(b"partial")
+            other = cas.obj_dir / "README"
+            other.write_bytes(b"not ours")
+
+            cas2 = CAS(Path(tmpdir), validate_on_startup=True)
+            assert not leftover.exists()
+            assert other.exists()
+            assert cas2.get(h) == b"kept"
+
+    def test_cas_delete(self):
+        """Test delete removes the object and survives reopening via the journal."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cas_path = Path(tmpdir)
+            cas = CAS(cas_path, validate_on_startup=False)
+            h = cas.put(b"short-lived", CasMeta(visibility="public", kind="test"))
+            keep = cas.put(b"kept", CasMeta(visibility="public", kind="test"))
+            assert cas.has(h)
+
+            assert cas.delete(h) is True
+            assert cas.delete(h) is False
+            assert not cas.has(h)
+            assert not cas._obj_path(h).exists()
+
+            cas2 = CAS(cas_path, validate_on_startup=True)
+            assert not cas2.has(h)
+            assert cas2.has(keep)
+
+    def test_cas_hash_file_drop_cache(self, monkeypatch):
+        """Test hashing with page-cache eviction gives the same digest."""
+        from lb import cas as cas_mod
+
+        monkeypatch.setattr(cas_mod, "DROP_CACHE_MIN_SIZE", 1)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "blob"
+            data = os.urandom(3 * 1024 * 1024 + 1)
+            path.write_bytes(data)
+            expected = (hashlib.sha256(data).hexdigest(), len(data))
+            assert cas_mod._hash_file(path, drop_cache=True) == expected
+            assert cas_mod._hash_file(path) == expected
+
     def test_cas_verify(self):
         """Test CAS object verification."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -271,6 +456,24 @@ class TestCASConsistency:
             assert cas.verify(h) is True
             assert cas.verify("nonexistent_hash") is False
 
+    def test_cas_verify_large_and_empty(self):
+        """Test verification across chunk boundaries, of empty objects and after corruption."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cas = CAS(Path(tmpdir), validate_on_startup=False)
+            big = os.urandom(2 * 1024 * 1024 + 123)
+            h_big = cas.put(big, CasMeta(visibility="public", kind="test"))
+            h_empty = cas.put(b"", CasMeta(visibility="public", kind="test"))
+            assert cas.verify(h_big) is True
+            assert cas.verify(h_empty) is True
+
+            assert cas.get_range(h_big, 1024 * 1024 - 2, 5) == big[1024 * 1024 - 2:1024 * 1024 + 3]
+            assert cas.get_range(h_big, len(big) - 3, 10) == big[-3:]
+            with pytest.raises(FileNotFoundError):
+                cas.get_range("nonexistent_hash", 0, 1)
+
+            cas._obj_path(h_big).write_bytes(big[:-1] + bytes([big[-1] ^ 1]))
+            assert cas.verify(h_big) is False
+
     def test_cas_stats(self):
         """Test CAS statistics."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -287,6 +490,101 @@ class TestCASConsistency:
             assert stats["by_kind"]["claim"] == 3
             assert stats["by_kind"]["package"] == 2
 
+    def test_is_object_name(self):
+        """Test only lowercase hex SHA-256 digests are object names."""
+        h = hashlib.sha256(b"x").hexdigest()
+        assert is_object_name(h)
+        for bad in (h.upper(), " " + h, h + "\n", h[:-1], h + "0", ""):
+            assert not is_object_name(bad)
+
+
+class TestSecureSession:
+    """Tests for secure channel message sealing."""
+
+    @staticmethod
+    def _pair():
+        from lb.secure_channel import SecureSession
+
+        k1, k2, p1, p2 = os.urandom(32), os.urandom(32), os.urandom(4), os.urandom(4)
+        a = SecureSession("a", "a", "b", "b", send_key=k1, recv_key=k2, nonce_prefix_send=p1, nonce_prefix_recv=p2)
+        b = SecureSession("b", "b", "a", "a", send_key=k2, recv_key=k1, nonce_prefix_send=p2, nonce_prefix_recv=p1)
+        return a, b
+
+    def test_seal_open_roundtrip(self):
+        a, b = self._pair()
+        for i in range(3):
+            assert b.open(a.seal({"n": i, "text": "héllo"})) == {"n": i, "text": "héllo"}
+        assert a.open(b.seal({"reply": True})) == {"reply": True}
+
+    def test_tampered_or_replayed_message_rejected(self):
+        from lb.crypto import CryptoError
+
+        a, b = self._pair()
+        env = json.loads(a.seal({"n": 1}))
+        ct = bytearray(base64.b64decode(env["ct"]))
+        ct[0] ^= 1
+        env["ct"] = base64.b64encode(bytes(ct)).decode()
+        with pytest.raises(Exception):
+            b.open(json.dumps(env).encode())
+
+        a2, b2 = self._pair()
+        sealed = a2.seal({"n": 1})
+        b2.open(sealed)
+        with pytest.raises(CryptoError):
+            b2.open(sealed)
+
+
+class TestPackageEncryption:
+    """Tests for package envelopes."""
+
+    @pytest.mark.parametrize("cipher", ["chacha20poly1305", "aes-256-gcm", None])
+    def test_roundtrip(self, cipher):
+        from lb.crypto import encrypt_package, decrypt_package
+
+        env, key = encrypt_package(b"package body", aad=b"ctx", cipher=cipher)
+        assert json.loads(env)["cipher"] == (cipher or "chacha20poly1305")
+        assert decrypt_package(env, key=key) == b"package body"
+        with pytest.raises(Exception):
+            decrypt_package(env, key=key, aad=b"other")
+
+    def test_default_envelope_opens_on_older_nodes(self):
+        """Default envelopes pass the chacha20poly1305-only check of older releases."""
+        from cryptography.hazmat.primitives.ciphers.aead import ChaCha20Poly1305
+        from lb.crypto import encrypt_package
+
+        env_bytes, key = encrypt_package(b"package body", aad=b"ctx")
+        env = json.loads(env_bytes.decode("utf-8"))
+        assert env.get("cipher") == "chacha20poly1305"
+        nonce = base64.b64decode(env["nonce"])
+        ct = base64.b64decode(env["ct"])
+        assert ChaCha20Poly1305(key).decrypt(nonce, ct, base64.b64decode(env["aad"])) == b"package body"
+
+    def test_hkdf_rfc5869_vector(self):
+        """RFC 5869 test case 1, so any change to hkdf_sha256 stays compatible."""
+        from lb.crypto import hkdf_sha256
+
+        okm = hkdf_sha256(
+            bytes.fromhex("0b" * 22),
+            salt=bytes.fromhex("000102030405060708090a0b0c"),
+            info=bytes.fromhex("f0f1f2f3f4f5f6f7f8f9"),
+            length=42,
+        )
+        assert okm.hex() == (
+            "3cb25f25faacd57a90434f64d0362f2a2d2d0a90cf1a5a4c5db02d56ecc4c5bf"
+            "34007208d5b887185865"
+        )
+
+    def test_unknown_cipher_rejected(self):
+        from lb.crypto import encrypt_package, decrypt_package, CryptoError
+
+        with pytest.raises(CryptoError):
+            encrypt_package(b"x", cipher="rot13")
+        env, key = encrypt_package(b"x")
+        tampered = json.loads(env)
+        tampered["cipher"] = "rot13"
+        with pytest.raises(CryptoError):
+            decrypt_package(json.dumps(tampered).encode(), key=key)
+
 
 class TestRateLimiting:
     """Tests for rate limiting functionality."""
@@ -336,6 +634,30 @@ class TestRateLimiting:
         result = await limiter.check("key2")
         assert result.allowed
 
+    @pytest.mark.asyncio
+    async def test_sliding_window_ignores_wall_clock_jumps(self, monkeypatch):
+        """Test that the window is measured on the monotonic clock."""
+        import time
+
+        limiter = SlidingWindowRateLimiter(window_seconds=60.0, max_requests=2)
+        await limiter.check("key1")
+        await limiter.check("key1")
+
+        # A wall-clock step must neither expire nor extend the window
+        monkeypatch.setattr(time, "time", lambda: 0.0)
+        result = await limiter.check("key1")
+        assert not result.allowed
+        assert 59.0 < result.wait_seconds <= 60.0
+
+    @pytest.mark.asyncio
+    async def test_sliding_window_concurrent_checks(self):
+        """Test that concurrent checks on one loop never over-admit."""
+        limiter = SlidingWindowRateLimiter(window_seconds=60.0, max_requests=5)
+
+        results = await asyncio.gather(*(limiter.check("key1") for _ in range(20)))
+        assert sum(r.allowed for r in results) == 5
+        assert (await limiter.stats())["total_timestamps"] == 5
+
     @pytest.mark.asyncio
     async def test_connection_limiter_acquire_release(self):
         """Test connection limiter acquire and release."""
@@ -354,6 +676,23 @@ class TestRateLimiting:
         # Now allowed again
         assert await limiter.acquire("192.168.1.1")
 
+    @pytest.mark.asyncio
+    async def test_connection_limiter_max_ips(self):
+        """Test that new IPs are rejected only while every tracked IP is connected."""
+        limiter = ConnectionLimiter(max_per_ip=2, max_ips=2)
+
+        assert await limiter.acquire("10.0.0.1")
+        assert await limiter.acquire("10.0.0.2")
+        assert not await limiter.acquire("10.0.0.3")
+        # Known IPs may still take their remaining slots
+        assert await limiter.acquire("10.0.0.1")
+
+        await limiter.release("10.0.0.2")
+        await limiter.release("10.0.0.2")
+        assert await limiter.get_count("10.0.0.2") == 0
+        assert await limiter.acquire("10.0.0.3")
+        assert (await limiter.stats())["total_connections"] == 3
+
     @pytest.mark.asyncio
     async def test_connection_limiter_per_ip(self):
         """Test that connection limits are per-IP."""
@@ -381,6 +720,87 @@ class TestRateLimiting:
         # Release connection
         await limiter.release_connection("192.168.1.1")
 
+    @pytest.mark.asyncio
+    async def test_sliding_window_evicts_oldest_requests(self):
+        """Test that a full limiter evicts the keys with the oldest requests."""
+        limiter = SlidingWindowRateLimiter(window_seconds=60.0, max_requests=2, max_keys=20)
+
+        for i in range(20):
+            await limiter.check(f"key{i}")
+        # A second, allowed request moves key0 back; a blocked one doesn't
+        assert (await limiter.check("key0")).allowed
+        assert not (await limiter.check("key0")).allowed
+
+        await limiter.check("new")
+        assert list(limiter._requests)[:2] == ["key3", "key4"]
+        assert list(limiter._requests)[-2:] == ["key0", "new"]
+        assert len(limiter._requests) == 19
+
+    @pytest.mark.asyncio
+    async def test_sliding_window_evicts_expired_before_live(self, monkeypatch):
+        """Test that a key blocked recently but now expired is evicted before a live key."""
+        import types
+
+        clock = [0.0]
+        monkeypatch.setattr("lb.rate_limit.time", types.SimpleNamespace(monotonic=lambda: clock[0]))
+        limiter = SlidingWindowRateLimiter(window_seconds=60.0, max_requests=2, max_keys=2)
+        limiter._cleanup_interval = float("inf")  # exercise eviction, not cleanup
+
+        assert (await limiter.check("Y")).allowed
+        assert (await limiter.check("Y")).allowed
+        clock[0] = 40.0
+        assert (await limiter.check("X")).allowed
+        clock[0] = 50.0
+        assert not (await limiter.check("Y")).allowed
+
+        clock[0] = 65.0
+        assert (await limiter.check("Z")).allowed
+        assert list(limiter._requests) == ["X", "Z"]
+        # X keeps its quota: one request left in its window
+        assert (await limiter.check("X")).allowed
+        assert not (await limiter.check("X")).allowed
+
+    @pytest.mark.asyncio
+    async def test_cleanup_keeps_live_keys(self):
+        """Test that cleanup drops expired keys and keeps recently used ones."""
+        limiter = SlidingWindowRateLimiter(window_seconds=0.2, max_requests=10)
+
+        await limiter.check("old1")
+        await limiter.check("old1")
+        await limiter.check("old2")
+        await limiter.check("live")
+        await asyncio.sleep(0.25)
+        await limiter.check("live")
+        await limiter.check("fresh")
+
+        assert await limiter.cleanup() == 3
+        assert list(limiter._requests) == ["live", "fresh"]
+
+    def test_global_rate_limiter_singleton(self):
+        """Test that the global limiter is shared until reset."""
+        limiter = get_rate_limiter()
+        assert get_rate_limiter() is limiter
+        reset_rate_limiter()
+        assert get_rate_limiter() is not limiter
+
+    def test_p2p_rate_limiter_uses_config(self):
+        """Test that default limiters take their limits from the P2P config."""
+        from lb.config import Config, set_config, reset_config
+
+        config = Config()
+        config.p2p.max_connections_per_ip = 3
+        config.p2p.max_requests_per_minute = 7
+        set_config(config)
+        try:
+            limiter = P2PRateLimiter()
+            assert limiter.connection_limiter.max_per_ip == 3
+            assert limiter.request_limiter.max_requests == 7
+
+            custom = ConnectionLimiter(max_per_ip=1)
+            assert P2PRateLimiter(connection_limiter=custom).connection_limiter is custom
+        finally:
+            reset_config()
+
     @pytest.mark.asyncio
     async def test_cleanup_removes_expired(self):
         """Test that cleanup removes expired entries."""
@@ -397,6 +817,25 @@ class TestRateLimiting:
         removed = await limiter.cleanup()
         assert removed >= 2
 
+    @pytest.mark.asyncio
+    async def test_sliding_window_partial_expiry(self):
+        """Test that only timestamps older than the window are dropped."""
+        limiter = SlidingWindowRateLimiter(window_seconds=0.2, max_requests=3)
+
+        await limiter.check("key1")
+        await limiter.check("key1")
+        await asyncio.sleep(0.25)
+        await limiter.check("key1")
+        await limiter.check("key1")
+
+        # Two fresh requests remain; the first two have expired
+        assert list(limiter._requests["key1"]) == sorted(limiter._requests["key1"])
+        assert len(limiter._requests["key1"]) == 2
+        assert (await limiter.check("key1")).allowed
+        result = await limiter.check("key1")
+        assert not result.allowed
+        assert 0 < result.wait_seconds <= 0.2
+
 
 class TestHealthCheck:
     """Test health check endpoint behavior."""
@@ -424,3 +863,274 @@ class TestHealthCheck:
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
+
+
+class TestFastJSON:
+    """Tests for the optional-orjson JSON helpers."""
+
+    SAMPLE = {"b": [1, 2, {"x": None}], "a": "héllo", "t": True, "n": -5}
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_roundtrip(self, monkeypatch, use_orjson):
+        """Both backends produce compact bytes that parse back identically."""
+        if use_orjson and not fastjson.HAVE_ORJSON:
+            pytest.skip("orjson not installed")
+        monkeypatch.setattr(fastjson, "HAVE_ORJSON", use_orjson)
+
+        data = fastjson.dumps(self.SAMPLE)
+        assert isinstance(data, bytes)
+        assert b" " not in data.replace("héllo".encode(), b"")
+        assert fastjson.loads(data) == self.SAMPLE
+        assert fastjson.loads(data.decode("utf-8")) == self.SAMPLE
+        assert json.loads(data) == self.SAMPLE
+
+    def test_dumps_falls_back_for_unsupported_values(self):
+        """Values orjson rejects are still encoded via the stdlib."""
+        big = {"n": 2 ** 70, 1: "int-key"}
+        assert json.loads(fastjson.dumps(big)) == {"n": 2 ** 70, "1": "int-key"}
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_dumps_default(self, monkeypatch, use_orjson):
+        """default handles values neither backend can encode."""
+        if use_orjson and not fastjson.HAVE_ORJSON:
+            pytest.skip("orjson not installed")
+        monkeypatch.setattr(fastjson, "HAVE_ORJSON", use_orjson)
+
+        data = fastjson.dumps({"p": Path("/x"), "s": {1}, "big": 2 ** 70}, default=str)
+        assert json.loads(data) == {"p": "/x", "s": "{1}", "big": 2 ** 70}
+        with pytest.raises(TypeError):
+            fastjson.dumps({"p": Path("/x")})
+
+    def test_json_log_formatter(self):
+        """Structured log lines are single-line JSON with extra data."""
+        import logging
+        from lb.logging_config import JsonFormatter
+
+        record = logging.LogRecord("lb.test", logging.INFO, __file__, 7, "héllo %s", ("x",), None)
+        record.extra_data = {"path": Path("/tmp"), "n": 1}
+        line = JsonFormatter().format(record)
+        assert "\n" not in line and "héllo x" in line
+        entry = json.loads(line)
+        assert entry["message"] == "héllo x"
+        assert entry["data"] == {"path": "/tmp", "n": 1}
+        assert entry["level"] == "INFO" and entry["line"] == 7
+
+    @pytest.mark.parametrize("datefmt", [None, "%Y-%m-%d %H:%M:%S", "%H:%M"])
+    def test_json_log_timestamps_match_stock(self, datefmt):
+        """Cached timestamps equal logging.Formatter's for every record."""
+        import logging
+        from lb.logging_config import JsonFormatter
+
+        ours = JsonFormatter(datefmt=datefmt)
+        stock = logging.Formatter(datefmt=datefmt)
+        for created in (1700000000.0, 1700000000.25, 1700000000.999, 1700000001.5, 1700000061.0, 1700000000.5):
+            record = logging.LogRecord("lb.test", logging.INFO, __file__, 1, "m", (), None)
+            record.created = created
+            record.msecs = int((created - int(created)) * 1000)
+            assert ours.formatTime(record, datefmt) == stock.formatTime(record, datefmt)
+            assert json.loads(ours.format(record))["timestamp"] == stock.formatTime(record, datefmt)
+
+    def test_log_operation(self):
+        """log_operation attaches structured data and skips disabled levels."""
+        import logging
+        from lb.logging_config import log_operation
+
+        records = []
+        handler = logging.Handler()
+        handler.emit = records.append
+        logger = logging.getLogger("lb.test.log_operation")
+        logger.addHandler(handler)
+        logger.propagate = False
+        try:
+            logger.setLevel(logging.ERROR)
+            log_operation(logger, "sync", True, duration_ms=1.5)
+            assert records == []
+
+            log_operation(logger, "sync", False, duration_ms=1.5, peer="p")
+            assert len(records) == 1
+            assert records[0].getMessage() == "sync: FAILED (1.50ms)"
+            assert records[0].levelno == logging.ERROR
+            assert records[0].extra_data == {
+                "operation": "sync", "success": False, "peer": "p", "duration_ms": 1.5,
+            }
+        finally:
+            logger.removeHandler(handler)
+
+    @pytest.mark.parametrize("text", [".", "\u00e9\u2026"])
+    def test_rotating_handler_matches_stock(self, tmp_path, text):
+        """Size tracking rolls over at the same records as the stock handler."""
+        import logging
+        import logging.handlers
+        from lb.logging_config import SizeTrackingRotatingFileHandler
+
+        (tmp_path / "ours").mkdir()
+        (tmp_path / "stock").mkdir()
+        (tmp_path / "ours" / "x.log").write_text("existing line\n")
+        (tmp_path / "stock" / "x.log").write_text("existing line\n")
+        handlers = [
+            SizeTrackingRotatingFileHandler(tmp_path / "ours" / "x.log", maxBytes=300, backupCount=3, encoding="utf-8"),
+            logging.handlers.RotatingFileHandler(tmp_path / "stock" / "x.log", maxBytes=300, backupCount=3, encoding="utf-8"),
+        ]
+        for i in range(150):
+            record = logging.LogRecord("lb.t", logging.INFO, __file__, 1, "record %d" + text * (i % 7), (i,), None)
+            for h in handlers:
+                h.emit(record)
+        for h in handlers:
+            h.close()
+
+        names = sorted(p.name for p in (tmp_path / "stock").iterdir())
+        assert len(names) == 4
+        assert sorted(p.name for p in (tmp_path / "ours").iterdir()) == names
+        for name in names:
+            assert (tmp_path / "ours" / name).read_bytes() == (tmp_path / "stock" / name).read_bytes()
+
+    def test_console_logging_drained_at_exit(self):
+        """Queued console records all reach stderr, in order, before exit."""
+        import subprocess
+        import sys
+
+        script = (
+            "from lb.logging_config import get_logger, setup_logging\n"
+            "log = get_logger('lb.t')\n"
+            "j = setup_logging('lb.j', json_format=True)\n"
+            "for i in range(500):\n"
+            "    log.info('line %d', i)\n"
+            "j.warning('done')\n"
+            "try:\n"
+            "    1 / 0\n"
+            "except ZeroDivisionError:\n"
+            "    log.exception('boom')\n"
+        )
+        proc = subprocess.run(
+            [sys.executable, "-c", script], capture_output=True, text=True,
+            cwd=Path(__file__).parent.parent, timeout=60,
+        )
+        lines = proc.stderr.splitlines()
+        assert [line.rsplit(" ", 1)[1] for line in lines[:500]] == [str(i) for i in range(500)]
+        assert json.loads(lines[500])["message"] == "done"
+        assert lines[501].endswith("lb.t: boom")
+        assert lines[-1] == "ZeroDivisionError: division by zero"
+
+    def test_loads_invalid(self):
+        """Malformed input raises JSONDecodeError."""
+        with pytest.raises(fastjson.JSONDecodeError):
+            fastjson.loads(b"{not json")
+
+    @pytest.mark.parametrize("text", [
+        '{"n": 1180591620717411303424}',
+        '[1, -1180591620717411303424]',
+        '{"n":[  18446744073709551616]}',
+        '123456789012345678901234567890',
+        '{"x": NaN, "y": [Infinity]}',
+        '{"h": "a12345678901234567890123", "n": 18446744073709551615}',
+        '[-9223372036854775809]',
+        '{"lo": -9223372036854775808, "hi": 9999999999999999999}',
+        '{"n": -9999999999999999999}',
+    ])
+    def test_loads_matches_stdlib(self, text):
+        """Big integers and NaN parse exactly as the stdlib parses them."""
+        expected = json.loads(text)
+        for data in (text, text.encode("utf-8")):
+            result = fastjson.loads(data)
+            assert json.dumps(result) == json.dumps(expected)
+            assert type(result) is type(expected)
+
+    @pytest.mark.parametrize("pad", [-30, -10, 0, 5])
+    def test_big_int_across_scan_chunks(self, monkeypatch, tmp_path, pad):
+        """A big integer straddling a scan chunk boundary is still caught."""
+        from lb import fs
+
+        monkeypatch.setattr(fastjson, "_SCAN_CHUNK", 256)
+        monkeypatch.setattr(fs, "MMAP_MIN_SIZE", 0)
+        filler = "x" * (256 - len('{"a":"", "b": ') + pad)
+        text = '{"a":"' + filler + '", "b": 123456789012345678901234567890}'
+        path = tmp_path / "doc.json"
+        path.write_text(text)
+        assert fs.read_json(path) == json.loads(text)
+        assert fastjson.loads(text)["b"] == 123456789012345678901234567890
+
+
+class TestAtomicWriteMany:
+    """Tests for batched atomic file replacement."""
+
+    def test_writes_all_files(self, tmp_path):
+        """Every file is replaced and no temp files are left behind."""
+        (tmp_path / "a.json").write_bytes(b"old")
+        atomic_write_many({
+            tmp_path / "a.json": b"first",
+            tmp_path / "sub" / "b.json": b"second",
+        })
+        assert (tmp_path / "a.json").read_bytes() == b"first"
+        assert (tmp_path / "sub" / "b.json").read_bytes() == b"second"
+        assert sorted(p.name for p in tmp_path.rglob("*")) == ["a.json", "b.json", "sub"]
+
+    def test_failed_rename_cleans_up(self, tmp_path):
+        """A file that can't be replaced raises and leaves no temp files."""
+        (tmp_path / "blocked").mkdir()
+        (tmp_path / "blocked" / "keep").write_bytes(b"")
+        with pytest.raises(OSError):
+            atomic_write_many({
+                tmp_path / "a.json": b"first",
+                tmp_path / "blocked": b"second",
+            })
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["a.json", "blocked"]
+
+
+class TestCanonicalJSON:
+    """canonical_json output must never drift: it feeds hashes and signatures."""
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    @pytest.mark.parametrize("obj", [
+        {"b": 1, "a": [1.5, -0.0, 1e300, None], "é": "ünï "},
+        {"nested": {"z": {"y": [], "x": {}}}, "big": 2 ** 70},
+        "plain string",
+        [True, False, 0],
+        [{"k": "v"}, ("t", 1), []],
+        {1: "int-key", 2: "other"},
+        {},
+        {"\uffff": 1, "\U00010000": 2, "ctl": "\x00\x1f\x7f\u2028\"\\"},
+        {"f": 1e16, "g": 1e-05, "n": -2 ** 63, "m": 2 ** 64 - 1},
+        {"enum": HTTPStatus.OK, "sub": type("S", (str,), {})("x")},
+    ])
+    def test_matches_json_dumps(self, monkeypatch, obj, use_orjson):
+        from lb import canonical
+        if use_orjson and not canonical.HAVE_ORJSON:
+            pytest.skip("orjson not installed")
+        monkeypatch.setattr(canonical, "HAVE_ORJSON", use_orjson)
+
+        expected = json.dumps(obj, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+        assert canonical.canonical_json(obj) == expected
+        assert canonical.canonical_json_bytes(obj) == expected.encode("utf-8")
+        assert canonical.hash_obj(obj) == hashlib.sha256(expected.encode("utf-8")).hexdigest()
+        assert canonical.hash_obj_digest(obj) == hashlib.sha256(expected.encode("utf-8")).digest()
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_circular_reference_rejected(self, monkeypatch, use_orjson):
+        """Self-referencing values raise like json.dumps instead of looping."""
+        from lb import canonical
+        if use_orjson and not canonical.HAVE_ORJSON:
+            pytest.skip("orjson not installed")
+        monkeypatch.setattr(canonical, "HAVE_ORJSON", use_orjson)
+
+        looped_list = [1]
+        looped_list.append(looped_list)
+        looped_dict = {"a": [1]}
+        looped_dict["a"].append(looped_dict)
+        for obj in (looped_list, looped_dict):
+            with pytest.raises(ValueError, match="Circular reference"):
+                canonical.canonical_json_bytes(obj)
+
+        shared = {"k": [1, 2]}
+        assert canonical.canonical_json_bytes([shared, shared]) == b'[{"k":[1,2]},{"k":[1,2]}]'
+
+    def test_rejects_what_stdlib_rejects(self):
+        """Types only orjson can serialize must not sneak into canonical bytes."""
+        import dataclasses
+        from lb.canonical import canonical_json_bytes
+
+        @dataclasses.dataclass
+        class Point:
+            x: int
+
+        with pytest.raises(TypeError):
+            canonical_json_bytes({"p": Point(1)})